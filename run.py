@@ -3,12 +3,32 @@ P3 Financial Forecasting Simulator - Main Entry Point
 Run this file to execute the complete forecasting pipeline.
 """
 
+import argparse
 import os
 import sys
 import shutil
 
-def run_pipeline():
-    """Execute the complete FP&A forecasting pipeline."""
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+import instrumentation
+from pipeline import build_default_pipeline, default_context
+from stage_cache import StageCache
+
+def run_pipeline(force=False, use_cache=True, cache_size_mb=256, artifact_format='csv', csv_export=False,
+                 precision='full', trace_path=None, profiler=None):
+    """Execute the complete FP&A forecasting pipeline (in-process; stage failures raise PipelineError).
+
+    Stages whose inputs, upstream artifacts and code are unchanged since a previous run are restored
+    from the stage cache in .cache/pipeline; `force` re-runs everything. History and forecast
+    artifacts are written as `artifact_format` (csv / parquet / feather), plus a forecast CSV copy
+    when `csv_export` is set. `precision='compact'` runs every stage on float32 / categorical frames
+    (cash columns stay float64).
+
+    With `trace_path` every stage and sub-step is timed (wall, CPU, RSS, rows in/out) and written
+    there as JSON; `profiler` ('cprofile' / 'pyinstrument') also dumps one profile per stage into
+    outputs/profiles. Both are off by default.
+    """
     
     print("=" * 60)
     print("🚀 P3 FINANCIAL FORECASTING SIMULATOR")
@@ -21,44 +41,37 @@ def run_pipeline():
     print("  ✓ Excel model with formulas")
     print("\n" + "-" * 60)
     
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = BASE_DIR
     
     # Ensure output directories exist
     os.makedirs(os.path.join(base_dir, 'outputs'), exist_ok=True)
     os.makedirs(os.path.join(base_dir, 'data', 'processed'), exist_ok=True)
     
-    # Step 1: Generate dimension tables (date dimension)
-    print("\n[1/4] 📅 Generating dimension tables...")
-    data_gen_path = os.path.join(base_dir, 'src', 'data_generator.py')
-    if os.system(f'python "{data_gen_path}"') != 0:
-        print("❌ Data generation failed")
-        return 1
-    
-    # Step 2: Run forecast engine (deterministic driver-based)
-    print("\n[2/4] 🔮 Running forecast engine...")
-    forecast_path = os.path.join(base_dir, 'src', 'forecast_engine.py')
-    if os.system(f'python "{forecast_path}"') != 0:
-        print("❌ Forecast engine failed")
-        return 1
-    
-    # Step 3: Export to Excel with formulas
-    print("\n[3/4] 📊 Exporting Excel model...")
-    export_path = os.path.join(base_dir, 'src', 'export_module.py')
-    if os.system(f'python "{export_path}"') != 0:
-        print("❌ Excel export failed")
-        return 1
-    
-    # Step 4: Generate insights report
-    print("\n[4/4] 📝 Generating insights report...")
-    insights_path = os.path.join(base_dir, 'src', 'insight_generator.py')
-    os.system(f'python "{insights_path}"')  # Non-critical, don't fail on error
+    # Stages run in this interpreter and hand DataFrames to each other in memory:
+    # dimension tables -> forecast engine -> Excel export -> insights (non-critical)
+    pipeline = build_default_pipeline()
+    cache = StageCache(os.path.join(base_dir, '.cache', 'pipeline'), cache_size_mb * 1024 * 1024) if use_cache else None
+    context = default_context(base_dir, artifact_format, csv_export, precision)
+    if trace_path or profiler:
+        instrumentation.enable(profiler, os.path.join(base_dir, 'outputs', 'profiles'))
+    try:
+        pipeline.run(context, cache=cache, force=force)
+    finally:
+        recorder = instrumentation.disable()
+        if recorder is not None:
+            trace_path = recorder.write(trace_path or os.path.join(base_dir, 'outputs', 'run_trace.json'))
+            print("\n🔬 Instrumentation:")
+            print(recorder.summary())
+            print(f"   Trace saved: {trace_path}")
     
     # Copy key outputs to outputs folder for easy access
     processed_dir = os.path.join(base_dir, 'data', 'processed')
     outputs_dir = os.path.join(base_dir, 'outputs')
+    forecast_name = os.path.basename(context['forecast_path'])
+    base_forecast_name = forecast_name.replace('forecast_output', 'base_forecast')
     
     files_to_copy = {
-        'forecast_output.csv': 'base_forecast.csv',
+        forecast_name: base_forecast_name,
         'scenario_comparison.csv': 'scenario_summary.csv',
         'model_metrics.csv': 'kpi_summary.csv'
     }
@@ -74,14 +87,34 @@ def run_pipeline():
     print("✅ FORECAST COMPLETED")
     print("=" * 60)
     print("\n📂 Output Files:")
-    print(f"  → {os.path.join('outputs', 'base_forecast.csv')}")
+    print(f"  → {os.path.join('outputs', base_forecast_name)}")
     print(f"  → {os.path.join('outputs', 'scenario_summary.csv')}")
     print(f"  → {os.path.join('outputs', 'kpi_summary.csv')}")
     print(f"  → {os.path.join('outputs', 'FPnA_Model_with_formulas.xlsx')}")
     print(f"\n📊 View Excel model for interactive scenario analysis")
+    print("\n⏱  Stage timings:")
+    for name, seconds in pipeline.timings.items():
+        status = " (cached)" if name in pipeline.skipped else ""
+        print(f"  {name:<10} {seconds:8.3f}s{status}")
     print("=" * 60)
     
     return 0
 
 if __name__ == "__main__":
-    sys.exit(run_pipeline())
+    parser = argparse.ArgumentParser(description="Run the P3 forecasting pipeline.")
+    parser.add_argument('--force', action='store_true', help="re-run every stage even if its cached fingerprint matches")
+    parser.add_argument('--no-cache', action='store_true', help="neither read nor write the stage cache")
+    parser.add_argument('--cache-size-mb', type=int, default=256, help="size bound of the stage cache store")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help="file format of the history and forecast artifacts (parquet/feather need pyarrow)")
+    parser.add_argument('--csv', action='store_true', help="also export the forecast as CSV when --format is binary")
+    parser.add_argument('--trace', nargs='?', const=os.path.join(BASE_DIR, 'outputs', 'run_trace.json'),
+                        help="write per-stage / per-step timings, RSS and row counts as JSON (default outputs/run_trace.json)")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help="dump one profile per stage into outputs/profiles (implies --trace)")
+    parser.add_argument('--precision', choices=['full', 'compact'], default='full',
+                        help="compact: float32 / categorical frames and int month keys; cash columns stay float64")
+    args = parser.parse_args()
+    sys.exit(run_pipeline(force=args.force, use_cache=not args.no_cache, cache_size_mb=args.cache_size_mb,
+                          artifact_format=args.format, csv_export=args.csv, precision=args.precision,
+                          trace_path=args.trace, profiler=args.profile))
@@ -0,0 +1,90 @@
+"""
+Artifact format benchmark: write time, read time and on-disk size for CSV vs Parquet / Feather.
+
+Datasets are today's CSVs in data/processed plus two larger long-format frames (driver scenarios
+keyed by `Scenario`, and a multi-entity batch keyed by `entity`).
+
+    python src/artifact_benchmark.py
+    python src/artifact_benchmark.py --scenarios 2000 --entities 5000
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from artifact_io import read_artifact, write_artifact
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# variant -> write_artifact keyword arguments ('partition' is filled in per dataset)
+VARIANTS = {
+    'csv': {'fmt': 'csv'},
+    'parquet': {'fmt': 'parquet'},
+    'parquet-f32': {'fmt': 'parquet', 'float_dtype': 'float32'},
+    'parquet-partitioned': {'fmt': 'parquet', 'partition': True},
+    'feather': {'fmt': 'feather'},
+    'feather-f32': {'fmt': 'feather', 'float_dtype': 'float32'},
+}
+
+def _size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(p) for p in glob.glob(os.path.join(path, '*')))
+    return os.path.getsize(path)
+
+def datasets(n_scenarios, n_entities):
+    from forecast_engine import batch_forecast, load_json
+    from scenario_engine import simulate_scenarios
+
+    out = {}
+    for path in sorted(glob.glob(os.path.join(BASE_DIR, 'data', 'processed', '*.csv'))):
+        out[os.path.basename(path)] = (pd.read_csv(path), 'Scenario')
+    drivers = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+    scenarios = {f'Scenario_{i:04d}': {'revenue_multiplier': 0.8 + 0.4 * i / n_scenarios} for i in range(n_scenarios)}
+    cube = simulate_scenarios(drivers, scenarios, months_horizon=120)
+    out[f'scenarios_{n_scenarios}x120'] = (cube.to_frame().rename(columns={'entity': 'Scenario'}), 'Scenario')
+    table = {'base_revenue_monthly': [drivers['base_revenue_monthly'] * (1 + i / n_entities) for i in range(n_entities)]}
+    table.update({k: v for k, v in drivers.items() if k not in table})
+    entities = [f'E{i:05d}' for i in range(n_entities)]
+    out[f'entities_{n_entities}x60'] = (batch_forecast(table, months_horizon=60, entities=entities).to_frame(), 'entity')
+    return out
+
+def run_benchmark(n_scenarios=1000, n_entities=2000, repeat=3):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (df, key) in datasets(n_scenarios, n_entities).items():
+            for variant, options in VARIANTS.items():
+                options = dict(options)
+                partition = key if options.pop('partition', False) else None
+                if partition is not None and partition not in df.columns:
+                    continue
+                target = os.path.join(tmp, os.path.splitext(name)[0])
+                write_s = read_s = float('inf')
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    path = write_artifact(df, target, partition_by=partition, **options)
+                    write_s = min(write_s, time.perf_counter() - started)
+                    started = time.perf_counter()
+                    read_artifact(path)
+                    read_s = min(read_s, time.perf_counter() - started)
+                rows.append({'dataset': name, 'rows': len(df), 'variant': variant, 'write_ms': write_s * 1e3,
+                             'read_ms': read_s * 1e3, 'size_kb': _size(path) / 1024})
+                shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+    result = pd.DataFrame(rows)
+    csv_size = result[result['variant'] == 'csv'].set_index('dataset')['size_kb']
+    result['size_vs_csv'] = result['size_kb'] / result['dataset'].map(csv_size)
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark artifact formats against CSV.")
+    parser.add_argument('--scenarios', type=int, default=1000)
+    parser.add_argument('--entities', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print("📦 Artifact format benchmark (best of %d)" % args.repeat)
+    result = run_benchmark(args.scenarios, args.entities, args.repeat)
+    print(result.to_string(index=False, float_format=lambda v: f'{v:,.2f}'))
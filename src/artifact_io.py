@@ -0,0 +1,187 @@
+"""
+Artifact writer / reader for CSV, Parquet and Feather.
+
+Binary formats keep float dtypes (optionally downcast to float32) and store label columns such as
+`Scenario` / `entity` as categoricals, which Arrow writes dictionary-encoded, so a name is stored
+once per file instead of once per row. A frame can be partitioned by a column: the artifact path
+becomes a directory with one file per value (`Scenario=Best.parquet`, ...) and a `_partitions.json`
+manifest that keeps the original order and lets readers load only the partitions they need.
+
+Int month-key date columns (compact precision) are written to CSV as ISO dates.
+
+Parquet and Feather need pyarrow (`pip install pyarrow`); CSV works without it.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from precision import expand_dates
+
+FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+CATEGORICAL_COLUMNS = ('Scenario', 'scenario', 'entity', 'metric', 'lever')
+MANIFEST = '_partitions.json'
+
+def artifact_path(path, fmt):
+    """`path` with its extension swapped for the format's."""
+    return os.path.splitext(path)[0] + FORMATS[fmt]
+
+def format_of(path):
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, suffix in FORMATS.items():
+        if ext == suffix:
+            return fmt
+    raise ValueError(f"Cannot infer artifact format from '{path}' (expected one of {', '.join(FORMATS.values())})")
+
+def _require_pyarrow(fmt):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(f"{fmt} artifacts need pyarrow (pip install pyarrow); use fmt='csv' without it") from exc
+
+def _prepare(df, float_dtype):
+    out = df.copy()
+    for col in out.columns:
+        if col in CATEGORICAL_COLUMNS and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype('category')
+        elif float_dtype and pd.api.types.is_float_dtype(out[col].dtype):
+            out[col] = out[col].astype(float_dtype)
+    return out
+
+def _write_file(df, path, fmt, float_dtype):
+    if fmt == 'csv':
+        expand_dates(df).to_csv(path, index=False)
+        return
+    _require_pyarrow(fmt)
+    df = _prepare(df, float_dtype).reset_index(drop=True)
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
+
+def _read_file(path, fmt, columns):
+    if fmt == 'csv':
+        return pd.read_csv(path, usecols=columns)
+    _require_pyarrow(fmt)
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
+
+def write_artifact(df, path, fmt=None, partition_by=None, float_dtype=None, csv_export=False):
+    """Write `df` to `path` (format from `fmt` or the extension) and return the path written.
+
+    `partition_by` names a column to split on; `float_dtype='float32'` halves float storage in the
+    binary formats. With `csv_export` an unpartitioned CSV copy is written next to the artifact.
+    """
+    fmt = fmt or format_of(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown artifact format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    path = artifact_path(path, fmt)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+    if partition_by is None:
+        _write_file(df, path, fmt, float_dtype)
+    else:
+        os.makedirs(path)
+        parts = []
+        for value, part in df.groupby(partition_by, sort=False, observed=True):
+            name = f'{partition_by}={value}{FORMATS[fmt]}'.replace(os.sep, '_')
+            _write_file(part, os.path.join(path, name), fmt, float_dtype)
+            parts.append({'value': value.item() if isinstance(value, np.generic) else value, 'file': name})
+        with open(os.path.join(path, MANIFEST), 'w') as f:
+            json.dump({'format': fmt, 'column': partition_by, 'partitions': parts}, f, indent=2)
+
+    if csv_export and fmt != 'csv':
+        expand_dates(df).to_csv(artifact_path(path, 'csv'), index=False)
+    return path
+
+class ChunkedWriter:
+    """Append frames to one artifact chunk by chunk, without holding the whole table in memory.
+
+    CSV chunks are appended under a single header, so the file is byte-identical to writing the
+    concatenated frame at once. Parquet chunks become row groups and Feather chunks record batches
+    of one Arrow IPC file (label columns as plain strings there, not dictionary-encoded). Every chunk
+    must carry the columns and dtypes of the first.
+
+        with ChunkedWriter('history.parquet') as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path, fmt=None, float_dtype=None):
+        self.fmt = fmt or format_of(path)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown artifact format '{self.fmt}' (expected one of {', '.join(FORMATS)})")
+        if self.fmt != 'csv':
+            _require_pyarrow(self.fmt)
+        self.path = artifact_path(path, self.fmt)
+        self.float_dtype = float_dtype
+        self.rows = 0
+        self.chunks = 0
+        self._sink = None
+        self._schema = None
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+
+    def write(self, df):
+        if self.fmt == 'csv':
+            expand_dates(df).to_csv(self.path, index=False, mode='w' if self.chunks == 0 else 'a',
+                                    header=self.chunks == 0)
+        else:
+            import pyarrow as pa
+            df = _prepare(df, self.float_dtype)
+            if self.fmt == 'feather':
+                # An IPC file allows one dictionary per field, but each chunk has its own categories
+                df = df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+            if self._sink is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._schema = table.schema
+                if self.fmt == 'parquet':
+                    import pyarrow.parquet as pq
+                    self._sink = pq.ParquetWriter(self.path, self._schema)
+                else:
+                    self._sink = pa.ipc.new_file(self.path, self._schema,
+                                                 options=pa.ipc.IpcWriteOptions(compression='lz4'))
+            else:
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._sink.write_table(table)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def read_artifact(path, columns=None, partitions=None):
+    """Read an artifact written by write_artifact; `partitions` restricts a partitioned read to those values."""
+    if os.path.isdir(path):
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+        wanted = manifest['partitions']
+        if partitions is not None:
+            keep = set(partitions)
+            wanted = [p for p in wanted if p['value'] in keep]
+        frames = [_read_file(os.path.join(path, p['file']), manifest['format'], columns) for p in wanted]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        df = pd.concat(frames, ignore_index=True)
+        col = manifest['column']
+        if col in df.columns and manifest['format'] != 'csv':
+            df[col] = pd.Categorical(df[col].astype(object), categories=[p['value'] for p in wanted])
+        return df
+    return _read_file(path, format_of(path), columns)
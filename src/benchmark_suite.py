@@ -0,0 +1,266 @@
+"""
+Benchmark suite for every pipeline stage, with stored results and regression checks.
+
+Each benchmark is a stage entry point timed at several sizes. A measurement is `rounds` rounds of
+auto-scaled loops (each round runs at least `min_time` seconds); per-call min / median / mean /
+stdev are stored in a JSON file together with machine info and the git commit.
+
+    python src/benchmark_suite.py run                               # -> .benchmarks/<time>_<commit>.json
+    python src/benchmark_suite.py run --filter scenarios --rounds 3
+    python src/benchmark_suite.py compare old.json new.json --threshold 0.10
+
+`compare` exits with status 1 when any benchmark is slower than the baseline by more than the
+threshold, so a nightly job can fail on it.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, '.benchmarks')
+SCHEMA_VERSION = 1
+
+# ---------------------------------------------------------
+# Benchmarks: name -> (sizes, setup); setup(size, tmp) returns the zero-argument callable to time
+# ---------------------------------------------------------
+
+def _drivers():
+    from forecast_engine import load_json
+    return load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+def _scenario_workspace(tmp, n_scenarios=3, n_changes=3):
+    """A processed/ + config/ tree the way ScenarioEngine expects it (config found next to the forecast)."""
+    base = pd.read_csv(os.path.join(BASE_DIR, 'data', 'processed', 'scenario_output.csv'))
+    base = base[base['Scenario'] == 'Base'].drop(columns='Scenario')
+    base.columns = [c if c == 'Date' else c + '_Forecast' for c in base.columns]
+    os.makedirs(os.path.join(tmp, 'processed'), exist_ok=True)
+    os.makedirs(os.path.join(tmp, 'config'), exist_ok=True)
+    forecast_path = os.path.join(tmp, 'processed', 'forecast.csv')
+    base.to_csv(forecast_path, index=False)
+    scenarios = {f'Scenario_{i:05d}': {'revenue_multiplier': 0.8 + 0.4 * i / n_scenarios,
+                                       'cost_multiplier': 1.2 - 0.4 * i / n_scenarios} for i in range(n_scenarios)}
+    changes = np.round(np.linspace(-0.2, 0.2, n_changes), 6).tolist()
+    with open(os.path.join(tmp, 'config', 'scenarios.json'), 'w') as f:
+        json.dump(scenarios, f)
+    with open(os.path.join(tmp, 'config', 'sensitivity.json'), 'w') as f:
+        json.dump({'levers': {'price': {'range': changes}, 'volume': {'range': changes}}}, f)
+    shutil.copy(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'), os.path.join(tmp, 'config', 'drivers.json'))
+    return forecast_path
+
+def setup_forecast(months, tmp):
+    from forecast_engine import driver_forecast
+    drivers, path = _drivers(), os.path.join(tmp, 'forecast_output.csv')
+    return lambda: driver_forecast(drivers=drivers, months_horizon=months, output_path=path)
+
+def setup_scenarios(n, tmp):
+    from scenario_engine import ScenarioEngine
+    engine = ScenarioEngine(_scenario_workspace(tmp, n_scenarios=n))
+    return engine.generate_scenarios
+
+def setup_sensitivity(n, tmp):
+    from scenario_engine import ScenarioEngine
+    engine = ScenarioEngine(_scenario_workspace(tmp, n_changes=n))
+    return engine.run_sensitivity_analysis
+
+def setup_export(months, tmp):
+    from export_module import ExportModule
+    from forecast_engine import forecast_frame
+    df = forecast_frame(_drivers(), months_horizon=months)
+    exporter = ExportModule(os.path.join(BASE_DIR, 'data', 'raw', 'historical_financials.csv'), None, forecast_df=df)
+    path = os.path.join(tmp, 'model.xlsx')
+    return lambda: exporter.create_excel_model(path, constant_memory=True)  # as the pipeline runs it
+
+def setup_insights(months, tmp):
+    from forecast_engine import forecast_frame
+    from insight_generator import InsightGenerator
+    f = forecast_frame(_drivers(), months_horizon=months)
+    df = pd.DataFrame({'Date': f['date'], 'Revenue': f['revenue'], 'COGS': f['cogs'], 'EBITDA': f['ebitda'],
+                       'OpEx_Sales': f['opex'], 'OpEx_Admin': f['payroll'],
+                       'CashFlow': f['operating_cf'] + f['investing_cf'] + f['financing_cf']})
+    path = os.path.join(tmp, 'insights.txt')
+    return lambda: InsightGenerator(None, path, df=df).generate_report()
+
+def setup_history(years, tmp):
+    from data_generator import FinancialDataGenerator
+    gen = FinancialDataGenerator(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+    gen.years, gen.months = years, years * 12
+
+    def run():
+        np.random.seed(42)
+        return gen.generate_financials()
+    return run
+
+def setup_history_panel(entities, tmp):
+    from data_generator import FinancialDataGenerator
+    gen = FinancialDataGenerator(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'), years=20)
+    path = os.path.join(tmp, 'history.parquet')
+    return lambda: gen.generate_panel(path, entities, seed=0)
+
+BENCHMARKS = {
+    'forecast.driver_forecast': ((36, 120, 600), setup_forecast),
+    'scenarios.generate_scenarios': ((3, 100, 1000), setup_scenarios),
+    'scenarios.run_sensitivity_analysis': ((3, 50, 500), setup_sensitivity),
+    'export.create_excel_model': ((36, 120, 240), setup_export),
+    'insights.generate_report': ((36, 600), setup_insights),
+    'history.generate_financials': ((5, 50), setup_history),
+    'history.generate_panel': ((100, 1000), setup_history_panel),
+}
+
+# ---------------------------------------------------------
+# Running
+# ---------------------------------------------------------
+
+def machine_info():
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=BASE_DIR, capture_output=True, text=True,
+                                  timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+def time_callable(func, rounds=5, min_time=0.2):
+    """Per-call timings: calibrate loops so a round takes >= min_time, then time `rounds` rounds."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()  # warm-up (imports, caches)
+        loops = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time or loops >= 1_000_000:
+                break
+            loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+        samples = [elapsed / loops]
+        for _ in range(rounds - 1):
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter() - started) / loops)
+    return {
+        'min': min(samples), 'median': statistics.median(samples), 'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'rounds': len(samples), 'loops': loops,
+    }
+
+def run_suite(pattern=None, rounds=5, min_time=0.2, sizes=None):
+    """Run every benchmark whose `name[size]` matches `pattern`; returns the result document."""
+    results = {}
+    for name, (default_sizes, setup) in BENCHMARKS.items():
+        for size in (sizes or {}).get(name, default_sizes):
+            key = f'{name}[{size}]'
+            if pattern and not re.search(pattern, key):
+                continue
+            tmp = tempfile.mkdtemp(prefix='bench_')
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func = setup(size, tmp)
+                stats = time_callable(func, rounds, min_time)
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+            results[key] = dict(stats, benchmark=name, size=size)
+            print(f"  {key:<46} {stats['median'] * 1e3:>11.3f} ms  (min {stats['min'] * 1e3:.3f}, "
+                  f"{stats['rounds']}x{stats['loops']})")
+    return {'version': SCHEMA_VERSION, 'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'machine': machine_info(), 'settings': {'rounds': rounds, 'min_time': min_time}, 'results': results}
+
+def save_results(document, path=None):
+    if path is None:
+        commit = (document['machine'].get('commit') or 'nocommit')[:10]
+        stamp = document['created'].replace(':', '').replace('-', '').replace('+0000', 'Z')
+        path = os.path.join(RESULTS_DIR, f'{stamp}_{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+# ---------------------------------------------------------
+# Comparing
+# ---------------------------------------------------------
+
+def compare(baseline, candidate, threshold=0.10, stat='min'):
+    """Table of candidate / baseline timings; `regression` marks ratios above 1 + threshold."""
+    rows = []
+    old, new = baseline['results'], candidate['results']
+    for key in sorted(set(old) | set(new)):
+        if key not in old or key not in new:
+            rows.append({'benchmark': key, 'baseline_ms': old[key][stat] * 1e3 if key in old else np.nan,
+                         'candidate_ms': new[key][stat] * 1e3 if key in new else np.nan, 'ratio': np.nan,
+                         'status': 'removed' if key in old else 'new'})
+            continue
+        ratio = new[key][stat] / old[key][stat]
+        status = 'regression' if ratio > 1 + threshold else 'improved' if ratio < 1 / (1 + threshold) else 'ok'
+        rows.append({'benchmark': key, 'baseline_ms': old[key][stat] * 1e3, 'candidate_ms': new[key][stat] * 1e3,
+                     'ratio': ratio, 'status': status})
+    return pd.DataFrame(rows, columns=['benchmark', 'baseline_ms', 'candidate_ms', 'ratio', 'status'])
+
+def _load(path):
+    with open(path, 'r') as f:
+        document = json.load(f)
+    if document.get('version') != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark schema version {document.get('version')}")
+    return document
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline stage benchmarks with regression tracking.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help="run the suite and store the results as JSON")
+    run.add_argument('--filter', help="regex on 'benchmark[size]'")
+    run.add_argument('--rounds', type=int, default=5)
+    run.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per round")
+    run.add_argument('--output', help="result file (default .benchmarks/<time>_<commit>.json)")
+    cmp = sub.add_parser('compare', help="compare two result files and flag regressions")
+    cmp.add_argument('baseline')
+    cmp.add_argument('candidate')
+    cmp.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    cmp.add_argument('--stat', choices=['min', 'median', 'mean'], default='min')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        print("⏱  Running pipeline benchmarks...")
+        document = run_suite(args.filter, args.rounds, args.min_time)
+        print(f"💾 Results saved: {save_results(document, args.output)}")
+        return 0
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    if baseline['machine'].get('hostname') != candidate['machine'].get('hostname'):
+        print("⚠️  Results come from different machines; ratios may reflect hardware, not code.")
+    table = compare(baseline, candidate, args.threshold, args.stat)
+    print(table.to_string(index=False, float_format=lambda v: f'{v:,.3f}'))
+    regressions = table[table['status'] == 'regression']
+    if len(regressions):
+        print(f"\n🚩 {len(regressions)} regression(s) above {args.threshold:.0%} ({args.stat} time)")
+        return 1
+    print(f"\n✅ No regressions above {args.threshold:.0%}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Single command-line entry point for the simulator.
+
+    python src/cli.py forecast --json                  # driver forecast as JSON (NumPy only)
+    python src/cli.py forecast --months 60 --format parquet
+    python src/cli.py scenarios --json                 # every scenarios.json entry, re-simulated
+    python src/cli.py sensitivity [--json]
+    python src/cli.py export                           # Excel model from the forecast artifact
+    python src/cli.py insights
+    python src/cli.py history --entities 10000 --years 20 --output history.parquet
+    python src/cli.py variance                         # actuals vs budget / scenarios, MoM and YoY
+    python src/cli.py all [--force]                    # the full pipeline, as run.py
+
+Only the standard library loads at startup. Each subcommand imports what it needs when it runs, so
+the JSON outputs never import pandas, and xlsxwriter / pyarrow load only for `export` and binary
+formats. `python src/startup_benchmark.py` measures every subcommand with -X importtime.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_DIR = os.path.join(BASE_DIR, 'data', 'config')
+
+def _config(path, name):
+    from forecast_engine import load_json
+    return load_json(path or os.path.join(CONFIG_DIR, name))
+
+def _emit(document, path=None):
+    """Write a JSON document to `path`, or to stdout."""
+    if path:
+        with open(path, 'w') as f:
+            json.dump(document, f)
+        return
+    json.dump(document, sys.stdout)
+    sys.stdout.write('\n')
+
+def _context(args):
+    from pipeline import Context, Lazy, default_context
+
+    ctx = Context(default_context(BASE_DIR, args.format, precision=args.precision))
+    path = ctx['forecast_path']
+
+    def forecast():
+        from artifact_io import read_artifact
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; run the 'forecast' subcommand first")
+        return read_artifact(path)
+    ctx['forecast'] = Lazy(forecast)
+    return ctx
+
+# ---------------------------------------------------------
+# Subcommands
+# ---------------------------------------------------------
+
+def cmd_forecast(args):
+    drivers = _config(args.drivers, 'drivers.json')
+    if args.json:
+        if args.checkpoint or args.resume:
+            raise SystemExit("forecast: --json cannot be combined with --checkpoint / --resume")
+        from forecast_engine import forecast_columns
+        _emit(forecast_columns(drivers, args.start, args.months, args.opening_cash), args.output)
+        return 0
+    from forecast_engine import driver_forecast
+    driver_forecast(args.start, args.months, args.opening_cash, drivers=drivers, output_path=args.output,
+                    fmt=args.format, csv_export=args.csv, precision=args.precision,
+                    checkpoint_path=args.checkpoint, resume_from=args.resume)
+    return 0
+
+def cmd_scenarios(args):
+    from scenario_engine import simulate_scenarios
+
+    drivers = _config(args.drivers, 'drivers.json')
+    scenarios = _config(args.scenarios, 'scenarios.json')
+    cube = simulate_scenarios(drivers, scenarios, args.start, args.months, args.opening_cash)
+    if args.json:
+        _emit({'date': cube.dates,
+               'scenarios': {name: {metric: cube.values[i, :, k].tolist() for k, metric in enumerate(cube.metrics)}
+                             for i, name in enumerate(cube.entities)}}, args.output)
+        return 0
+
+    print(f"⚡ Simulated {len(cube.entities)} scenarios x {args.months} months")
+    revenue, ebitda = cube.metric('revenue').sum(axis=1), cube.metric('ebitda').sum(axis=1)
+    cash = cube.metric('cash_balance')[:, -1]
+    print(f"  {'scenario':<16} {'revenue':>16} {'ebitda':>16} {'ending cash':>16}")
+    for i, name in enumerate(cube.entities):
+        print(f"  {name:<16} {revenue[i]:>16,.0f} {ebitda[i]:>16,.0f} {cash[i]:>16,.0f}")
+    if args.output:
+        from artifact_io import write_artifact
+        from precision import compact_frame
+        df = compact_frame(cube.to_frame().rename(columns={'entity': 'Scenario'}), args.precision)
+        print(f"💾 Scenarios saved: {write_artifact(df, args.output, args.format)}")
+    return 0
+
+def cmd_sensitivity(args):
+    import numpy as np
+    from sensitivity import SensitivityEngine
+
+    drivers = _config(args.drivers, 'drivers.json')
+    engine = SensitivityEngine(drivers, _config(args.config, 'sensitivity.json'), args.start, args.months,
+                               args.opening_cash)
+    if args.json:
+        # One-way sweeps only: one batched evaluate over the baseline plus every lever's range
+        points = [(None, 0.0)] + [(lever, shift) for lever in engine.levers for shift in engine.ranges[lever]]
+        shifts = np.zeros((len(points), len(engine.levers)))
+        for row, (lever, shift) in enumerate(points[1:], start=1):
+            shifts[row, engine.levers.index(lever)] = shift
+        values = engine.evaluate(shifts)
+        _emit({'levers': engine.levers, 'metrics': engine.metrics,
+               'base': {m: float(values[m][0]) for m in engine.metrics},
+               'one_way': [dict({'lever': lever, 'shift': shift}, **{m: float(values[m][row]) for m in engine.metrics})
+                           for row, (lever, shift) in enumerate(points) if lever is not None]}, args.output)
+        return 0
+
+    from sensitivity import save_tables
+    result = engine.run()
+    print(f"〰️ Evaluated {len(result.points)} sensitivity points")
+    print(result.tornado('ebitda')[['rank', 'lever', 'low_value', 'high_value', 'swing']].to_string(index=False))
+    out_dir = save_tables(result, args.output or os.path.join(BASE_DIR, 'data', 'processed'))
+    print(f"💾 Sensitivity tables saved to {out_dir}")
+    return 0
+
+def cmd_export(args):
+    from pipeline import export_excel
+
+    ctx = _context(args)
+    if args.output:
+        ctx['excel_path'] = args.output
+    export_excel(ctx)
+    return 0
+
+def cmd_insights(args):
+    from pipeline import generate_insights
+
+    ctx = _context(args)
+    if args.output:
+        ctx['insights_path'] = args.output
+    generate_insights(ctx)
+    return 0
+
+def cmd_history(args):
+    from data_generator import FinancialDataGenerator
+
+    gen = FinancialDataGenerator(args.drivers or os.path.join(CONFIG_DIR, 'drivers.json'), years=args.years)
+    gen.generate_panel(args.output, args.entities, seed=args.seed, chunk_size=args.chunk_size, fmt=args.format,
+                       precision=args.precision, workers=args.workers, executor=args.executor)
+    return 0
+
+def cmd_variance(args):
+    from artifact_io import read_artifact
+    from variance import VarianceEngine, save_tables
+
+    processed = os.path.join(BASE_DIR, 'data', 'processed')
+    paths = {'actuals': args.actuals or os.path.join(BASE_DIR, 'data', 'raw', 'historical_financials.csv'),
+             'budget': args.budget or os.path.join(processed, 'forecast_output.csv'),
+             'scenarios': args.scenarios or os.path.join(processed, 'scenario_output.csv')}
+    # Explicit paths must exist; a missing default layer is just left out
+    layers = {name: read_artifact(path) for name, path in paths.items()
+              if getattr(args, name) or os.path.exists(path)}
+    result = VarianceEngine(**layers, base=args.base).compute()
+    index = result.index
+    print(f"📐 Variance: {len(index.entities):,} entities x {index.months} months x {len(result.metrics)} metrics "
+          f"({', '.join(result.kinds)})")
+    for path in save_tables(result, args.output or processed, args.format):
+        print(f"💾 {path}")
+    return 0
+
+def cmd_all(args):
+    sys.path.insert(0, BASE_DIR)
+    from run import run_pipeline
+    return run_pipeline(force=args.force, use_cache=not args.no_cache, artifact_format=args.format,
+                        csv_export=args.csv, precision=args.precision, trace_path=args.trace, profiler=args.profile)
+
+# ---------------------------------------------------------
+# Parser
+# ---------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='forecast', description="P3 financial forecasting simulator.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def driver_args(p):
+        p.add_argument('--drivers', help="drivers JSON (default data/config/drivers.json)")
+        p.add_argument('--start', default='2025-01-01', help="first forecast month (ISO date)")
+        p.add_argument('--months', type=int, default=36, help="forecast horizon in months")
+        p.add_argument('--opening-cash', type=float, default=500000.0)
+
+    def frame_args(p):
+        p.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                       help="artifact file format (parquet/feather need pyarrow)")
+        p.add_argument('--precision', choices=['full', 'compact'], default='full')
+
+    p = sub.add_parser('forecast', help="driver-based forecast")
+    driver_args(p)
+    frame_args(p)
+    p.add_argument('--json', action='store_true', help="print the forecast as JSON (no pandas import)")
+    p.add_argument('--csv', action='store_true', help="also export a CSV copy when --format is binary")
+    p.add_argument('--checkpoint', help="save the state at the last month (.npz) for a later --resume")
+    p.add_argument('--resume', help="continue from a checkpoint: forecast only the next --months months")
+    p.add_argument('--output', help="output file (default data/processed/forecast_output.<ext>; stdout for --json)")
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser('scenarios', help="re-simulate every scenario from the drivers")
+    driver_args(p)
+    frame_args(p)
+    p.add_argument('--scenarios', help="scenarios JSON (default data/config/scenarios.json)")
+    p.add_argument('--json', action='store_true', help="print every scenario's monthly metrics as JSON")
+    p.add_argument('--output', help="write the long-format scenario table (or the JSON) here")
+    p.set_defaults(func=cmd_scenarios)
+
+    p = sub.add_parser('sensitivity', help="lever sensitivity tables")
+    driver_args(p)
+    p.add_argument('--config', help="sensitivity JSON (default data/config/sensitivity.json)")
+    p.add_argument('--json', action='store_true', help="print the one-way sweeps as JSON")
+    p.add_argument('--output', help="table directory (default data/processed), or the JSON file")
+    p.set_defaults(func=cmd_sensitivity)
+
+    p = sub.add_parser('export', help="Excel model from the forecast artifact")
+    frame_args(p)
+    p.add_argument('--output', help="workbook path (default outputs/FPnA_Model_with_formulas.xlsx)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('insights', help="insights report from the Base scenario")
+    frame_args(p)
+    p.add_argument('--output', help="report path (default outputs/insights_report.txt)")
+    p.set_defaults(func=cmd_insights)
+
+    p = sub.add_parser('history', help="synthetic multi-entity history (load-test data)")
+    p.add_argument('--format', choices=['csv', 'parquet', 'feather'], help="default: from the --output extension")
+    p.add_argument('--precision', choices=['full', 'compact'], default='full')
+    p.add_argument('--drivers', help="drivers JSON (default data/config/drivers.json)")
+    p.add_argument('--entities', type=int, default=1000)
+    p.add_argument('--years', type=int, default=5)
+    p.add_argument('--seed', type=int, default=0, help="same seed, same rows (for any --chunk-size)")
+    p.add_argument('--chunk-size', type=int, default=1024, help="entities generated and written per chunk")
+    p.add_argument('--workers', type=int, help="generate and write chunks on a pool, one part file per chunk")
+    p.add_argument('--executor', choices=['thread', 'process'],
+                   help="pool type for --workers (default: process for CSV, thread for Parquet/Feather)")
+    p.add_argument('--output', required=True, help="output file (.csv / .parquet / .feather)")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser('variance', help="actuals vs budget and scenarios: MoM, YoY, BvA, scenario vs base")
+    p.add_argument('--actuals', help="actuals artifact (default data/raw/historical_financials.csv)")
+    p.add_argument('--budget', help="budget artifact (default data/processed/forecast_output.csv)")
+    p.add_argument('--scenarios', help="long scenario artifact (default data/processed/scenario_output.csv)")
+    p.add_argument('--base', default='Base', help="scenario the others are compared with")
+    p.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv')
+    p.add_argument('--output', help="directory for the variance_<kind> tables (default data/processed)")
+    p.set_defaults(func=cmd_variance)
+
+    p = sub.add_parser('all', help="run the full pipeline (same as run.py)")
+    frame_args(p)
+    p.add_argument('--force', action='store_true', help="re-run every stage even if cached")
+    p.add_argument('--no-cache', action='store_true', help="neither read nor write the stage cache")
+    p.add_argument('--csv', action='store_true', help="also export the forecast as CSV when --format is binary")
+    p.add_argument('--trace', nargs='?', const=os.path.join(BASE_DIR, 'outputs', 'run_trace.json'))
+    p.add_argument('--profile', choices=['cprofile', 'pyinstrument'])
+    p.set_defaults(func=cmd_all)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
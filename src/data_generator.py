@@ -2,15 +2,26 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import shutil
+import time
 from datetime import datetime, timedelta
 
+from artifact_io import ChunkedWriter, FORMATS, artifact_path, format_of, write_artifact
+from parallel_writer import default_executor, run_parts, write_csv, write_manifest, write_partitions
+from precision import compact_frame
+
+HISTORY_COLUMNS = ['Month', 'Revenue', 'COGS', 'OpEx_Sales', 'OpEx_Admin', 'Capex', 'Cash_In', 'Cash_Out']
+# Entities per random stream. Fixed (not tied to chunk_size) so an entity's history depends only on
+# the seed and its index: the same seed gives the same rows for any chunk size or entity count.
+STREAM_BLOCK = 256
+
 class FinancialDataGenerator:
-    def __init__(self, config_path):
+    def __init__(self, config_path, years=5):
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
         self.start_date = datetime.strptime(self.config["start_date"], "%Y-%m-%d")
-        self.years = 5
+        self.years = years
         self.months = self.years * 12
         
     def generate_date_range(self):
@@ -84,7 +95,99 @@ class FinancialDataGenerator:
         
         return df
 
-    def generate_dim_date(self, output_path):
+    # ---------------------------------------------------------
+    # Multi-entity panel (synthetic load-test data)
+    # ---------------------------------------------------------
+
+    def _stream(self, seed, block):
+        # Child stream `block` of the seed (SeedSequence.spawn semantics), on a counter-based Philox generator
+        return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, spawn_key=(block,))))
+
+    def _block_columns(self, seed, block):
+        """History columns, each (STREAM_BLOCK x months), for the entities of one stream block."""
+        rng, n, months = self._stream(seed, block), STREAM_BLOCK, self.months
+        t = np.linspace(0, months, months)
+
+        # Per-entity traits: size, growth, seasonal amplitude and cost structure
+        scale = rng.lognormal(0.0, 0.75, (n, 1))
+        growth = self.config["volume_growth_rate"] + rng.normal(0.0, 0.05, (n, 1))
+        amplitude = rng.uniform(0.5, 1.5, (n, 1))
+        cogs_ratio = 0.55 + rng.normal(0.0, 0.03, (n, 1))
+
+        trend_factor = (1 + growth) ** (t / 12)
+        seasonality = np.array(self.config["seasonality_factors"] * self.years) ** amplitude
+        revenue = self.config["base_revenue"] * scale * trend_factor * seasonality * rng.normal(1, 0.05, (n, months))
+        cogs = revenue * cogs_ratio * rng.normal(1, 0.02, (n, months))
+        opex_sales = revenue * 0.15 * rng.normal(1, 0.05, (n, months))
+        salary_inflation_monthly = (1 + self.config["salary_inflation"]) ** (1/12) - 1
+        opex_admin = 150000 * scale * (1 + salary_inflation_monthly) ** t * rng.normal(1, 0.01, (n, months))
+
+        # Two capex events per entity-year, in distinct months
+        event_month = np.argpartition(rng.random((n, self.years, 12)), 2, axis=2)[:, :, :2]
+        amounts = self.config["capex_plan"] / 2 * scale[:, :, None] * rng.uniform(0.8, 1.2, (n, self.years, 2))
+        capex = np.zeros((n, self.years, 12))
+        np.put_along_axis(capex, event_month, amounts, axis=2)
+        capex = capex.reshape(n, months)
+
+        revenue_lag = np.concatenate([revenue[:, :1], revenue[:, :-1]], axis=1)
+        cash_in = 0.8 * revenue + 0.2 * revenue_lag
+        cash_out = cogs + opex_sales + opex_admin + capex
+        columns = {'Revenue': revenue, 'COGS': cogs, 'OpEx_Sales': opex_sales, 'OpEx_Admin': opex_admin,
+                   'Capex': capex, 'Cash_In': cash_in, 'Cash_Out': cash_out}
+        return {name: np.round(values, 2) for name, values in columns.items()}
+
+    def generate_entities(self, start, stop, seed=0, precision='full'):
+        """Long-format history (Entity, Month, ...) for entities start..stop-1, one vectorized pass per stream block."""
+        first, last = start // STREAM_BLOCK, -(-stop // STREAM_BLOCK)
+        blocks = [self._block_columns(seed, b) for b in range(first, last)]
+        lo, hi = start - first * STREAM_BLOCK, stop - first * STREAM_BLOCK
+        dates = pd.date_range(start=self.start_date, periods=self.months, freq='MS')
+        df = pd.DataFrame({
+            'Entity': np.repeat(np.arange(start, stop, dtype=np.int64), self.months),
+            'Month': np.tile(dates.to_numpy(), stop - start),
+        })
+        for name in HISTORY_COLUMNS[1:]:
+            df[name] = np.concatenate([b[name] for b in blocks])[lo:hi].reshape(-1)
+        return compact_frame(df, precision)
+
+    def generate_panel(self, output_path, n_entities, seed=0, chunk_size=1024, fmt=None, precision='full',
+                       workers=None, executor=None):
+        """Write `n_entities` x `self.years` of history to `output_path`, `chunk_size` entities at a time.
+
+        The format follows `fmt` or the extension. Chunks go straight to disk (CSV append, Parquet
+        row groups, Feather record batches), so memory stays at one chunk. With `workers`, chunks are
+        generated and written by a pool instead, one part file each, into a partitioned directory
+        that read_artifact reads back in entity order. Returns the path written.
+        """
+        print(f"🏭 Generating history: {n_entities:,} entities x {self.years} years (seed {seed})...")
+        if workers:
+            return self._generate_parts(output_path, n_entities, seed, chunk_size, fmt or format_of(output_path),
+                                        precision, workers, executor)
+        started = time.perf_counter()
+        with ChunkedWriter(output_path, fmt) as writer:
+            for start in range(0, n_entities, chunk_size):
+                writer.write(self.generate_entities(start, min(start + chunk_size, n_entities), seed, precision))
+        elapsed = time.perf_counter() - started
+        print(f"✅ {writer.rows:,} rows in {writer.chunks} chunks ({elapsed:.2f}s): {writer.path}")
+        return writer.path
+
+    def _generate_parts(self, output_path, n_entities, seed, chunk_size, fmt, precision, workers, executor):
+        path = artifact_path(output_path, fmt)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        bounds = [(start, min(start + chunk_size, n_entities)) for start in range(0, n_entities, chunk_size)]
+        names = [f'part-{i:05d}{FORMATS[fmt]}' for i in range(len(bounds))]
+        tasks = [(self, start, stop, seed, precision, os.path.join(path, name), fmt)
+                 for (start, stop), name in zip(bounds, names)]
+        executor = executor or default_executor(fmt)
+        results, progress, workers = run_parts(_write_entities, tasks, workers, executor, 'history parts')
+        write_manifest(path, fmt, 'part', [{'value': i, 'file': name, 'entities': [start, stop], 'rows': rows}
+                                           for i, (name, (start, stop), (rows, _)) in
+                                           enumerate(zip(names, bounds, results))])
+        return progress.finish(path, workers, executor)['path']
+
+    def generate_dim_date(self, output_path, workers=None):
         print("📅 Generating DimDate...")
         # Range: Start Date -> 5 Years History + 2 Years Forecast Buffer
         total_months = self.months + 24
@@ -99,15 +202,30 @@ class FinancialDataGenerator:
             'IsForecast': [True if i >= self.months else False for i in range(total_months)]
         })
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        dim_date.to_csv(output_path, index=False)
+        # Same write path as save_data: `workers` renders the CSV in parallel row ranges
+        if workers:
+            output_path = write_csv(dim_date, output_path, workers=workers, verbose=False)['path']
+        else:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            dim_date.to_csv(output_path, index=False)
         print(f"✅ DimDate saved: {output_path}")
 
-    def save_data(self, df, output_path):
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        df.to_csv(output_path, index=False)
-        print(f"✅ Data generated successfully: {output_path}")
-        print(df.head())
+    def save_data(self, df, output_path, workers=None, partition_by=None):
+        # Format follows the extension (.csv / .parquet / .feather). `partition_by` ('Entity', 'Year')
+        # writes one file per value on a pool; `workers` alone renders one CSV in parallel row ranges
+        if partition_by:
+            output_path = write_partitions(df, output_path, partition_by, workers=workers)['path']
+        elif workers and format_of(output_path) == 'csv':
+            output_path = write_csv(df, output_path, workers=workers)['path']
+        else:
+            output_path = write_artifact(df, output_path)
+        print(f"✅ Data generated successfully: {output_path} ({len(df):,} rows)")
+
+def _write_entities(gen, start, stop, seed, precision, path, fmt):
+    # Pool task (module level so process pools can pickle it): one chunk of entities -> one part file
+    df = gen.generate_entities(start, stop, seed, precision)
+    write_artifact(df, path, fmt)
+    return len(df), os.path.getsize(path)
 
 if __name__ == "__main__":
     config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'config', 'drivers.json')
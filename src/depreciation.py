@@ -0,0 +1,116 @@
+import numpy as np
+
+METHODS = ('straight_line', 'declining_balance')
+
+def _running(diff, carry=None):
+    # Running total along the month axis, continued from `carry` (the total at the end of the month
+    # before the block) so a resumed schedule adds in exactly the order an uninterrupted one does
+    if carry is None:
+        return np.cumsum(diff, axis=1)
+    return np.cumsum(np.concatenate([np.reshape(carry, (-1, 1)), diff], axis=1), axis=1)[:, 1:]
+
+class AssetRegister:
+    """Compact capex register: one row per vintage (entity, start month index, amount, useful life).
+
+    Schedules are built on integer month indices with difference arrays, so the cost is
+    O(entities x horizon + vintages) rather than one entry per vintage per month of life.
+    """
+
+    def __init__(self, entity=None, start=None, amount=None, life=None):
+        self.entity = np.asarray([] if entity is None else entity, dtype=np.int64)
+        self.start = np.asarray([] if start is None else start, dtype=np.int64)
+        self.amount = np.asarray([] if amount is None else amount, dtype=float)
+        self.life = np.asarray([] if life is None else life, dtype=np.int64)
+
+    @classmethod
+    def from_capex(cls, capex, useful_life):
+        """Register every non-zero cell of an (entities x months) capex block as a vintage."""
+        capex = np.atleast_2d(capex)
+        useful_life = np.broadcast_to(np.asarray(useful_life).reshape(-1), (capex.shape[0],))
+        entity, start = np.nonzero(capex)
+        return cls(entity, start, capex[entity, start], useful_life[entity])
+
+    def __len__(self):
+        return len(self.start)
+
+    def subset(self, mask):
+        return AssetRegister(self.entity[mask], self.start[mask], self.amount[mask], self.life[mask])
+
+    def concat(self, other):
+        return AssetRegister(np.concatenate([self.entity, other.entity]), np.concatenate([self.start, other.start]),
+                             np.concatenate([self.amount, other.amount]), np.concatenate([self.life, other.life]))
+
+    def _impulses(self, n_entities, horizon, offsets, values):
+        # Scatter values at (entity, start + offset); anything landing past the horizon is dropped, and
+        # so is anything before month 0 (vintages carried into a resumed run, already in the carry)
+        position = self.start + offsets
+        keep = position >= 0
+        flat = self.entity[keep] * (horizon + 1) + np.minimum(position[keep], horizon)
+        weights = np.broadcast_to(values, position.shape)[keep]
+        out = np.bincount(flat, weights=weights, minlength=n_entities * (horizon + 1))
+        return out.reshape(n_entities, horizon + 1)[:, :horizon]
+
+    def active_count(self, n_entities, horizon, carry=None):
+        """Number of vintages depreciating in each month."""
+        diff = self._impulses(n_entities, horizon, 0, 1.0) - self._impulses(n_entities, horizon, self.life, 1.0)
+        return _running(diff, carry)
+
+    def straight_line(self, n_entities, horizon, carry=None):
+        """amount / life for `life` months starting in the vintage's own month."""
+        monthly = self.amount / self.life
+        diff = self._impulses(n_entities, horizon, 0, monthly) - self._impulses(n_entities, horizon, self.life, monthly)
+        return _running(diff, carry)
+
+    def declining_balance(self, n_entities, horizon, factor=2.0, carry=None):
+        """Book value x factor/life each month; the remaining book value is written off in the final month.
+
+        For vintages sharing a rate r the open balance follows E[t] = (1 - r) E[t-1] + new - expiring,
+        so the loop runs once per month (per distinct rate) across every entity together. `carry`
+        maps rate -> open balance at the end of the previous month and is advanced in place.
+        """
+        rate = np.broadcast_to(np.asarray(factor, dtype=float).reshape(-1), (n_entities,))[self.entity] / self.life
+        dep = np.zeros((n_entities, horizon))
+        rates = np.unique(rate) if not carry else np.unique(np.concatenate([rate, list(carry)]))
+        for r in rates:
+            group = self.subset(rate == r)
+            remaining = group.amount * (1 - r) ** group.life
+            added = group._impulses(n_entities, horizon, 0, group.amount)
+            expiring = group._impulses(n_entities, horizon, group.life, remaining)
+            balance = np.empty((n_entities, horizon))
+            prev = np.zeros(n_entities) if carry is None else carry.get(r, np.zeros(n_entities))
+            for t in range(horizon):
+                prev = (1 - r) * prev + added[:, t] - expiring[:, t]
+                balance[:, t] = prev
+            if carry is not None:
+                carry[r] = prev
+            dep += r * balance + group._impulses(n_entities, horizon, group.life - 1, remaining)
+        return dep
+
+    def schedule(self, n_entities, horizon, method='straight_line', factor=2.0, carry=None):
+        if method == 'straight_line':
+            return self.straight_line(n_entities, horizon, carry)
+        if method == 'declining_balance':
+            return self.declining_balance(n_entities, horizon, factor, carry)
+        raise ValueError(f"Unknown depreciation method '{method}' (expected one of {METHODS})")
+
+class DepreciationState:
+    """Where the depreciation schedules of a run stand at the end of its last month.
+
+    `register` keeps the vintages that still depreciate or expire in a later month, with starts
+    relative to the next run's first month (so negative); `straight_line` and `active` are the
+    running totals of those schedules, `declining` maps each declining-balance rate to its open
+    balance. depreciation_matrix(..., state=...) continues from here and advances the state.
+    """
+
+    def __init__(self, n_entities, register=None, straight_line=None, active=None, declining=None):
+        self.n_entities = n_entities
+        self.register = register if register is not None else AssetRegister()
+        self.straight_line = straight_line
+        self.active = active
+        self.declining = dict(declining or {})
+
+    def copy(self):
+        return DepreciationState(self.n_entities, self.register.subset(slice(None)),
+                                 None if self.straight_line is None else self.straight_line.copy(),
+                                 None if self.active is None else self.active.copy(),
+                                 {r: prev.copy() for r, prev in self.declining.items()})
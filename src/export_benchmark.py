@@ -0,0 +1,79 @@
+"""
+Excel export benchmark: wall time, peak RSS and file size per horizon and export mode.
+
+Each measurement runs in a fresh interpreter so peak RSS is not inherited from earlier runs.
+
+    python src/export_benchmark.py                      # 36/120/240/600 months, all modes
+    python src/export_benchmark.py --months 36 240 --modes streaming-compact
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# mode -> create_excel_model keyword arguments
+MODES = {
+    'in-memory': {'constant_memory': False, 'depreciation_layout': 'waterfall'},
+    'streaming': {'constant_memory': True, 'depreciation_layout': 'waterfall'},
+    'streaming-compact': {'constant_memory': True, 'depreciation_layout': 'compact'},
+}
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def measure(months, mode, out_dir):
+    """Export one workbook in this process and return its metrics."""
+    from export_module import ExportModule
+    from forecast_engine import forecast_frame, load_json
+
+    drivers = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+    df = forecast_frame(drivers, months_horizon=months)
+    path = os.path.join(out_dir, f'export_{months}_{mode}.xlsx')
+    exporter = ExportModule(os.path.join(BASE_DIR, 'data', 'raw', 'historical_financials.csv'), None, forecast_df=df)
+    rss_before = _peak_rss_mb()
+    started = time.perf_counter()
+    exporter.create_excel_model(path, **MODES[mode])
+    wall = time.perf_counter() - started
+    return {'months': months, 'mode': mode, 'wall_s': round(wall, 3), 'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'rss_growth_mb': round(_peak_rss_mb() - rss_before, 1), 'file_kb': round(os.path.getsize(path) / 1024, 1)}
+
+def run_benchmark(months_list, modes):
+    results = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for months in months_list:
+            for mode in modes:
+                proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--single', str(months), mode, out_dir],
+                                      capture_output=True, text=True, check=True)
+                results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+                r = results[-1]
+                print(f"{r['months']:>5} mo  {r['mode']:<18} {r['wall_s']:>8.3f}s  peak {r['peak_rss_mb']:>7.1f} MB  "
+                      f"(+{r['rss_growth_mb']:.1f})  {r['file_kb']:>9.1f} KB")
+    return results
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+    parser = argparse.ArgumentParser(description="Benchmark the Excel export across horizons and modes.")
+    parser.add_argument('--months', type=int, nargs='+', default=[36, 120, 240, 600])
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=list(MODES))
+    parser.add_argument('--single', nargs=3, metavar=('MONTHS', 'MODE', 'DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        months, mode, out_dir = args.single
+        with open(os.devnull, 'w') as quiet:
+            stdout, sys.stdout = sys.stdout, quiet
+            result = measure(int(months), mode, out_dir)
+            sys.stdout = stdout
+        print(json.dumps(result))
+    else:
+        print("📏 Excel export benchmark")
+        run_benchmark(args.months, args.modes)
@@ -4,17 +4,34 @@ import xlsxwriter
 import json
 from datetime import datetime
 
+from instrumentation import steps
+from precision import to_dates
+
+DEPRECIATION_LAYOUTS = ('waterfall', 'compact')
+
 class ExportModule:
-    def __init__(self, history_path, forecast_path):
+    def __init__(self, history_path, forecast_path, forecast_df=None):
         self.history_path = history_path
         self.forecast_path = forecast_path
-        # Load forecast data to get dates and baseline values for validation
-        self.forecast_df = pd.read_csv(forecast_path)
+        # Load forecast data to get dates and baseline values for validation (unless handed over in memory)
+        self.forecast_df = forecast_df if forecast_df is not None else pd.read_csv(forecast_path)
         
-    def create_excel_model(self, output_path):
+    def create_excel_model(self, output_path, constant_memory=False, depreciation_layout='waterfall'):
+        """Write the formula-driven workbook.
+
+        Every sheet is written in row order, so `constant_memory=True` can stream rows to disk
+        (xlsxwriter flushes a row once a later one is started) instead of holding the workbook in memory.
+        `depreciation_layout='compact'` replaces the N x N vintage waterfall with a cumulative-difference
+        schedule whose formula count is linear in the horizon.
+        """
+        if depreciation_layout not in DEPRECIATION_LAYOUTS:
+            raise ValueError(f"Unknown depreciation layout '{depreciation_layout}' (expected one of {DEPRECIATION_LAYOUTS})")
         print(f"📗 Building Corporate Excel Model (Formulas) at {output_path}...")
         
-        writer = pd.ExcelWriter(output_path, engine='xlsxwriter')
+        trace = steps('export')
+        trace.next('open')
+        writer = pd.ExcelWriter(output_path, engine='xlsxwriter',
+                                engine_kwargs={'options': {'constant_memory': constant_memory}})
         workbook = writer.book
         
         # ---------------------------------------------------------
@@ -28,12 +45,14 @@ class ExportModule:
         fmt_pct = workbook.add_format({'num_format': '0.00%', 'border': 1})
         fmt_month = workbook.add_format({'num_format': 'mmm-yy', 'bold': True, 'align': 'center', 'bg_color': '#ECF0F1', 'border': 1})
         
+        trace.next('load_drivers')
         # Load Drivers
         base_dir = os.path.dirname(os.path.dirname(self.history_path))
         drivers_path = os.path.join(base_dir, 'config', 'drivers.json')
         with open(drivers_path) as f:
             drivers = json.load(f)
 
+        trace.next('inputs_sheet')
         # ---------------------------------------------------------
         # 1. Inputs Sheet (Categorized)
         # ---------------------------------------------------------
@@ -102,14 +121,16 @@ class ExportModule:
         # Seasonality Array
         ws_inp.write(row, 0, "SEASONALITY PROFILE", fmt_header)
         seas = drivers.get('seasonality', [1]*12)
-        for i, s in enumerate(seas):
+        for i in range(len(seas)):
             ws_inp.write(row+1, i, i+1, fmt_month) # 1, 2, ...
+        for i, s in enumerate(seas):
             ws_inp.write(row+2, i, s, fmt_pct)
         
         # Define range for seasonality
         # Horizontal range: Inputs!A(Row+3):L(Row+3)
         workbook.define_name('Seasonality', f'=Inputs!$A${row+3}:$L${row+3}')
         
+        trace.next('scenario_sheet')
         # ---------------------------------------------------------
         # 2. Scenario Data
         # ---------------------------------------------------------
@@ -131,6 +152,7 @@ class ExportModule:
         # Define Table Name: Scenario_Table!$A$2:$F$4
         workbook.define_name('Scenario_Table', f'=Scenario_Table!$A$2:$F${len(data)+1}')
         
+        trace.next('depreciation_sheet', layout=depreciation_layout)
         # ---------------------------------------------------------
         # 3. Depreciation Schedule Formula Sheet
         # ---------------------------------------------------------
@@ -142,14 +164,15 @@ class ExportModule:
         # Solution: P&L depends on Depreciation. Capex usually input.
         # We will put Capex Input on this sheet or Engine and waterfall here.
         
-        dates = pd.to_datetime(self.forecast_df['date'])
+        dates = to_dates(self.forecast_df['date'])
         
         # Header Row (Dates)
         ws_depr.write(0, 0, 'Date', fmt_header)
-        ws_depr.write(1, 0, 'New Capex', fmt_header)
-        
         for i, d in enumerate(dates):
             ws_depr.write(0, i+1, d.strftime('%b-%y'), fmt_month)
+            
+        ws_depr.write(1, 0, 'New Capex', fmt_header)
+        for i in range(len(dates)):
             # Link New Capex from Engine (Row 9 in Engine)
             # We assume Engine Column alignment (Col 1 is Date 1)
             # Engine Col Index = i + 1 (A is labels) -> B, C, D...
@@ -157,42 +180,17 @@ class ExportModule:
             col_letter = xlsxwriter.utility.xl_col_to_name(i+1)
             ws_depr.write_formula(1, i+1, f'=Engine!{col_letter}9', fmt_curr) 
             
-        # Waterfall
-        ws_depr.write(2, 0, 'Depreciation Waterfall', fmt_header)
-        # For each month T, Capex happened. Depr starts T.
-        # Depr = IF(CurrentMonth >= T AND CurrentMonth < T+UsefulLife, Capex_T / UsefulLife, 0)
-        
-        for r_idx, d_start in enumerate(dates): # One row for each month's capex batch
-            actual_row = r_idx + 3
-            ws_depr.write(actual_row, 0, f'Batch {d_start.strftime("%b-%y")}', fmt_calc)
-            
-            # Capex Amount Cell reference: Formula is =Row2_Col(r_idx+1)
-            capex_ref = f'{xlsxwriter.utility.xl_col_to_name(r_idx+1)}2'
-            
-            for c_idx, d_curr in enumerate(dates):
-                actual_col = c_idx + 1
-                # Formula logic:
-                # If c_idx >= r_idx (current time >= batch time)
-                # AND c_idx < r_idx + UsefulLife
-                # Then Capex/Life
-                
-                # Note: UsefulLife is Named Range
-                form = f'=IF(AND({c_idx}>={r_idx}, {c_idx}<{r_idx}+UsefulLife), {capex_ref}/UsefulLife, 0)'
-                ws_depr.write_formula(actual_row, actual_col, form, fmt_num)
-
-        # Total Depreciation Row
-        total_row = len(dates) + 4
-        ws_depr.write(total_row, 0, 'TOTAL DEPRECIATION', fmt_header)
-        for i in range(len(dates)):
-            col_letter = xlsxwriter.utility.xl_col_to_name(i+1)
-            # Sum the waterfall rows
-            ws_depr.write_formula(total_row, i+1, f'=SUM({col_letter}4:{col_letter}{total_row})', fmt_curr)
+        if depreciation_layout == 'compact':
+            total_row = self._write_compact_depreciation(ws_depr, len(dates), fmt_header, fmt_curr)
+        else:
+            total_row = self._write_depreciation_waterfall(ws_depr, dates, fmt_header, fmt_calc, fmt_num, fmt_curr)
             
         # Define Named Range for Total Depr Row
         # DeprStream = Depreciation_Sched!$B$TotalRow:$End$TotalRow
         end_col_let = xlsxwriter.utility.xl_col_to_name(len(dates))
         workbook.define_name('DeprStream', f'=Depreciation_Sched!$B${total_row+1}:${end_col_let}${total_row+1}')
 
+        trace.next('engine_sheet')
         # ---------------------------------------------------------
         # 4. Engine Sheet
         # ---------------------------------------------------------
@@ -203,10 +201,6 @@ class ExportModule:
             'EBIT', 'Tax', 'Net Income'
         ]
         
-        ws_eng.write(0, 0, 'Metric', fmt_header)
-        for r, l in enumerate(labels):
-            ws_eng.write(r+1, 0, l, fmt_header)
-            
         # Scenario Lookups
         # MATCH(ScenarioSelector, Scenario_Table[Scenario], 0)
         idx_match = 'MATCH(ScenarioSelector,INDEX(Scenario_Table,,1),0)'
@@ -216,65 +210,58 @@ class ExportModule:
         price_adj = f'INDEX(Scenario_Table,{idx_match},5)'
         capex_mult = f'INDEX(Scenario_Table,{idx_match},6)'
         
-        for c, date_val in enumerate(dates):
-            col = c + 1
-            col_let = xlsxwriter.utility.xl_col_to_name(col)
-            
-            # Header Date
-            ws_eng.write(0, col, date_val.strftime('%b-%y'), fmt_month)
-            
-            # 1. Month Index
-            ws_eng.write(1, col, c+1, fmt_num)
-            
-            # 2. Revenue
+        def revenue(c, col_let):
             # BaseRev * (1+Vol+Adj)^(t-1) * (1+Price+Adj)^(t-1) * Seas * Mult
             t = f'({col_let}2-1)' # t-1 so starts at 0 growth
             month_mod = f'MOD({col_let}2-1, 12)+1' # 1 to 12
             seas = f'INDEX(Seasonality, {month_mod})'
-            
-            rev_f = (f'=BaseRevenue * ((1+VolGrowth+{vol_adj})^{t}) '
-                     f'* ((1+PriceGrowth+{price_adj})^{t}) * {seas} * {rev_mult}')
-            ws_eng.write_formula(2, col, rev_f, fmt_curr)
-            
-            # 3. COGS
-            ws_eng.write_formula(3, col, f'={col_let}3 * COGS_Pct * {cogs_mult}', fmt_curr)
-            
-            # 6. Headcount first (needed for payroll)
-            # Start + Int(HiringRate * t)
-            ws_eng.write_formula(6, col, f'=HC_Start + INT(HiringRate * {t})', fmt_num)
-            
-            # 5. Payroll
-            ws_eng.write_formula(5, col, f'={col_let}7 * AvgSalary', fmt_curr)
-            
-            # 4. OpEx
-            # Fixed + Var*Rev + Payroll
-            ws_eng.write_formula(4, col, f'=FixedOpEx + (OpExVarPct * {col_let}3) + {col_let}6', fmt_curr)
-            
-            # 7. EBITDA
-            ws_eng.write_formula(7, col, f'={col_let}3 - {col_let}4 - {col_let}5', fmt_curr)
-            
-            # 8. Capex
+            return (f'=BaseRevenue * ((1+VolGrowth+{vol_adj})^{t}) '
+                    f'* ((1+PriceGrowth+{price_adj})^{t}) * {seas} * {rev_mult}')
+        
+        def capex(c, col_let):
             # Pull from JSON schedule? We'll load the JSON value "base" and multiply by scenario
             # JSON schedule is date-keyed. Hard to formula-ize without a lookup table.
             # We will write the BASE value as a hard number here, multiplied by scenario mult formula.
             # "Semi-formula".
             base_capex = self.forecast_df.loc[c, 'capex']
-            ws_eng.write_formula(8, col, f'={base_capex} * {capex_mult}', fmt_curr)
-            
-            # 9. Depreciation
-            # Link to the Depreciation Waterfall Sheet Total Row
-            # INDEX(DeprStream, Col)
-            ws_eng.write_formula(9, col, f'=INDEX(DeprStream, {col})', fmt_curr)
-            
-            # 10. EBIT
-            ws_eng.write_formula(10, col, f'={col_let}8 - {col_let}10', fmt_curr)
+            return f'={base_capex} * {capex_mult}'
+        
+        # One formula builder per Engine row (rows 2-12); each row is written across every month before
+        # the next row starts, which keeps the sheet streamable.
+        engine_rows = [
+            (revenue, fmt_curr),                                                   # 2. Revenue
+            (lambda c, l: f'={l}3 * COGS_Pct * {cogs_mult}', fmt_curr),            # 3. COGS
+            # Fixed + Var*Rev + Payroll
+            (lambda c, l: f'=FixedOpEx + (OpExVarPct * {l}3) + {l}6', fmt_curr),   # 4. OpEx
+            (lambda c, l: f'={l}7 * AvgSalary', fmt_curr),                         # 5. Payroll
+            # Start + Int(HiringRate * t)
+            (lambda c, l: f'=HC_Start + INT(HiringRate * ({l}2-1))', fmt_num),     # 6. Headcount
+            (lambda c, l: f'={l}3 - {l}4 - {l}5', fmt_curr),                       # 7. EBITDA
+            (capex, fmt_curr),                                                     # 8. Capex
+            # Link to the Depreciation Sheet Total Row: INDEX(DeprStream, Col)
+            (lambda c, l: f'=INDEX(DeprStream, {c+1})', fmt_curr),                 # 9. Depreciation
+            (lambda c, l: f'={l}8 - {l}10', fmt_curr),                             # 10. EBIT
+            (lambda c, l: f'=MAX(0, {l}11 * TaxRate)', fmt_curr),                  # 11. Tax
+            (lambda c, l: f'={l}11 - {l}12', fmt_curr),                            # 12. Net Income
+        ]
+        col_lets = [xlsxwriter.utility.xl_col_to_name(c+1) for c in range(len(dates))]
+        
+        # Header Dates
+        ws_eng.write(0, 0, 'Metric', fmt_header)
+        for c, date_val in enumerate(dates):
+            ws_eng.write(0, c+1, date_val.strftime('%b-%y'), fmt_month)
             
-            # 11. Tax
-            ws_eng.write_formula(11, col, f'=MAX(0, {col_let}11 * TaxRate)', fmt_curr)
+        # 1. Month Index
+        ws_eng.write(1, 0, labels[0], fmt_header)
+        for c in range(len(dates)):
+            ws_eng.write(1, c+1, c+1, fmt_num)
             
-            # 12. Net Income
-            ws_eng.write_formula(12, col, f'={col_let}11 - {col_let}12', fmt_curr)
+        for r, (formula, fmt) in enumerate(engine_rows, 2):
+            ws_eng.write(r, 0, labels[r-1], fmt_header)
+            for c, col_let in enumerate(col_lets):
+                ws_eng.write_formula(r, c+1, formula(c, col_let), fmt)
 
+        trace.next('working_capital_sheet')
         # ---------------------------------------------------------
         # 5. Working Capital & Cash
         # ---------------------------------------------------------
@@ -327,6 +314,7 @@ class ExportModule:
             else:
                 ws_wc.write_formula(r, 15, f'=P{r} + O{r+1}', fmt_curr)
 
+        trace.next('sensitivity_sheet')
         # ---------------------------------------------------------
         # 6. Sensitivity (Matrix)
         # ---------------------------------------------------------
@@ -339,14 +327,12 @@ class ExportModule:
         # Column Headers (Volume Shift)
         for i, v in enumerate(range_vals):
             ws_sens.write(2, i+1, v, fmt_pct)
-        # Row Headers (Price Shift)
-        for i, p in enumerate(range_vals):
-            ws_sens.write(i+3, 0, p, fmt_pct)
             
-        # Matrix Formulas
+        # Matrix Formulas (Row Header = Price Shift, written with its row)
         base_rev_ref = 'SUM(Engine!3:3)'
         
         for r, p in enumerate(range_vals):
+            ws_sens.write(r+3, 0, p, fmt_pct)
             for c, v in enumerate(range_vals):
                 p_cell = f'$A{r+4}'
                 v_cell = f'{xlsxwriter.utility.xl_col_to_name(c+1)}$3'
@@ -354,6 +340,7 @@ class ExportModule:
                 form = f'={base_rev_ref} * (1+{p_cell}) * (1+{v_cell})'
                 ws_sens.write_formula(r+3, c+1, form, fmt_curr)
 
+        trace.next('checks_sheet')
         # ---------------------------------------------------------
         # 7. Checks
         # ---------------------------------------------------------
@@ -372,9 +359,72 @@ class ExportModule:
             ws_chk.write(i+1, 0, lbl, fmt_calc)
             ws_chk.write_formula(i+1, 1, formula)
             
+        trace.next('save', constant_memory=constant_memory)
         writer.close()
+        trace.close()
         print(f"✅ FINAL FORMULA MODEL SAVED: {output_path}")
 
+    def _write_depreciation_waterfall(self, ws_depr, dates, fmt_header, fmt_calc, fmt_num, fmt_curr):
+        """One row per capex vintage (N x N formulas); returns the 0-based TOTAL DEPRECIATION row."""
+        # Waterfall
+        ws_depr.write(2, 0, 'Depreciation Waterfall', fmt_header)
+        # For each month T, Capex happened. Depr starts T.
+        # Depr = IF(CurrentMonth >= T AND CurrentMonth < T+UsefulLife, Capex_T / UsefulLife, 0)
+        
+        for r_idx, d_start in enumerate(dates): # One row for each month's capex batch
+            actual_row = r_idx + 3
+            ws_depr.write(actual_row, 0, f'Batch {d_start.strftime("%b-%y")}', fmt_calc)
+            
+            # Capex Amount Cell reference: Formula is =Row2_Col(r_idx+1)
+            capex_ref = f'{xlsxwriter.utility.xl_col_to_name(r_idx+1)}2'
+            
+            for c_idx, d_curr in enumerate(dates):
+                actual_col = c_idx + 1
+                # Formula logic:
+                # If c_idx >= r_idx (current time >= batch time)
+                # AND c_idx < r_idx + UsefulLife
+                # Then Capex/Life
+                
+                # Note: UsefulLife is Named Range
+                form = f'=IF(AND({c_idx}>={r_idx}, {c_idx}<{r_idx}+UsefulLife), {capex_ref}/UsefulLife, 0)'
+                ws_depr.write_formula(actual_row, actual_col, form, fmt_num)
+
+        # Total Depreciation Row
+        total_row = len(dates) + 4
+        ws_depr.write(total_row, 0, 'TOTAL DEPRECIATION', fmt_header)
+        for i in range(len(dates)):
+            col_letter = xlsxwriter.utility.xl_col_to_name(i+1)
+            # Sum the waterfall rows
+            ws_depr.write_formula(total_row, i+1, f'=SUM({col_letter}4:{col_letter}{total_row})', fmt_curr)
+        return total_row
+
+    def _write_compact_depreciation(self, ws_depr, months, fmt_header, fmt_curr):
+        """Straight-line depreciation in three rows (linear in the horizon); returns the total row.
+
+        Depr(t) = (CumCapex(t) - CumCapex(t - UsefulLife)) / UsefulLife, i.e. every vintage still inside
+        its useful life contributes Capex / UsefulLife, the same result as summing the waterfall.
+        """
+        cols = [xlsxwriter.utility.xl_col_to_name(i+1) for i in range(months)]
+        last = cols[-1] if cols else 'A'
+        
+        # Running capex total: previous month's total plus this month's new capex
+        ws_depr.write(2, 0, 'Cumulative Capex', fmt_header)
+        for i, col in enumerate(cols):
+            prev = f'{cols[i-1]}3 + ' if i else ''
+            ws_depr.write_formula(2, i+1, f'={prev}{col}2', fmt_curr)
+            
+        # Capex that has fully depreciated by month t (cumulative total UsefulLife months earlier)
+        ws_depr.write(3, 0, 'Fully Depreciated Capex', fmt_header)
+        for i in range(months):
+            form = f'=IF({i+1}>UsefulLife, INDEX($B$3:${last}$3, {i+1}-UsefulLife), 0)'
+            ws_depr.write_formula(3, i+1, form, fmt_curr)
+            
+        total_row = 4
+        ws_depr.write(total_row, 0, 'TOTAL DEPRECIATION', fmt_header)
+        for i, col in enumerate(cols):
+            ws_depr.write_formula(total_row, i+1, f'=({col}3 - {col}4) / UsefulLife', fmt_curr)
+        return total_row
+
 if __name__ == '__main__':
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     hist_path = os.path.join(base_dir, 'data', 'raw', 'historical_financials.csv') # Dummy for init
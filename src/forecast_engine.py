@@ -1,115 +1,435 @@
 import json
-import pandas as pd
-from dateutil.relativedelta import relativedelta
+import sys
+import numpy as np
 from datetime import datetime
 import os
 
+from depreciation import AssetRegister, DepreciationState
+from instrumentation import span
+
+# pandas (and the artifact / precision helpers built on it) is imported only by the functions that
+# build DataFrames, so the driver math and JSON output start without it
+
+FORECAST_COLUMNS = [
+    'date', 'revenue', 'cogs', 'opex', 'payroll', 'headcount', 'capex', 'depreciation',
+    'ebitda', 'ebt', 'tax', 'net_income', 'ar', 'inventory', 'ap', 'wc', 'delta_wc',
+    'operating_cf', 'investing_cf', 'financing_cf', 'cash_balance'
+]
+
+DRIVER_DEFAULTS = {
+    'base_revenue_monthly': 0.0, 'volume_growth_monthly': 0.0, 'price_growth_monthly': 0.0,
+    'cogs_pct': 0.0, 'fixed_opex_monthly': 0.0, 'opex_var_pct': 0.0,
+    'headcount_start': 0, 'hiring_rate_monthly': 0, 'avg_salary_monthly': 0.0,
+    'tax_rate': 0.0, 'useful_life_months': 60, 'depreciation_monthly': 0.0,
+    'depreciation_method': 'straight_line', 'declining_balance_factor': 2.0,
+    'dso': 30.0, 'dsi': 30.0, 'dpo': 30.0, 'initial_cash_balance': None,
+}
+
 def load_json(path):
     with open(path,'r') as f:
         return json.load(f)
 
+def _is_dataframe(obj):
+    # Without pandas imported nothing can be a DataFrame, so there is no need to import it to check
+    pd = sys.modules.get('pandas')
+    return pd is not None and isinstance(obj, pd.DataFrame)
+
 def make_month_list(start, months):
+    from dateutil.relativedelta import relativedelta
     return [(start + relativedelta(months=i)).strftime('%Y-%m-01') for i in range(months)]
 
-def driver_forecast(start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0):
+def month_axis(start_date, months):
+    """Integer month offsets plus calendar year / month-of-year (0-11) for the horizon."""
+    offsets = np.arange(months)
+    absolute = start_date.year * 12 + (start_date.month - 1) + offsets
+    return offsets, absolute // 12, absolute % 12
+
+def month_labels(years, month_of_year):
+    return [f'{y:04d}-{m + 1:02d}-01' for y, m in zip(years.tolist(), month_of_year.tolist())]
+
+def capex_vector(capex_sched, start_date, months):
+    """Place a 'YYYY-MM' -> amount schedule on the month axis; entries outside the horizon are ignored."""
+    capex = np.zeros(months)
+    first = start_date.year * 12 + (start_date.month - 1)
+    for ym, amount in capex_sched.items():
+        year, month = ym.split('-')[:2]
+        idx = int(year) * 12 + int(month) - 1 - first
+        if 0 <= idx < months:
+            capex[idx] = amount
+    return capex
+
+def depreciation_matrix(capex, useful_life, default=0.0, method='straight_line', factor=2.0, state=None):
+    """Depreciation for a block of capex rows (entities x months) via the per-vintage asset register.
+
+    Months no vintage reaches fall back to the flat `depreciation_monthly` driver. With a
+    DepreciationState the block continues the run the state was taken from (its open vintages
+    and running totals), and the state is advanced to the end of the block.
+    """
+    if np.iscomplexobj(capex):
+        # Complex-step derivatives: schedules are linear in the capex amounts, so the real and
+        # imaginary parts are scheduled separately (the imaginary part never takes the fallback)
+        return (depreciation_matrix(capex.real, useful_life, default, method, factor)
+                + 1j * depreciation_matrix(capex.imag, useful_life, 0.0, method, factor))
+    n, t = capex.shape
+    register = AssetRegister.from_capex(capex, useful_life)
+    if state is not None:
+        register = state.register.concat(register)  # carried vintages first, as in one long register
+    methods = np.broadcast_to(np.asarray(method).reshape(-1), (n,))
+    dep = np.zeros((n, t))
+    for name in np.unique(methods):
+        rows = methods == name
+        carry = None
+        if state is not None:
+            carry = state.declining if name == 'declining_balance' else state.straight_line
+        dep[rows] = register.subset(rows[register.entity]).schedule(n, t, name, factor, carry)[rows]
+    count = register.active_count(n, t, None if state is None else state.active)
+    if state is not None and t:
+        state.straight_line, state.active = dep[:, -1].copy(), count[:, -1].copy()
+        later = register.subset(register.start + register.life >= t)
+        later.start -= t
+        state.register = later
+    return np.where(count > 0, dep, default)
+
+def stack_drivers(driver_sets, opening_cash=500000.0):
+    """Normalise N driver sets into column vectors (N x 1) plus an N x 12 seasonality block.
+
+    Accepts a list of driver dicts, a DataFrame with one row per entity, or a dict mapping driver
+    names to length-N arrays (scalars, a single seasonality profile and a single capex schedule
+    are shared by every row). Missing drivers take the same defaults as a single forecast.
+    """
+    if _is_dataframe(driver_sets):
+        driver_sets = driver_sets.to_dict('records')
+    if isinstance(driver_sets, dict):
+        n = next((len(v) for k, v in driver_sets.items() if k in DRIVER_DEFAULTS and np.ndim(v) == 1), 1)
+        def column(key, default):
+            value = driver_sets.get(key, default)
+            if key == 'capex_schedule':
+                return [value] * n if isinstance(value, dict) else value
+            return np.broadcast_to(np.asarray(value), (n, 12) if key == 'seasonality' else (n,))
+    else:
+        n = len(driver_sets)
+        def column(key, default):
+            return [d.get(key, default) for d in driver_sets]
+
+    params = {}
+    for key, default in DRIVER_DEFAULTS.items():
+        if key == 'initial_cash_balance':
+            default = opening_cash
+        params[key] = np.asarray(column(key, default)).reshape(n, 1)
+    seasonality = np.asarray(column('seasonality', [1]*12), dtype=float).reshape(n, 12)
+    schedules = column('capex_schedule', {})
+    return params, seasonality, schedules
+
+# ---------------------------------------------------------
+# Column graph. Each output column is a formula over the driver columns `p` (N x 1, plus the
+# N x 12 'seasonality' block and the placed N x T 'capex_schedule'), the columns computed before
+# it `c` and the month axis. Entries are (column, drivers read, columns read, formula) in
+# evaluation order, so the graph also tells which columns a driver change invalidates.
+# ---------------------------------------------------------
+
+def _revenue(p, c, month_of_year, m):
+    return p['base_revenue_monthly'] * ((1 + p['volume_growth_monthly']) ** m) \
+        * ((1 + p['price_growth_monthly']) ** m) * p['seasonality'][:, month_of_year]
+
+def _headcount(p, c, month_of_year, m):
+    return p['headcount_start'] + np.trunc(np.real(p['hiring_rate_monthly'] * m)).astype(int)
+
+def _depreciation(p, c, month_of_year, m):
+    with span('forecast.depreciation'):
+        return depreciation_matrix(c['capex'], p['useful_life_months'], p['depreciation_monthly'],
+                                   p['depreciation_method'], p['declining_balance_factor'].ravel(),
+                                   p.get('asset_state'))
+
+def _tax(p, c, month_of_year, m):
+    taxable = c['ebt'] * p['tax_rate']
+    if np.iscomplexobj(taxable):
+        # Complex-step derivatives: branch on the real part only
+        return np.where(taxable.real > 0, taxable, 0.0)
+    return np.maximum(0.0, taxable)
+
+def _financing_cf(p, c, month_of_year, m):
+    # No debt/equity flows yet: zeros on the (entity x month) axis, independent of every driver
+    return np.zeros((len(p['seasonality']), len(m)))
+
+def _cash_balance(p, c, month_of_year, m):
+    # Sequential running sum seeded with the opening balance
+    with span('forecast.cash_rollforward'):
+        opening = p['initial_cash_balance']
+        flows = np.concatenate((opening.astype(complex if np.iscomplexobj(opening) else float),
+                                c['operating_cf'] + c['investing_cf'] + c['financing_cf']), axis=1)
+        return np.cumsum(flows, axis=1)[:, 1:]
+
+COLUMN_GRAPH = (
+    ('revenue', ('base_revenue_monthly', 'volume_growth_monthly', 'price_growth_monthly', 'seasonality'), (), _revenue),
+    ('cogs', ('cogs_pct',), ('revenue',), lambda p, c, *_: c['revenue'] * p['cogs_pct']),
+    ('opex', ('fixed_opex_monthly', 'opex_var_pct'), ('revenue',),
+     lambda p, c, *_: p['fixed_opex_monthly'] + c['revenue'] * p['opex_var_pct']),
+    ('headcount', ('headcount_start', 'hiring_rate_monthly'), (), _headcount),
+    ('payroll', ('avg_salary_monthly',), ('headcount',), lambda p, c, *_: c['headcount'] * p['avg_salary_monthly']),
+    ('capex', ('capex_schedule',), (), lambda p, c, *_: p['capex_schedule']),
+    ('depreciation', ('useful_life_months', 'depreciation_monthly', 'depreciation_method', 'declining_balance_factor'),
+     ('capex',), _depreciation),
+    ('ebitda', (), ('revenue', 'cogs', 'opex', 'payroll'),
+     lambda p, c, *_: c['revenue'] - c['cogs'] - c['opex'] - c['payroll']),
+    ('ebt', (), ('ebitda', 'depreciation'), lambda p, c, *_: c['ebitda'] - c['depreciation']),
+    ('tax', ('tax_rate',), ('ebt',), _tax),
+    ('net_income', (), ('ebt', 'tax'), lambda p, c, *_: c['ebt'] - c['tax']),
+    # Working capital (monthly simplification: balance = flow / 30 * days)
+    ('ar', ('dso',), ('revenue',), lambda p, c, *_: c['revenue'] / 30.0 * p['dso']),
+    ('inventory', ('dsi',), ('cogs',), lambda p, c, *_: c['cogs'] / 30.0 * p['dsi']),
+    ('ap', ('dpo',), ('cogs',), lambda p, c, *_: c['cogs'] / 30.0 * p['dpo']),
+    ('wc', (), ('ar', 'inventory', 'ap'), lambda p, c, *_: c['ar'] + c['inventory'] - c['ap']),
+    ('delta_wc', (), ('wc',), lambda p, c, *_: np.diff(c['wc'], axis=1, prepend=p.get('opening_wc', 0.0))),
+    ('operating_cf', (), ('net_income', 'depreciation', 'delta_wc'),
+     lambda p, c, *_: c['net_income'] + c['depreciation'] - c['delta_wc']),
+    ('investing_cf', (), ('capex',), lambda p, c, *_: -c['capex']),
+    # keep simple; extend later if debt/equity flows exist
+    ('financing_cf', (), (), _financing_cf),
+    ('cash_balance', ('initial_cash_balance',), ('operating_cf', 'investing_cf', 'financing_cf'), _cash_balance),
+)
+
+def affected_columns(drivers):
+    """Columns (in evaluation order) whose values depend on any of the given driver names."""
+    changed, dirty = set(drivers), []
+    for name, driver_deps, column_deps, _ in COLUMN_GRAPH:
+        if changed.intersection(driver_deps) or any(dep in dirty for dep in column_deps):
+            dirty.append(name)
+    return dirty
+
+def evaluate_columns(p, month_of_year, m, columns=None, only=None):
+    """Evaluate the column graph. With previous `columns` and a set of names in `only`, just those
+    columns are recomputed and every other column is reused as-is."""
+    out = dict(columns or {})
+    for name, _, _, formula in COLUMN_GRAPH:
+        if only is None or name in only:
+            out[name] = formula(p, out, month_of_year, m)
+    return out
+
+def _forecast_block(params, seasonality, capex, month_of_year, m, state=None, assets=None):
+    """Core driver math; every driver is an (N x 1) column broadcast against the month axis.
+
+    `state` (a ForecastState) seeds the recurrences - cash, working capital - from a previous run;
+    `assets` is the DepreciationState the depreciation schedules continue from and advance.
+    """
+    p = dict(params, seasonality=seasonality, capex_schedule=capex)
+    if state is not None:
+        p['initial_cash_balance'] = state.cash[:, None]
+        p['opening_wc'] = state.wc[:, None]
+    if assets is not None:
+        p['asset_state'] = assets
+    return evaluate_columns(p, month_of_year, m)
+
+def forecast_arrays(drivers, start_date, months, opening_cash=500000.0):
+    """Compute every forecast column for the whole horizon as arrays (no 'date' column)."""
+    m, _, month_of_year = month_axis(start_date, months)
+    params, seasonality, schedules = stack_drivers([drivers], opening_cash)
+    capex = capex_vector(schedules[0], start_date, months).reshape(1, months)
+    columns = _forecast_block(params, seasonality, capex, month_of_year, m)
+    return {k: v[0] for k, v in columns.items()}
+
+class ForecastState:
+    """Checkpoint of a batched forecast at the end of a month: what later months need besides the drivers.
+
+    Revenue, costs and headcount are closed-form in the month index, so only the recurrences
+    carry over: the cash balance, working capital (for delta_wc) and the depreciation schedules
+    (open vintages plus running totals). Headcount is kept for reference. Resuming from a state
+    gives the same floats, bit for bit, as one uninterrupted run over the whole horizon.
+    """
+
+    def __init__(self, start_date, month, entities, cash, wc, headcount, assets):
+        self.start_date = start_date  # first month of the original run (ISO)
+        self.month = month            # months forecast so far; a resumed run starts at this index
+        self.entities = list(entities)
+        self.cash = cash
+        self.wc = wc
+        self.headcount = headcount
+        self.assets = assets
+
+    @property
+    def next_date(self):
+        """First month a resumed run forecasts (ISO)."""
+        _, years, month_of_year = month_axis(datetime.fromisoformat(self.start_date), self.month + 1)
+        return month_labels(years[-1:], month_of_year[-1:])[0]
+
+    def save(self, path):
+        a = self.assets
+        rates = sorted(a.declining)
+        # Through a file handle, so np.savez keeps `path` as given instead of appending '.npz'
+        with open(path, 'wb') as f:
+            np.savez(f, start_date=self.start_date, month=self.month, entities=np.asarray(self.entities),
+                     cash=self.cash, wc=self.wc, headcount=self.headcount,
+                     vintage_entity=a.register.entity, vintage_start=a.register.start + self.month,
+                     vintage_amount=a.register.amount, vintage_life=a.register.life,
+                     straight_line=a.straight_line if a.straight_line is not None else np.zeros(a.n_entities),
+                     active=a.active if a.active is not None else np.zeros(a.n_entities),
+                     rates=np.asarray(rates, dtype=float),
+                     declining=np.asarray([a.declining[r] for r in rates], dtype=float).reshape(len(rates), a.n_entities))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            month, n = int(z['month']), len(z['cash'])
+            register = AssetRegister(z['vintage_entity'], z['vintage_start'] - month, z['vintage_amount'],
+                                     z['vintage_life'])
+            assets = DepreciationState(n, register, z['straight_line'], z['active'],
+                                       dict(zip(z['rates'].tolist(), z['declining'])))
+            return cls(str(z['start_date']), month, z['entities'].tolist(), z['cash'], z['wc'], z['headcount'],
+                       assets)
+
+class ForecastCube:
+    """Batched forecast result shaped (entity x month x metric).
+
+    `state` is the ForecastState at the last month, for resume_forecast.
+    """
+
+    def __init__(self, values, entities, dates, metrics, state=None):
+        self.values = values
+        self.entities = list(entities)
+        self.dates = list(dates)
+        self.metrics = list(metrics)
+        self.state = state
+
+    def metric(self, name):
+        # (entity x month) view, no copy
+        return self.values[:, :, self.metrics.index(name)]
+
+    def entity(self, key):
+        import pandas as pd
+        idx = self.entities.index(key)
+        df = pd.DataFrame(self.values[idx], columns=self.metrics)
+        df.insert(0, 'date', self.dates)
+        return df
+
+    def to_frame(self):
+        import pandas as pd
+        n, t, _ = self.values.shape
+        df = pd.DataFrame(self.values.reshape(n * t, -1), columns=self.metrics)
+        df.insert(0, 'date', np.tile(self.dates, n))
+        df.insert(0, 'entity', np.repeat(self.entities, t))
+        return df
+
+def batch_forecast(driver_sets, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0,
+                   entities=None, capex=None, out=None):
+    """Forecast N driver sets in one vectorized pass over a shared month axis.
+
+    `capex` may be passed directly as an (N x months) array instead of per-entity `capex_schedule`
+    dicts. Entity labels default to the DataFrame index (when a table is given) or 0..N-1.
+    `out` is an optional (N x months x metrics) array to fill, e.g. a ResultStore block.
+    The cube's `state` is the checkpoint at the last month (see resume_forecast).
+    """
+    return _batch(driver_sets, datetime.fromisoformat(start_date_str), months_horizon, opening_cash,
+                  entities, capex, out)
+
+def resume_forecast(driver_sets, state, months_horizon, entities=None, capex=None, out=None):
+    """Continue a batched forecast for `months_horizon` more months from its ForecastState.
+
+    Only the new months are computed; they equal the same months of one uninterrupted run bit for
+    bit (same drivers). `capex`, if given, covers the new months only.
+    """
+    return _batch(driver_sets, datetime.fromisoformat(state.start_date), months_horizon, None,
+                  state.entities if entities is None else entities, capex, out, state)
+
+def _batch(driver_sets, start_date, months_horizon, opening_cash, entities, capex, out, state=None):
+    columns, dates, end = _window(driver_sets, start_date, months_horizon, opening_cash, entities, capex, state)
+    n = len(end.cash)
+    metrics = FORECAST_COLUMNS[1:]
+    values = np.empty((n, months_horizon, len(metrics))) if out is None else out
+    if values.shape != (n, months_horizon, len(metrics)):
+        raise ValueError(f"out has shape {values.shape}, expected {(n, months_horizon, len(metrics))}")
+    for k, name in enumerate(metrics):
+        values[:, :, k] = columns[name]
+    return ForecastCube(values, end.entities, dates, metrics, end)
+
+def _window(driver_sets, start_date, months_horizon, opening_cash, entities, capex, state):
+    """Every column for the months after `state` (or from `start_date`), their labels and the end state."""
+    first = 0 if state is None else state.month
+    window_start = start_date if state is None else datetime.fromisoformat(state.next_date)
+    m, years, month_of_year = month_axis(window_start, months_horizon)
+    m = m + first  # growth and hiring are indexed from the original start
+    if entities is None and _is_dataframe(driver_sets):
+        entities = driver_sets.index.tolist()
+    params, seasonality, schedules = stack_drivers(driver_sets, opening_cash)
+    n = len(seasonality)
+    if state is not None and len(state.cash) != n:
+        raise ValueError(f"state holds {len(state.cash)} entities, got {n} driver sets")
+    if capex is None:
+        capex = np.zeros((n, months_horizon))
+        placed = {}  # shared schedule objects are laid on the month axis once
+        for i, sched in enumerate(schedules):
+            if sched:
+                if id(sched) not in placed:
+                    placed[id(sched)] = capex_vector(sched, window_start, months_horizon)
+                capex[i] = placed[id(sched)]
+    else:
+        capex = np.broadcast_to(np.asarray(capex, dtype=float), (n, months_horizon))
+
+    assets = DepreciationState(n) if state is None else state.assets.copy()
+    columns = _forecast_block(params, seasonality, capex, month_of_year, m, state, assets)
+    entities = list(entities if entities is not None else range(n))
+    end = ForecastState(start_date.date().isoformat(), first + months_horizon, entities,
+                        columns['cash_balance'][:, -1].copy(), columns['wc'][:, -1].copy(),
+                        np.broadcast_to(columns['headcount'], (n, months_horizon))[:, -1].copy(), assets)
+    return columns, month_labels(years, month_of_year), end
+
+def forecast_frame(drivers, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0):
+    import pandas as pd
+    start_date = datetime.fromisoformat(start_date_str)
+    columns = forecast_arrays(drivers, start_date, months_horizon, opening_cash)
+    _, years, month_of_year = month_axis(start_date, months_horizon)
+    columns['date'] = month_labels(years, month_of_year)
+    return pd.DataFrame(columns, columns=FORECAST_COLUMNS)
+
+def forecast_columns(drivers, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0):
+    """The forecast as plain Python lists keyed by FORECAST_COLUMNS (JSON-ready, no pandas)."""
+    start_date = datetime.fromisoformat(start_date_str)
+    columns = forecast_arrays(drivers, start_date, months_horizon, opening_cash)
+    _, years, month_of_year = month_axis(start_date, months_horizon)
+    out = {'date': month_labels(years, month_of_year)}
+    out.update((name, columns[name].tolist()) for name in FORECAST_COLUMNS[1:])
+    return out
+
+def driver_forecast(start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0,
+                    drivers=None, output_path=None, fmt='csv', csv_export=False, precision='full',
+                    checkpoint_path=None, resume_from=None):
+    """Forecast `months_horizon` months and write the artifact.
+
+    `resume_from` (a checkpoint file) continues an earlier run instead of starting at month 0:
+    only the new months are computed and written. `checkpoint_path` saves the state at the last
+    month so the next roll can resume from it.
+    """
+    import pandas as pd
+    from artifact_io import write_artifact
+    from precision import compact_frame
+
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     drivers_path = os.path.join(base_dir, 'data', 'config', 'drivers.json')
-    scenarios_path = os.path.join(base_dir, 'data', 'config', 'scenarios.json')
-    output_path = os.path.join(base_dir, 'data', 'processed', 'forecast_output.csv')
-    
-    drivers = load_json(drivers_path)
-    scenarios = load_json(scenarios_path) if os.path.exists(scenarios_path) else {}
-    capex_sched = drivers.get('capex_schedule', {})  # dict of 'YYYY-MM' -> amount
-    useful_life_months = drivers.get('useful_life_months', 60)
-    dep_table = {}  # month -> depreciation amount (simple straight-line per capex item is assumed aggregated)
+    if output_path is None:
+        output_path = os.path.join(base_dir, 'data', 'processed', 'forecast_output.csv')
+
+    if drivers is None:
+        with span('forecast.load_drivers'):
+            drivers = load_json(drivers_path)
     start_date = datetime.fromisoformat(start_date_str)
-    months = months_horizon
-    rows = []
-    cash = drivers.get('initial_cash_balance', opening_cash)
-    prev_wc = 0.0
-
-    for m in range(months):
-        date = start_date + relativedelta(months=m)
-        ym = date.strftime('%Y-%m')
-        month_idx = date.month - 1
-        seasonality = drivers.get('seasonality', [1]*12)[month_idx]
-        months_from_start = m
-        base_rev = drivers.get('base_revenue_monthly', 0.0)
-        vol_growth = drivers.get('volume_growth_monthly', 0.0)
-        price_growth = drivers.get('price_growth_monthly', 0.0)
-        revenue = base_rev * ((1+vol_growth)**months_from_start) * ((1+price_growth)**months_from_start) * seasonality
-
-        cogs_pct = drivers.get('cogs_pct', 0.0)
-        cogs = revenue * cogs_pct
-
-        fixed_opex = drivers.get('fixed_opex_monthly', 0.0)
-        opex_var_pct = drivers.get('opex_var_pct', 0.0)
-        opex = fixed_opex + revenue * opex_var_pct
-
-        headcount = drivers.get('headcount_start', 0) + int(drivers.get('hiring_rate_monthly', 0)*months_from_start)
-        avg_salary = drivers.get('avg_salary_monthly', 0.0)
-        payroll = headcount * avg_salary
-
-        capex = capex_sched.get(ym, 0.0)
-        # add capex to depreciation schedule: simple approach -> add monthly dep for next useful_life_months
-        if capex != 0:
-            monthly_dep = capex / float(useful_life_months)
-            for j in range(useful_life_months):
-                dep_month = (date + relativedelta(months=j)).strftime('%Y-%m')
-                dep_table[dep_month] = dep_table.get(dep_month, 0.0) + monthly_dep
-
-        depreciation = dep_table.get(ym, drivers.get('depreciation_monthly', 0.0))
-
-        tax_pct = drivers.get('tax_rate', 0.0)
-        ebitda = revenue - cogs - opex - payroll
-        ebt = ebitda - depreciation
-        tax = max(0.0, ebt * tax_pct)
-        net_income = ebt - tax
-
-        # Working capital
-        dso = drivers.get('dso', 30.0)
-        dsi = drivers.get('dsi', 30.0)
-        dpo = drivers.get('dpo', 30.0)
-        ar = revenue / 30.0 * dso # Simplification for monthly
-        inventory = cogs / 30.0 * dsi
-        ap = cogs / 30.0 * dpo
-        wc = ar + inventory - ap
-        delta_wc = wc - prev_wc
-
-        operating_cf = net_income + depreciation - delta_wc
-        investing_cf = -capex
-        financing_cf = 0.0  # keep simple; extend later if debt/equity flows exist
-        cash = cash + operating_cf + investing_cf + financing_cf
-
-        rows.append({
-            'date': date.strftime('%Y-%m-01'),
-            'revenue': revenue,
-            'cogs': cogs,
-            'opex': opex,
-            'payroll': payroll,
-            'headcount': headcount,
-            'capex': capex,
-            'depreciation': depreciation,
-            'ebitda': ebitda,
-            'ebt': ebt,
-            'tax': tax,
-            'net_income': net_income,
-            'ar': ar,
-            'inventory': inventory,
-            'ap': ap,
-            'wc': wc,
-            'delta_wc': delta_wc,
-            'operating_cf': operating_cf,
-            'investing_cf': investing_cf,
-            'financing_cf': financing_cf,
-            'cash_balance': cash # Renamed to standard
-        })
-
-        prev_wc = wc
-
-    df = pd.DataFrame(rows)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path, index=False)
+    with span('forecast.compute', months=months_horizon):
+        if resume_from is None and checkpoint_path is None:
+            columns = forecast_arrays(drivers, start_date, months_horizon, opening_cash)
+            _, years, month_of_year = month_axis(start_date, months_horizon)
+            dates = month_labels(years, month_of_year)
+        else:
+            state = ForecastState.load(resume_from) if resume_from is not None else None
+            if state is not None:
+                start_date = datetime.fromisoformat(state.start_date)
+            columns, dates, end = _window([drivers], start_date, months_horizon, opening_cash, None, None, state)
+            columns = {name: columns[name][0] for name in FORECAST_COLUMNS[1:]}
+            if checkpoint_path is not None:
+                end.save(checkpoint_path)
+    with span('forecast.frame') as s:
+        columns['date'] = dates
+        df = compact_frame(pd.DataFrame(columns, columns=FORECAST_COLUMNS), precision)
+        s.set(rows_out=len(df))
+    with span('forecast.write', rows_in=len(df), format=fmt):
+        output_path = write_artifact(df, output_path, fmt, csv_export=csv_export)
     print(f"✅ Forecast saved to {output_path}")
     return df
 
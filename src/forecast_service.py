@@ -0,0 +1,270 @@
+"""
+Long-running forecast service.
+
+Keeps drivers.json and scenarios.json loaded and answers JSON requests over HTTP (TCP or a Unix
+socket). Requests that arrive within a short window are evaluated together in one batch_forecast
+call, and responses are cached (LRU) by the normalised driver set.
+
+    POST /forecast   {"drivers": {...overrides}, "start_date": "2025-01-01", "months_horizon": 36}
+    POST /scenarios  same body; returns one forecast per scenario in scenarios.json
+    GET  /health     liveness plus cache / batching counters
+
+Run with:  python src/forecast_service.py --port 8765   (or --unix /tmp/forecast.sock)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+
+from depreciation import METHODS
+from forecast_engine import DRIVER_DEFAULTS, batch_forecast, load_json
+from scenario_engine import apply_scenario
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class LRUCache:
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return self.items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+
+def _coerce(name, value):
+    """An override as the numbers the engine expects; a bad value fails only its own request."""
+    try:
+        if name == 'seasonality':
+            value = [float(v) for v in value]
+            if len(value) != 12:
+                raise ValueError("expected 12 monthly factors")
+            return value
+        if name == 'capex_schedule':
+            return {str(ym): float(amount) for ym, amount in value.items()}
+        if name == 'depreciation_method':
+            if value not in METHODS:
+                raise ValueError(f"expected one of {', '.join(METHODS)}")
+            return value
+        if isinstance(value, dict):
+            return {k: float(v) for k, v in value.items()}
+        if isinstance(value, bool) or value is None:
+            raise ValueError("expected a number")
+        if isinstance(value, (int, float)):
+            return value
+        return float(value)
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise ServiceError(400, f"invalid value for driver '{name}': {exc}")
+
+class ForecastService:
+    def __init__(self, drivers_path, scenarios_path, cache_size=1024, batch_window_ms=2.0, max_batch=256):
+        self.drivers = load_json(drivers_path)
+        self.scenarios = load_json(scenarios_path) if os.path.exists(scenarios_path) else {}
+        self.allowed = set(DRIVER_DEFAULTS) | set(self.drivers) | {'seasonality', 'capex_schedule'}
+        self.cache = LRUCache(cache_size)
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue = None
+        self.batches = 0
+        self.batched_sets = 0
+
+    # -------------------------------------------------------------
+    # Request handling
+    # -------------------------------------------------------------
+    def _parse(self, body):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError as exc:
+            raise ServiceError(400, f"invalid JSON: {exc}")
+        overrides = payload.get('drivers', {})
+        unknown = sorted(set(overrides) - self.allowed)
+        if unknown:
+            raise ServiceError(400, f"unknown driver(s): {', '.join(unknown)}")
+        drivers = dict(self.drivers)
+        drivers.update((name, _coerce(name, value)) for name, value in overrides.items())
+        try:
+            months = int(payload.get('months_horizon', 36))
+        except (TypeError, ValueError):
+            raise ServiceError(400, "months_horizon must be an integer")
+        if months <= 0:
+            raise ServiceError(400, "months_horizon must be positive")
+        return drivers, payload.get('start_date', '2025-01-01'), months
+
+    async def handle(self, method, path, body):
+        if path == '/health':
+            return {'status': 'ok', 'cache_entries': len(self.cache.items), 'cache_hits': self.cache.hits,
+                    'cache_misses': self.cache.misses, 'batches': self.batches, 'batched_sets': self.batched_sets}
+        if path not in ('/forecast', '/scenarios'):
+            raise ServiceError(404, f"no route for {path}")
+        if method != 'POST':
+            raise ServiceError(405, f"{path} expects POST")
+
+        drivers, start, months = self._parse(body)
+        # Normalised driver set (sorted keys) is the cache key, so override order doesn't matter
+        key = json.dumps([path, drivers, start, months], sort_keys=True)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if path == '/forecast':
+            names, driver_sets = ['forecast'], [drivers]
+        else:
+            names = list(self.scenarios)
+            driver_sets = [apply_scenario(drivers, self.scenarios[n]) for n in names]
+        results = await self._submit((start, months), driver_sets)
+        if path == '/forecast':
+            response = results[0]
+        else:
+            response = {'scenarios': dict(zip(names, results))}
+        response = json.dumps(response).encode()
+        self.cache.put(key, response)
+        return response
+
+    # -------------------------------------------------------------
+    # Request batching
+    # -------------------------------------------------------------
+    async def _submit(self, axis_key, driver_sets):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((axis_key, driver_sets, future))
+        return await future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(jobs) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    jobs.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._run_batch(jobs)
+
+    def _run_batch(self, jobs):
+        # Jobs sharing a month axis become one vectorized evaluation
+        groups = {}
+        for job in jobs:
+            groups.setdefault(job[0], []).append(job)
+        for (start, months), group in groups.items():
+            try:
+                self._evaluate(start, months, group)
+            except Exception:
+                # One bad driver set must not fail its batch neighbours: rerun the jobs one at a time
+                for job in group:
+                    if job[2].done():
+                        continue
+                    try:
+                        self._evaluate(start, months, [job])
+                    except Exception as exc:
+                        if not job[2].done():
+                            job[2].set_exception(ServiceError(400, f"forecast failed: {exc}"))
+
+    def _evaluate(self, start, months, group):
+        sets = [d for _, driver_sets, _ in group for d in driver_sets]
+        cube = batch_forecast(sets, start, months)
+        self.batches += 1
+        self.batched_sets += len(sets)
+        offset = 0
+        for _, driver_sets, future in group:
+            results = []
+            for i in range(offset, offset + len(driver_sets)):
+                columns = {'date': cube.dates}
+                columns.update({m: cube.values[i, :, k].tolist() for k, m in enumerate(cube.metrics)})
+                results.append(columns)
+            offset += len(driver_sets)
+            # A cancelled future means the client went away
+            if not future.done():
+                future.set_result(results)
+
+    # -------------------------------------------------------------
+    # HTTP/1.1 plumbing (keep-alive, Content-Length bodies only)
+    # -------------------------------------------------------------
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                try:
+                    result = await self.handle(method, path.split('?')[0], body)
+                    status = 200
+                except ServiceError as exc:
+                    status, result = exc.status, {'error': str(exc)}
+                except Exception as exc:
+                    status, result = 500, {'error': str(exc)}
+                payload = result if isinstance(result, bytes) else json.dumps(result).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None, ready=None):
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        if unix_path:
+            server = await asyncio.start_unix_server(self._serve_connection, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self._serve_connection, host, port)
+            where = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+        print(f"🛰️  Forecast service listening on {where}")
+        if ready is not None:
+            ready.set_result(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+if __name__ == '__main__':
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Serve driver forecasts over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on a Unix socket path instead of TCP")
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--batch-window-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    service = ForecastService(os.path.join(base_dir, 'data', 'config', 'drivers.json'),
+                              os.path.join(base_dir, 'data', 'config', 'scenarios.json'),
+                              cache_size=args.cache_size, batch_window_ms=args.batch_window_ms)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,226 @@
+"""
+Goal seek and bounded solves over the forecast engine.
+
+    goal_seek(evaluator, 'price_growth_monthly', 'ebitda_margin', 0.15, bounds=(0.0, 0.05))
+    solve(evaluator, {'ebitda_margin': 0.15, 'ending_cash': 0.0},
+          {'price_growth_monthly': (0.0, 0.05), 'cogs_pct': (0.3, 0.5)})
+
+Outputs are the horizon summaries in gradients.OUTPUTS (total_revenue, total_ebitda, ebitda_margin,
+total_net_income, ending_cash, min_cash). A ForecastEvaluator caches every evaluated driver set and
+counts forecast runs, so a solver report shows exactly how much work a solve took.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+
+from forecast_engine import forecast_arrays, load_json
+from gradients import OUTPUTS, driver_gradients, gradient_drivers
+
+class SolveResult:
+    def __init__(self, drivers, outputs, iterations, evaluations, converged, method):
+        self.drivers = drivers          # solved driver values
+        self.outputs = outputs          # every output at the solution
+        self.iterations = iterations
+        self.evaluations = evaluations  # forecast runs (cache misses) plus gradient passes
+        self.converged = converged
+        self.method = method
+
+    def __repr__(self):
+        status = 'converged' if self.converged else 'NOT converged'
+        return (f"SolveResult({self.method}, {status}, drivers={self.drivers}, "
+                f"iterations={self.iterations}, evaluations={self.evaluations})")
+
+class ForecastEvaluator:
+    """Cached output evaluation for driver overrides on top of a base driver set."""
+
+    def __init__(self, drivers, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0):
+        self.drivers = dict(drivers)
+        self.start_date_str = start_date_str
+        self.start_date = datetime.fromisoformat(start_date_str)
+        self.months = months_horizon
+        self.opening_cash = opening_cash
+        self.cache = {}
+        self.calls = 0
+        self.evaluations = 0
+        self.gradient_evaluations = 0
+
+    def __call__(self, overrides):
+        """All outputs for the base drivers with `overrides` applied."""
+        self.calls += 1
+        key = tuple(sorted(overrides.items()))
+        if key not in self.cache:
+            self.evaluations += 1
+            columns = forecast_arrays(dict(self.drivers, **overrides), self.start_date, self.months, self.opening_cash)
+            columns = {k: v[None] for k, v in columns.items()}
+            self.cache[key] = {name: float(f(columns)[0]) for name, f in OUTPUTS.items()}
+        return self.cache[key]
+
+    def gradient(self, overrides):
+        """Outputs plus exact d(output)/d(driver) (one batched complex-step pass)."""
+        self.gradient_evaluations += 1
+        grads = driver_gradients(dict(self.drivers, **overrides), self.start_date_str, self.months, self.opening_cash)
+        self.cache.setdefault(tuple(sorted(overrides.items())), grads.values)
+        return grads
+
+    def work(self):
+        return self.evaluations + self.gradient_evaluations
+
+def goal_seek(evaluator, driver, output, target, bounds, method='brent', xtol=1e-10, max_iter=100):
+    """Find the value of one driver in `bounds` where `output` equals `target`.
+
+    The output minus target must change sign across the bounds. Brent's method mixes inverse
+    quadratic interpolation and secant steps with bisection, so it keeps bisection's guarantee
+    (including on step-shaped outputs like headcount) but usually needs far fewer evaluations.
+    """
+    if method not in ('brent', 'bisect'):
+        raise ValueError(f"Unknown goal-seek method '{method}' (expected 'brent' or 'bisect')")
+    start_work = evaluator.work()
+
+    def f(x):
+        return evaluator({driver: x})[output] - target
+
+    a, b = map(float, bounds)
+    fa, fb = f(a), f(b)
+    if fa * fb > 0:
+        raise ValueError(f"{output} = {target} is not bracketed by {driver} in [{a}, {b}] "
+                         f"({output} spans {fa + target:,.4g} .. {fb + target:,.4g})")
+
+    iterations = 0
+    converged = fa == 0 or fb == 0
+    if fa == 0:
+        b, fb = a, fa
+    if method == 'bisect':
+        while not converged and iterations < max_iter:
+            iterations += 1
+            mid = (a + b) / 2
+            fm = f(mid)
+            if fa * fm <= 0:
+                b, fb = mid, fm
+            else:
+                a, fa = mid, fm
+            converged = fm == 0 or abs(b - a) <= xtol
+        x = b if abs(fb) <= abs(fa) else a
+    else:
+        x, iterations, converged = _brent(f, a, b, fa, fb, xtol, max_iter, converged)
+
+    return SolveResult({driver: x}, evaluator({driver: x}), iterations, evaluator.work() - start_work,
+                       converged, method)
+
+def _brent(f, a, b, fa, fb, xtol, max_iter, converged):
+    # Brent (1973), as in Numerical Recipes' zbrent: b is the best estimate, a the previous one,
+    # and c the bracket partner of b
+    c, fc = a, fa
+    d = e = b - a
+    iterations = 0
+    while not converged and iterations < max_iter:
+        iterations += 1
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * np.finfo(float).eps * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            converged = True
+            break
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s            # secant
+            else:
+                q, r = fa / fc, fb / fc            # inverse quadratic interpolation
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m                          # interpolation rejected: bisect
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+    return b, iterations, converged
+
+def solve(evaluator, targets, bounds, start=None, tol=1e-8, max_iter=50):
+    """Move several drivers within their bounds until every output hits its target.
+
+    Projected Gauss-Newton on the relative residuals (output - target) / max(|target|, 1): each
+    iteration takes one exact-gradient pass, solves for the minimum-norm step in bound-scaled
+    driver units (drivers pinned at a bound by the step are frozen), clips to the bounds and
+    backtracks until the residual shrinks.
+    """
+    names = list(bounds)
+    known = set(gradient_drivers(evaluator.drivers, evaluator.start_date_str, evaluator.months))
+    for name in names:
+        if name not in known:
+            raise ValueError(f"Cannot solve for '{name}': it has no gradient (structural or unknown driver)")
+    for name in targets:
+        if name not in OUTPUTS:
+            raise ValueError(f"Unknown output '{name}' (expected one of {', '.join(OUTPUTS)})")
+    lo = np.array([bounds[k][0] for k in names], dtype=float)
+    hi = np.array([bounds[k][1] for k in names], dtype=float)
+    width = np.where(hi > lo, hi - lo, 1.0)
+    x = np.array([(start or {}).get(k, evaluator.drivers.get(k, 0.0)) for k in names], dtype=float)
+    x = np.clip(x, lo, hi)
+    outputs = list(targets)
+    goal = np.array([targets[k] for k in outputs], dtype=float)
+    scale = np.maximum(np.abs(goal), 1.0)
+    start_work = evaluator.work()
+
+    def residual(values):
+        return (np.array([values[k] for k in outputs]) - goal) / scale
+
+    iterations, converged = 0, False
+    while iterations < max_iter:
+        grads = evaluator.gradient(dict(zip(names, x)))
+        r = residual(grads.values)
+        if np.max(np.abs(r)) <= tol:
+            converged = True
+            break
+        iterations += 1
+        jac = grads.gradient.loc[names, outputs].to_numpy().T * width / scale[:, None]
+        free = np.ones(len(names), dtype=bool)
+        for _ in range(len(names)):
+            step = np.zeros(len(names))
+            step[free] = -np.linalg.lstsq(jac[:, free], r, rcond=None)[0]
+            pinned = free & (((x <= lo) & (step < 0)) | ((x >= hi) & (step > 0)))
+            if not pinned.any():
+                break
+            free &= ~pinned
+        if not free.any() or not np.any(step):
+            break
+
+        norm, alpha = np.linalg.norm(r), 1.0
+        while alpha > 1e-6:
+            candidate = np.clip(x + alpha * step * width, lo, hi)
+            if np.linalg.norm(residual(evaluator(dict(zip(names, candidate))))) < norm:
+                break
+            alpha /= 2
+        else:
+            break
+        x = candidate
+
+    solution = dict(zip(names, x.tolist()))
+    return SolveResult(solution, evaluator(solution), iterations, evaluator.work() - start_work,
+                       converged, 'projected-gauss-newton')
+
+if __name__ == '__main__':
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    evaluator = ForecastEvaluator(load_json(os.path.join(base_dir, 'data', 'config', 'drivers.json')))
+
+    result = goal_seek(evaluator, 'price_growth_monthly', 'ebitda_margin', 0.15, bounds=(0.0, 0.05))
+    print(f"🎯 Price growth for a 15% EBITDA margin: {result.drivers['price_growth_monthly']:.6f} "
+          f"({result.iterations} iterations, {result.evaluations} evaluations)")
+
+    result = solve(evaluator, {'ebitda_margin': 0.15, 'ending_cash': 0.0},
+                   {'price_growth_monthly': (0.0, 0.05), 'cogs_pct': (0.30, 0.50)})
+    print(f"🎯 Margin 15% and break-even ending cash: {result.drivers} "
+          f"({result.iterations} iterations, {result.evaluations} evaluations)")
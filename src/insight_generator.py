@@ -2,41 +2,68 @@ import pandas as pd
 import numpy as np
 import os
 
+from instrumentation import span
+from precision import compact_frame, month_key, month_of_year, to_dates
+
+# Result store metric -> report column
+STORE_COLUMNS = {'revenue': 'Revenue', 'cogs': 'COGS', 'ebitda': 'EBITDA'}
+CASH_FLOW_METRICS = ('operating_cf', 'investing_cf', 'financing_cf')
+
 class InsightGenerator:
-    def __init__(self, data_path, output_path):
+    def __init__(self, data_path, output_path, df=None, precision='full'):
         self.data_path = data_path
         self.output_path = output_path
-        self.df = pd.read_csv(data_path)
+        self.precision = precision
+        self.df = df.copy() if df is not None else pd.read_csv(data_path)
+        if 'Date' not in self.df.columns and 'Month' in self.df.columns:
+            self.df['Date'] = self.df['Month']
+        # compact keeps Date as int32 month keys (see precision.py); full parses datetimes
+        self.df = compact_frame(self.df, precision)
         if 'Date' in self.df.columns:
-            self.df['Date'] = pd.to_datetime(self.df['Date'])
-            self.df.sort_values('Date', inplace=True)
-        elif 'Month' in self.df.columns:
-            self.df['Date'] = pd.to_datetime(self.df['Month'])
+            if precision == 'full':
+                self.df['Date'] = to_dates(self.df['Date'])
             self.df.sort_values('Date', inplace=True)
 
+    @classmethod
+    def from_store(cls, store, entity, output_path, precision='full'):
+        """Insights for one entity (scenario, path, ...) of a ResultStore; only that entity's slice is read."""
+        block = store.entity(entity)
+        df = pd.DataFrame({'Date': store.dates})
+        for metric, column in STORE_COLUMNS.items():
+            if metric in store.metrics:
+                df[column] = block[:, store.metrics.index(metric)]
+        if all(m in store.metrics for m in CASH_FLOW_METRICS):
+            df['CashFlow'] = sum(block[:, store.metrics.index(m)] for m in CASH_FLOW_METRICS)
+        return cls(store.path, output_path, df=df, precision=precision)
+
     def generate_variance_commentary(self, latest_month_idx=-1):
-        latest = self.df.iloc[latest_month_idx]
-        prev = self.df.iloc[latest_month_idx - 1]
-        
+        # MoM and YoY for every metric in one pass over a dense month axis (see variance.py), so a
+        # missing month gives no comparison instead of comparing against whichever row came before
+        from variance import VarianceEngine, available_metrics
+
+        metrics = [m for m in ('revenue', 'ebitda') if m in available_metrics(self.df)]
+        result = VarianceEngine(actuals=self.df, metrics=metrics).compute()
+        t = month_key(self.df['Date'].iloc[[latest_month_idx]])[0] - result.index.first_month
+
         comments = []
-        metrics = ['Revenue', 'EBITDA']
-        
-        for m in metrics:
-            if m in self.df.columns:
-                val_curr = latest[m]
-                val_prev = prev[m]
-                growth = (val_curr - val_prev) / val_prev * 100
-                direction = "up" if growth > 0 else "down"
-                comments.append(f"- {m} {direction} {abs(growth):.1f}% MoM.")
-                
+        for m in ['Revenue', 'EBITDA']:
+            if m.lower() not in result.metrics:
+                continue
+            for kind, label in (('mom', 'MoM'), ('yoy', 'YoY')):
+                growth = result.metric(kind, m.lower(), pct=True)[0, t] * 100
+                if np.isfinite(growth):
+                    direction = "up" if growth > 0 else "down"
+                    comments.append(f"- {m} {direction} {abs(growth):.1f}% {label}.")
+
         # Margin
-        if 'Revenue' in self.df.columns and 'EBITDA' in self.df.columns:
-            margin_curr = latest['EBITDA'] / latest['Revenue'] * 100
-            margin_prev = prev['EBITDA'] / prev['Revenue'] * 100
-            bps = (margin_curr - margin_prev) * 100
-            direction = "expanded" if bps > 0 else "compressed"
-            comments.append(f"- EBITDA margin {direction} {abs(bps):.0f}bps.")
-            
+        if 'revenue' in result.metrics and 'ebitda' in result.metrics:
+            revenue, ebitda = (result.metrics.index(m) for m in ('revenue', 'ebitda'))
+            latest, prev = result.value['mom'][0, t], result.reference('mom')[0, t]
+            bps = (latest[ebitda] / latest[revenue] - prev[ebitda] / prev[revenue]) * 100 * 100
+            if np.isfinite(bps):
+                direction = "expanded" if bps > 0 else "compressed"
+                comments.append(f"- EBITDA margin {direction} {abs(bps):.0f}bps.")
+
         return comments
 
     def generate_trend_detection(self):
@@ -56,7 +83,7 @@ class InsightGenerator:
         
         # Seasonality (Simple Peak detection)
         # Find month with highest average revenue
-        self.df['MonthNum'] = self.df['Date'].dt.month
+        self.df['MonthNum'] = month_of_year(self.df['Date'])
         monthly_avg = self.df.groupby('MonthNum')['Revenue'].mean()
         peak_month = monthly_avg.idxmax()
         import calendar
@@ -91,23 +118,27 @@ class InsightGenerator:
         
         # 1. Commentary
         report_sections.append("1. MONTHLY VARIANCE COMMENTARY")
-        report_sections.extend(self.generate_variance_commentary())
+        with span('insights.variance', rows_in=len(self.df)):
+            report_sections.extend(self.generate_variance_commentary())
         report_sections.append("")
         
         # 2. Trends
         report_sections.append("2. TREND DETECTION")
-        report_sections.extend(self.generate_trend_detection())
+        with span('insights.trends', rows_in=len(self.df)):
+            report_sections.extend(self.generate_trend_detection())
         report_sections.append("")
         
         # 3. Risks
         report_sections.append("3. RISK ALERTS")
-        report_sections.extend(self.check_risks())
+        with span('insights.risks', rows_in=len(self.df)):
+            report_sections.extend(self.check_risks())
         report_sections.append("")
         
         # Save
-        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        with open(self.output_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(report_sections))
+        with span('insights.write', rows_in=len(report_sections)):
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            with open(self.output_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(report_sections))
             
         print(f"📝 Insights Report saved: {self.output_path}")
 
@@ -0,0 +1,212 @@
+"""
+Run instrumentation: timed spans for pipeline stages and their major sub-steps.
+
+    with span('forecast.write', rows_in=len(df)):
+        write_artifact(df, path)
+
+    with span('forecast.frame') as s:
+        df = build()
+        s.set(rows_out=len(df))
+
+Instrumentation is off unless enable() was called (run.py --trace / --profile); span() then returns a
+shared no-op object, so instrumented code pays one function call and a global lookup per span.
+When on, each span records wall time, CPU time, current and peak RSS, how much it raised the peak
+(peak_growth_mb), rows in/out, and its parent span. Stage spans opened with profile=True also dump a
+cProfile (.prof) or pyinstrument (.html) profile when a profiler was requested.
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+_recorder = None
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def next(self, name, **attrs):
+        pass
+
+    def close(self):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    def __init__(self, recorder, name, profile, attrs):
+        self.recorder = recorder
+        self.name = name
+        self.profile = profile
+        self.attrs = attrs
+        self._profiler = None
+
+    def set(self, **attrs):
+        """Attach values (rows_in, rows_out, anything JSON-serializable) to the span."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        rec = self.recorder
+        self.parent = rec.stack[-1].name if rec.stack else None
+        self.depth = len(rec.stack)
+        rec.stack.append(self)
+        if self.profile and rec.profiler and not rec.profiling:
+            self._profiler = rec.start_profiler()
+        self._peak = _peak_rss_mb()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        rec = self.recorder
+        profile_path = rec.stop_profiler(self._profiler, self.name) if self._profiler else None
+        if self in rec.stack:  # also drops steps left open by an exception
+            del rec.stack[rec.stack.index(self):]
+        peak, rss = _peak_rss_mb(), _rss_mb()
+        record = {
+            'name': self.name, 'parent': self.parent, 'depth': self.depth,
+            'start_s': round(self._wall - rec.started, 6), 'wall_s': round(wall, 6), 'cpu_s': round(cpu, 6),
+            'rss_mb': round(rss, 1) if rss is not None else None,
+            'peak_rss_mb': round(peak, 1), 'peak_growth_mb': round(peak - self._peak, 1),
+            'rows_in': self.attrs.pop('rows_in', None), 'rows_out': self.attrs.pop('rows_out', None),
+        }
+        if exc_type is not None:
+            record['error'] = f'{exc_type.__name__}: {exc}'
+        if profile_path:
+            record['profile'] = profile_path
+        if self.attrs:
+            record['attrs'] = self.attrs
+        rec.records.append(record)
+        return False
+
+class Recorder:
+    def __init__(self, profiler=None, profile_dir=None):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}' (expected one of {PROFILERS})")
+        if profiler == 'pyinstrument':
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as exc:
+                raise ImportError("--profile pyinstrument needs pyinstrument (pip install pyinstrument)") from exc
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.profiling = False
+        self.records = []
+        self.stack = []
+        self.started = time.perf_counter()
+        self.created = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    def start_profiler(self):
+        self.profiling = True
+        if self.profiler == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            import pyinstrument
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+        return profiler
+
+    def stop_profiler(self, profiler, name):
+        self.profiling = False
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if self.profiler == 'cprofile':
+            profiler.disable()
+            path = os.path.join(self.profile_dir, f'{name}.prof')
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = os.path.join(self.profile_dir, f'{name}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return path
+
+    def to_dict(self):
+        return {'created': self.created, 'pid': os.getpid(), 'argv': sys.argv, 'profiler': self.profiler,
+                'peak_rss_mb': round(_peak_rss_mb(), 1), 'spans': sorted(self.records, key=lambda r: r['start_s'])}
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def summary(self):
+        """Printable span tree (start order, indented by depth)."""
+        lines = [f"  {'span':<38} {'wall s':>9} {'cpu s':>9} {'peak MB':>8} {'rows in':>9} {'rows out':>9}"]
+        for r in sorted(self.records, key=lambda r: r['start_s']):
+            label = '  ' * r['depth'] + r['name']
+            rows_in = '' if r['rows_in'] is None else f"{r['rows_in']:,}"
+            rows_out = '' if r['rows_out'] is None else f"{r['rows_out']:,}"
+            lines.append(f"  {label:<38} {r['wall_s']:>9.4f} {r['cpu_s']:>9.4f} {r['peak_rss_mb']:>8.1f} "
+                         f"{rows_in:>9} {rows_out:>9}")
+        return '\n'.join(lines)
+
+def enable(profiler=None, profile_dir=None):
+    """Turn instrumentation on for this process and return the Recorder collecting spans."""
+    global _recorder
+    _recorder = Recorder(profiler, profile_dir or os.path.join(os.getcwd(), 'profiles'))
+    return _recorder
+
+def disable():
+    """Turn instrumentation off; returns the Recorder that was active (or None)."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+def active():
+    return _recorder
+
+def span(name, profile=False, **attrs):
+    if _recorder is None:
+        return _NULL_SPAN
+    return Span(_recorder, name, profile, attrs)
+
+class Steps:
+    """Consecutive sub-steps of one long function: next('b') closes step 'a' and opens 'b'."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.current = None
+
+    def next(self, name, **attrs):
+        self.close()
+        self.current = span(f'{self.prefix}.{name}', **attrs).__enter__()
+
+    def close(self):
+        if self.current is not None:
+            self.current.__exit__(None, None, None)
+            self.current = None
+
+def steps(prefix):
+    if _recorder is None:
+        return _NULL_SPAN
+    return Steps(prefix)
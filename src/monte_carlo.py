@@ -0,0 +1,155 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from forecast_engine import DRIVER_DEFAULTS, batch_forecast, load_json, month_axis, month_labels
+from result_store import ResultStore
+from streaming_stats import StreamingAggregator
+
+FAN_METRICS = ['revenue', 'ebitda', 'cash_balance']
+
+def sample_drivers(distributions, n, rng):
+    """Draw n values for every declared driver distribution (in declaration order)."""
+    samples = {}
+    for name, spec in distributions.items():
+        kind = spec.get('dist', 'normal')
+        if kind == 'normal':
+            values = rng.normal(spec['mean'], spec['std'], n)
+        elif kind == 'lognormal':
+            values = rng.lognormal(spec['mean'], spec['sigma'], n)
+        elif kind == 'uniform':
+            values = rng.uniform(spec['low'], spec['high'], n)
+        elif kind == 'triangular':
+            values = rng.triangular(spec['low'], spec['mode'], spec['high'], n)
+        else:
+            raise ValueError(f"Unsupported distribution '{kind}' for driver '{name}'")
+        if 'min' in spec or 'max' in spec:
+            values = np.clip(values, spec.get('min', -np.inf), spec.get('max', np.inf))
+        samples[name] = values
+    return samples
+
+def _simulate_chunk(drivers, distributions, start_date_str, months_horizon, seed_seq, n_paths, metrics, compression,
+                    store=None):
+    # One chunk = one independent RNG stream, so results don't depend on which worker runs it.
+    # Only the chunk's aggregate leaves the worker; paths are dropped, or written to the result
+    # store at the chunk's offset when `store` is (path, offset).
+    rng = np.random.default_rng(seed_seq)
+    # Scalar drivers are shared by every path; broadcasting them keeps N = n_paths even with no
+    # distributions declared
+    stacked = {k: np.broadcast_to(v, (n_paths,)) if k in DRIVER_DEFAULTS and np.ndim(v) == 0 else v
+               for k, v in drivers.items()}
+    stacked.update(sample_drivers(distributions, n_paths, rng))
+    cube = batch_forecast(stacked, start_date_str, months_horizon)
+    paths = np.stack([cube.metric(name) for name in metrics], axis=-1)
+    negative = cube.metric('cash_balance') < 0
+    aggregate = StreamingAggregator(paths.shape[1:], compression).update(paths)
+    if store is not None:
+        path, offset = store
+        target = ResultStore.open(path, mode='r+')
+        target.block(offset, offset + n_paths)[...] = paths
+        target.flush()
+    return aggregate, int(negative.any(axis=1).sum()), negative.sum(axis=0)
+
+class SimulationResult:
+    def __init__(self, dates, metrics, percentiles, aggregate, negative_paths, negative_by_month, store=None):
+        self.dates = dates
+        self.metrics = metrics
+        self.percentiles = percentiles
+        self.aggregate = aggregate  # StreamingAggregator over (months x metrics)
+        self.paths = aggregate.count
+        self.prob_cash_negative = negative_paths / aggregate.count
+        self.prob_cash_negative_by_month = negative_by_month / aggregate.count
+        bands = aggregate.quantile(np.asarray(percentiles) / 100.0)
+        self.fan = {name: bands[:, :, k] for k, name in enumerate(metrics)}  # metric -> (percentiles x months)
+        self.store = store  # ResultStore with every path, when run(store_path=...) was used
+
+    def fan_chart(self):
+        """Long table: one row per metric and month with mean, std and a column per percentile."""
+        stats = self.aggregate.summary()
+        frames = []
+        for k, metric in enumerate(self.metrics):
+            df = pd.DataFrame(self.fan[metric].T, columns=[f'p{q:g}' for q in self.percentiles])
+            df.insert(0, 'std', stats['std'][:, k])
+            df.insert(0, 'mean', stats['mean'][:, k])
+            df.insert(0, 'metric', metric)
+            df.insert(0, 'date', self.dates)
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+
+class MonteCarloEngine:
+    def __init__(self, drivers_path, simulation_path):
+        self.drivers = load_json(drivers_path)
+        with open(simulation_path, 'r') as f:
+            self.config = json.load(f)
+
+    def _chunks(self, paths, seed):
+        # Chunk boundaries and seeds depend only on (paths, chunk_size, seed), never on the worker count
+        chunk_size = self.config.get('chunk_size', 5000)
+        sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+        return list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+    def run(self, paths=None, workers=1, seed=None, store_path=None):
+        if paths is None:
+            paths = self.config.get('paths', 10000)
+        if paths <= 0:
+            raise ValueError(f"paths must be positive, got {paths}")
+        seed = self.config.get('seed', 0) if seed is None else seed
+        start = self.config.get('start_date', '2025-01-01')
+        months = self.config.get('months_horizon', 36)
+        distributions = self.config.get('distributions', {})
+        percentiles = self.config.get('percentiles', [5, 25, 50, 75, 95])
+        metrics = self.config.get('metrics', FAN_METRICS)
+        compression = self.config.get('compression', 100)
+        chunks = self._chunks(paths, seed)
+        _, years, month_of_year = month_axis(datetime.fromisoformat(start), months)
+        dates = month_labels(years, month_of_year)
+        print(f"🎲 Simulating {paths:,} paths in {len(chunks)} chunks ({workers} worker(s))...")
+
+        offsets = np.concatenate([[0], np.cumsum([n for _, n in chunks])[:-1]]).astype(int)
+        stores = [None] * len(chunks)
+        if store_path is not None:
+            ResultStore.create(store_path, dates, metrics, n_entities=paths, entity_axis='path',
+                               attrs={'seed': seed, 'chunk_size': self.config.get('chunk_size', 5000)})
+            stores = [(store_path, int(offset)) for offset in offsets]
+        args = [(self.drivers, distributions, start, months, ss, n, metrics, compression, store)
+                for (ss, n), store in zip(chunks, stores)]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_simulate_chunk, *zip(*args))
+                aggregate, negative_paths, negative_by_month = self._combine(results, months, metrics, compression)
+        else:
+            results = (_simulate_chunk(*a) for a in args)
+            aggregate, negative_paths, negative_by_month = self._combine(results, months, metrics, compression)
+
+        print("✅ Simulation complete")
+        store = ResultStore.open(store_path) if store_path is not None else None
+        return SimulationResult(dates, metrics, percentiles, aggregate, negative_paths, negative_by_month, store)
+
+    @staticmethod
+    def _combine(results, months, metrics, compression):
+        # Partials are merged in chunk order as they arrive, so memory stays bounded and the merge
+        # sequence (hence the sketch) is the same for any worker count
+        aggregate = StreamingAggregator((months, len(metrics)), compression)
+        negative_paths = 0
+        negative_by_month = np.zeros(months, dtype=np.int64)
+        for partial, n_negative, by_month in results:
+            aggregate.merge(partial)
+            negative_paths += n_negative
+            negative_by_month += by_month
+        return aggregate, negative_paths, negative_by_month
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    drivers_path = os.path.join(base_dir, 'data', 'config', 'drivers.json')
+    simulation_path = os.path.join(base_dir, 'data', 'config', 'simulation.json')
+    output_path = os.path.join(base_dir, 'data', 'processed', 'simulation_fan_chart.csv')
+
+    engine = MonteCarloEngine(drivers_path, simulation_path)
+    result = engine.run(workers=os.cpu_count() or 1)
+    result.fan_chart().to_csv(output_path, index=False)
+    print(f"💾 Fan chart saved: {output_path}")
+    print(f"   P(cash < 0 at any point): {result.prob_cash_negative:.2%}")
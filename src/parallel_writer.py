@@ -0,0 +1,164 @@
+"""
+Parallel chunked writes for large tables (generated histories, dim tables).
+
+Two layouts:
+
+    partitioned    one file per partition (an Entity, a Year, or a generated chunk), written by a
+                   pool, plus the `_partitions.json` manifest read_artifact understands
+    concatenated   one CSV: row ranges are rendered to bytes by a pool and appended in order, so the
+                   file is byte-identical to a single to_csv
+
+CSV rendering holds the GIL, so CSV work runs on a process pool by default; Parquet / Feather
+encoding releases it and runs on threads. Progress lines report rows/s and MB/s, and every writer
+returns the same numbers as a stats dict.
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from artifact_io import FORMATS, MANIFEST, artifact_path, format_of, write_artifact
+
+EXECUTORS = ('thread', 'process')
+YEAR = 'Year'  # partition_by value that splits on the calendar year of the date column
+DATE_COLUMNS = ('Month', 'Date', 'date')
+
+def _pool(executor, workers):
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}' (expected one of {EXECUTORS})")
+    workers = workers or os.cpu_count() or 1
+    return (ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor)(max_workers=workers), workers
+
+def default_executor(fmt):
+    return 'process' if fmt == 'csv' else 'thread'
+
+class Progress:
+    """Rows and bytes written so far; prints a throughput line at most every `interval` seconds."""
+
+    def __init__(self, label, total, verbose=True, interval=0.5):
+        self.label = label
+        self.total = total
+        self.verbose = verbose
+        self.interval = interval
+        self.done = self.rows = self.bytes = 0
+        self.started = self._printed = time.perf_counter()
+
+    def update(self, rows, nbytes):
+        self.done += 1
+        self.rows += rows
+        self.bytes += nbytes
+        now = time.perf_counter()
+        if self.verbose and self.done < self.total and now - self._printed >= self.interval:
+            self._printed = now
+            s = self.stats()
+            print(f"  … {self.label}: {self.done}/{self.total}  {s['rows']:,} rows  {s['mb']:.1f} MB  "
+                  f"{s['rows_per_s']:,.0f} rows/s  {s['mb_per_s']:.1f} MB/s", file=sys.stderr)
+
+    def stats(self):
+        seconds = max(time.perf_counter() - self.started, 1e-9)
+        return {'rows': self.rows, 'mb': self.bytes / 1e6, 'parts': self.done, 'seconds': seconds,
+                'rows_per_s': self.rows / seconds, 'mb_per_s': self.bytes / 1e6 / seconds}
+
+    def finish(self, path, workers, executor):
+        s = dict(self.stats(), path=path, workers=workers, executor=executor)
+        if self.verbose:
+            print(f"✅ {self.label}: {s['rows']:,} rows, {s['mb']:.1f} MB in {s['parts']} part(s) "
+                  f"({s['seconds']:.2f}s, {s['rows_per_s']:,.0f} rows/s, {s['mb_per_s']:.1f} MB/s, "
+                  f"{workers} {executor} worker(s)): {path}")
+        return s
+
+def run_parts(func, tasks, workers=None, executor='thread', label='write', verbose=True):
+    """Run `func(*task)` for every task on a pool; each call returns (rows, bytes) of the file it wrote.
+
+    Results come back in task order; the Progress tracker is returned alongside for its stats.
+    """
+    progress = Progress(label, len(tasks), verbose)
+    pool, workers = _pool(executor, workers)
+    results = [None] * len(tasks)
+    with pool:
+        futures = {pool.submit(func, *task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            results[futures[future]] = rows, nbytes = future.result()
+            progress.update(rows, nbytes)
+    return results, progress, workers
+
+def write_manifest(path, fmt, column, parts):
+    with open(os.path.join(path, MANIFEST), 'w') as f:
+        json.dump({'format': fmt, 'column': column, 'partitions': parts}, f, indent=2)
+
+def _partition_keys(df, partition_by):
+    if partition_by != YEAR or YEAR in df.columns:
+        return df[partition_by]
+    from precision import to_dates
+    date_col = next((c for c in DATE_COLUMNS if c in df.columns), None)
+    if date_col is None:
+        raise ValueError(f"partition_by='{YEAR}' needs a date column ({', '.join(DATE_COLUMNS)})")
+    return to_dates(df[date_col]).dt.year.rename(YEAR)
+
+def _write_part(df, path, fmt, float_dtype):
+    write_artifact(df, path, fmt, float_dtype=float_dtype)
+    return len(df), os.path.getsize(path)
+
+def write_partitions(df, path, partition_by, fmt=None, workers=None, executor=None, float_dtype=None, verbose=True):
+    """One file per value of `partition_by` (a column, or 'Year' from the date column), written in parallel.
+
+    The artifact path becomes a directory with `<column>=<value>` files and a manifest, the same
+    layout as write_artifact(partition_by=...), so read_artifact(path, partitions=[...]) works.
+    """
+    import numpy as np
+
+    fmt = fmt or format_of(path)
+    path = artifact_path(path, fmt)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    keys = _partition_keys(df, partition_by)
+    tasks, parts = [], []
+    for value, part in df.groupby(keys, sort=False, observed=True):
+        name = f'{partition_by}={value}{FORMATS[fmt]}'.replace(os.sep, '_')
+        tasks.append((part, os.path.join(path, name), fmt, float_dtype))
+        parts.append({'value': value.item() if isinstance(value, np.generic) else value, 'file': name})
+    executor = executor or default_executor(fmt)
+    results, progress, workers = run_parts(_write_part, tasks, workers, executor, f'{partition_by} partitions',
+                                           verbose)
+    for part, (rows, _) in zip(parts, results):
+        part['rows'] = rows
+    write_manifest(path, fmt, partition_by, parts)
+    return progress.finish(path, workers, executor)
+
+def _render_csv(df, header):
+    from precision import expand_dates
+    return expand_dates(df).to_csv(index=False, header=header).encode('utf-8')
+
+def write_csv(df, path, workers=None, chunk_rows=200_000, executor='process', verbose=True):
+    """One CSV file: `chunk_rows` row ranges rendered in parallel and appended in order (byte ranges).
+
+    The bytes equal df.to_csv(path, index=False); only the formatting work is spread over the pool.
+    """
+    path = artifact_path(path, 'csv')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    starts = range(0, max(len(df), 1), chunk_rows)
+    progress = Progress('csv ranges', len(starts), verbose)
+    pool, workers = _pool(executor, workers)
+    # At most 2 ranges per worker are pending, so memory stays bounded however long the frame is
+    max_in_flight = 2 * workers
+    pending = deque()
+    with pool, open(path, 'wb') as f:
+        for start in starts:
+            pending.append((start, pool.submit(_render_csv, df.iloc[start:start + chunk_rows], start == 0)))
+            if len(pending) >= max_in_flight:
+                _append_range(f, pending.popleft(), chunk_rows, len(df), progress)
+        # Oldest first, so ranges land in the file in row order
+        while pending:
+            _append_range(f, pending.popleft(), chunk_rows, len(df), progress)
+    return progress.finish(path, workers, executor)
+
+def _append_range(f, pending, chunk_rows, total_rows, progress):
+    start, future = pending
+    data = future.result()
+    f.write(data)
+    progress.update(min(chunk_rows, total_rows - start), len(data))
@@ -0,0 +1,244 @@
+"""
+In-process pipeline runner.
+
+Stages are plain functions that receive the shared context (paths plus every upstream stage's
+outputs) and return a dict of named outputs. DataFrames are handed to downstream stages in
+memory; each stage still writes its usual artifact to disk. With a StageCache, unchanged stages
+are skipped and their outputs are only loaded from disk if a downstream stage asks for them.
+"""
+
+import os
+import time
+
+from instrumentation import span
+
+class PipelineError(Exception):
+    """A critical stage failed; the original exception is chained as __cause__."""
+
+    def __init__(self, stage, message):
+        super().__init__(f"Stage '{stage}' failed: {message}")
+        self.stage = stage
+
+class Lazy:
+    """Deferred context value; resolved (once) the first time a stage reads it."""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+class Context(dict):
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, Lazy):
+            value = value.loader()
+            self[key] = value
+        return value
+
+class Stage:
+    """A pipeline step.
+
+    `inputs` and `artifacts` name context keys holding file paths the stage reads / writes; together
+    with the src/ modules the stage imports (see stage_cache.stage_modules; `code` adds any it cannot
+    see) and the context values named in `params` they form the stage's cache fingerprint. `load(ctx)` rebuilds the stage's in-memory outputs (as Lazy values) when the stage
+    is served from cache.
+    """
+
+    def __init__(self, name, func, deps=(), critical=True, label=None,
+                 inputs=(), artifacts=(), code=(), load=None, params=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.critical = critical
+        self.label = label or name
+        self.inputs = tuple(inputs)
+        self.artifacts = tuple(artifacts)
+        self.code = tuple(code)
+        self.load = load
+        self.params = tuple(params)
+
+def _rows(values):
+    """Total rows of the in-memory tables among `values` (Lazy values are not loaded); None if there are none."""
+    sizes = [len(v) for v in values if hasattr(v, 'shape') and not isinstance(v, Lazy)]
+    return sum(sizes) if sizes else None
+
+class Pipeline:
+    def __init__(self, stages):
+        self.stages = {s.name: s for s in stages}
+        self.timings = {}
+        self.skipped = []
+        self.produced = {}  # stage -> context keys it put in memory
+
+    def order(self):
+        """Topological order of stages (declaration order among independent stages)."""
+        ordered, visiting = [], set()
+
+        def visit(name):
+            if name in ordered:
+                return
+            if name in visiting:
+                raise PipelineError(name, "dependency cycle")
+            if name not in self.stages:
+                raise PipelineError(name, "unknown stage")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return ordered
+
+    def _run_stage(self, stage, context, cache, force, trace):
+        name = stage.name
+        started = time.perf_counter()
+        trace.set(rows_in=_rows(dict.get(context, key) for dep in stage.deps for key in self.produced.get(dep, ())))
+        fingerprint = None
+        if cache is not None:
+            upstream = [context[key] for dep in stage.deps for key in self.stages[dep].artifacts]
+            fingerprint = cache.fingerprint(stage, context, upstream, {k: context.get(k) for k in stage.params})
+            if not force and cache.restore(fingerprint, stage, context):
+                loaded = stage.load(context) if stage.load else {}
+                context.update(loaded)
+                self.produced[name] = tuple(loaded)
+                self.timings[name] = time.perf_counter() - started
+                self.skipped.append(name)
+                trace.set(cached=True)
+                print(f"   ♻️  {name}: up to date ({fingerprint[:12]})")
+                return
+        try:
+            outputs = stage.func(context) or {}
+        except Exception as exc:
+            self.timings[name] = time.perf_counter() - started
+            if stage.critical:
+                raise PipelineError(name, exc) from exc
+            print(f"⚠️  {name} failed (non-critical): {exc}")
+            trace.set(failed=str(exc))
+            return
+        context.update(outputs)
+        self.produced[name] = tuple(outputs)
+        trace.set(rows_out=_rows(outputs.values()))
+        if cache is not None:
+            cache.store(fingerprint, stage, context)
+        self.timings[name] = time.perf_counter() - started
+        print(f"   ⏱  {name}: {self.timings[name]:.3f}s")
+
+    def run(self, context, cache=None, force=False):
+        """Run every stage in order. With a StageCache, stages whose fingerprint is already stored
+        are restored from the cache instead of executed (unless `force`)."""
+        context = Context(context)
+        self.skipped = []
+        order = self.order()
+        for i, name in enumerate(order, 1):
+            stage = self.stages[name]
+            print(f"\n[{i}/{len(order)}] {stage.label}...")
+            with span(f'stage.{name}', profile=True) as trace:
+                self._run_stage(stage, context, cache, force, trace)
+        return context
+
+# ---------------------------------------------------------
+# Stage functions (heavy modules are imported on first use)
+# ---------------------------------------------------------
+
+def default_context(base_dir, artifact_format='csv', csv_export=False, precision='full'):
+    """Paths for every stage; history and forecast are written as `artifact_format` (csv / parquet /
+    feather), with a CSV copy of the forecast when `csv_export` is set. `precision` ('full' /
+    'compact') is the dtype mode of every stage's frames (see precision.py)."""
+    from artifact_io import FORMATS
+    from precision import check_precision
+
+    processed = os.path.join(base_dir, 'data', 'processed')
+    ext = FORMATS[artifact_format]
+    return {
+        'base_dir': base_dir,
+        'artifact_format': artifact_format,
+        'csv_export': csv_export,
+        'precision': check_precision(precision),
+        'drivers_path': os.path.join(base_dir, 'data', 'config', 'drivers.json'),
+        'history_path': os.path.join(base_dir, 'data', 'raw', 'historical_financials' + ext),
+        'dim_date_path': os.path.join(processed, 'dim_date.csv'),
+        'forecast_path': os.path.join(processed, 'forecast_output' + ext),
+        'scenario_path': os.path.join(processed, 'scenario_output.csv'),
+        'excel_path': os.path.join(base_dir, 'outputs', 'FPnA_Model_with_formulas.xlsx'),
+        'insights_path': os.path.join(base_dir, 'outputs', 'insights_report.txt'),
+    }
+
+def generate_history(ctx):
+    from data_generator import FinancialDataGenerator
+    from precision import compact_frame
+
+    with span('history.load_config'):
+        gen = FinancialDataGenerator(ctx['drivers_path'])
+    with span('history.generate') as s:
+        history = compact_frame(gen.generate_financials(), ctx.get('precision', 'full'))
+        s.set(rows_out=len(history))
+    with span('history.write', rows_in=len(history)):
+        gen.save_data(history, ctx['history_path'])
+    with span('history.dim_date'):
+        gen.generate_dim_date(ctx['dim_date_path'])
+    return {'history': history}
+
+def run_forecast(ctx):
+    from forecast_engine import driver_forecast, load_json
+
+    with span('forecast.load_drivers'):
+        drivers = load_json(ctx['drivers_path'])
+    forecast = driver_forecast(drivers=drivers, output_path=ctx['forecast_path'],
+                               fmt=ctx.get('artifact_format', 'csv'), csv_export=ctx.get('csv_export', False),
+                               precision=ctx.get('precision', 'full'))
+    return {'drivers': drivers, 'forecast': forecast}
+
+def export_excel(ctx):
+    from export_module import ExportModule
+
+    os.makedirs(os.path.dirname(ctx['excel_path']), exist_ok=True)
+    exporter = ExportModule(ctx['history_path'], ctx['forecast_path'], forecast_df=ctx['forecast'])
+    # Every sheet is written row by row, so the workbook can stream to disk (same cells as in-memory)
+    exporter.create_excel_model(ctx['excel_path'], constant_memory=True)
+    return {}
+
+def generate_insights(ctx):
+    import pandas as pd
+    from insight_generator import InsightGenerator
+
+    # Prefer the Base scenario of the scenario output; fall back to the in-memory forecast
+    if os.path.exists(ctx['scenario_path']):
+        with span('insights.read', path=os.path.basename(ctx['scenario_path'])) as s:
+            df = pd.read_csv(ctx['scenario_path'])
+            s.set(rows_out=len(df))
+        data_path = ctx['scenario_path']
+    else:
+        df = ctx['forecast']
+        data_path = ctx['forecast_path']
+    if 'Scenario' in df.columns:
+        df = df[df['Scenario'] == 'Base']
+    InsightGenerator(data_path, ctx['insights_path'], df=df, precision=ctx.get('precision', 'full')).generate_report()
+    return {}
+
+def _read_artifact(path):
+    def read():
+        from artifact_io import read_artifact
+        return read_artifact(path)
+    return Lazy(read)
+
+def _load_history(ctx):
+    return {'history': _read_artifact(ctx['history_path'])}
+
+def _load_forecast(ctx):
+    def drivers():
+        from forecast_engine import load_json
+        return load_json(ctx['drivers_path'])
+    return {'drivers': Lazy(drivers), 'forecast': _read_artifact(ctx['forecast_path'])}
+
+def build_default_pipeline():
+    return Pipeline([
+        Stage('history', generate_history, label='📅 Generating dimension tables',
+              inputs=('drivers_path',), artifacts=('history_path', 'dim_date_path'),
+              load=_load_history, params=('precision',)),
+        Stage('forecast', run_forecast, label='🔮 Running forecast engine',
+              inputs=('drivers_path',), artifacts=('forecast_path',),
+              load=_load_forecast, params=('csv_export', 'precision')),
+        Stage('export', export_excel, deps=('history', 'forecast'), label='📊 Exporting Excel model',
+              inputs=('drivers_path',), artifacts=('excel_path',)),
+        Stage('insights', generate_insights, deps=('forecast',), critical=False, label='📝 Generating insights report',
+              inputs=('scenario_path',), artifacts=('insights_path',), params=('precision',)),
+    ])
@@ -0,0 +1,153 @@
+"""
+Memory-mapped result store for (entity x month x metric) simulation cubes.
+
+A store is a directory with a raw `values.bin` array and a `header.json` describing the axes,
+dtype and units (currency / frequency come from data/config/metadata.json). Values are laid out
+metric-major on disk, (metric x entity x month), and exposed through a transposed view with the
+usual (entity x month x metric) shape: one metric is a single contiguous block, and one entity is
+one short run per metric, so both slices are zero-copy views that only page in what they touch.
+
+    store = ResultStore.create(path, entities=names, dates=dates, metrics=FORECAST_COLUMNS[1:])
+    batch_forecast(table, out=store.values[0:1000])     # engines write straight into the map
+    store = ResultStore.open(path)
+    store.metric('cash_balance')                         # (entity x month) view
+    store.entity('Base')                                 # (month x metric) view
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+HEADER = 'header.json'
+DATA = 'values.bin'
+VERSION = 1
+
+def _metadata():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.path.join(base_dir, 'data', 'config', 'metadata.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _labels(values):
+    return [v.item() if isinstance(v, np.generic) else v for v in values]
+
+class ResultStore:
+    def __init__(self, path, header, mode='r'):
+        self.path = path
+        self.header = header
+        self.mode = mode
+        axes = header['axes']
+        self.entities = axes['entity']['labels']   # None: entities are addressed by position
+        self.dates = axes['month']['labels']
+        self.metrics = axes['metric']['labels']
+        self.units = header['units']
+        n, t, k = header['shape']
+        self._data = np.memmap(os.path.join(path, DATA), dtype=header['dtype'], mode=mode, shape=(k, n, t))
+        self.values = self._data.transpose(1, 2, 0)  # (entity x month x metric) view
+        self._positions = None
+
+    @classmethod
+    def create(cls, path, dates, metrics, entities=None, n_entities=None, entity_axis='entity',
+               dtype='float64', attrs=None):
+        """Allocate an empty store; pass `entities` labels or just `n_entities` (e.g. Monte Carlo paths)."""
+        if entities is not None:
+            entities = _labels(entities)
+            n_entities = len(entities)
+        if n_entities is None:
+            raise ValueError("ResultStore.create needs entities or n_entities")
+        metadata = _metadata()
+        config = metadata.get('result_store', {})
+        default_unit = config.get('default_unit', metadata.get('currency', 'currency'))
+        metric_units = config.get('metric_units', {})
+        header = {
+            'version': VERSION,
+            'shape': [int(n_entities), len(dates), len(metrics)],
+            'dtype': np.dtype(dtype).name,
+            'layout': 'metric-major',
+            'axes': {
+                'entity': {'name': entity_axis, 'size': int(n_entities), 'labels': entities},
+                'month': {'name': 'date', 'size': len(dates), 'labels': [str(d) for d in dates],
+                          'frequency': metadata.get('frequency', 'monthly')},
+                'metric': {'name': 'metric', 'size': len(metrics), 'labels': list(metrics)},
+            },
+            'units': {m: metric_units.get(m, default_unit) for m in metrics},
+            'currency': metadata.get('currency'),
+            'scale': metadata.get('units'),
+            'attrs': attrs or {},
+        }
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, HEADER), 'w') as f:
+            json.dump(header, f, indent=2)
+        size = int(np.prod(header['shape'])) * np.dtype(dtype).itemsize
+        with open(os.path.join(path, DATA), 'wb') as f:
+            f.truncate(size)  # sparse file; pages are only allocated as they are written
+        return cls(path, header, mode='r+')
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        with open(os.path.join(path, HEADER), 'r') as f:
+            header = json.load(f)
+        if header.get('version') != VERSION:
+            raise ValueError(f"Unsupported result store version {header.get('version')} in {path}")
+        return cls(path, header, mode=mode)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    def entity_index(self, key):
+        if self.entities is None:
+            return int(key)
+        if self._positions is None:
+            self._positions = {label: i for i, label in enumerate(self.entities)}
+        return self._positions[key]
+
+    def metric(self, name):
+        """(entity x month) view of one metric; contiguous on disk."""
+        return self._data[self.metrics.index(name)]
+
+    def entity(self, key):
+        """(month x metric) view of one entity."""
+        return self.values[self.entity_index(key)]
+
+    def block(self, start, stop):
+        """Writable (entity x month x metric) view of entities [start, stop), for engines to fill."""
+        return self.values[start:stop]
+
+    def metric_frame(self, name):
+        """One metric as an entity x date DataFrame over the mapped array."""
+        index = self.entities if self.entities is not None else pd.RangeIndex(len(self))
+        return pd.DataFrame(self.metric(name), index=index, columns=self.dates, copy=False)
+
+    def entity_frame(self, key):
+        df = pd.DataFrame(self.entity(key), columns=self.metrics)
+        df.insert(0, 'date', self.dates)
+        return df
+
+    def frame(self, entities=None, metrics=None):
+        """Long table (entity, date, metrics...) for a subset of entities and metrics."""
+        rows = np.arange(len(self)) if entities is None else np.array([self.entity_index(e) for e in entities])
+        metrics = list(metrics or self.metrics)
+        t = len(self.dates)
+        df = pd.DataFrame({m: self.metric(m)[rows].reshape(-1) for m in metrics})
+        labels = np.asarray(self.entities, dtype=object)[rows] if self.entities is not None else rows
+        df.insert(0, 'date', np.tile(self.dates, len(rows)))
+        df.insert(0, self.header['axes']['entity']['name'], np.repeat(labels, t))
+        return df
+
+    def cube(self):
+        """ForecastCube over the mapped values (no copy)."""
+        from forecast_engine import ForecastCube
+        entities = self.entities if self.entities is not None else range(len(self))
+        return ForecastCube(self.values, entities, self.dates, self.metrics)
+
+    def flush(self):
+        if self.mode != 'r':
+            self._data.flush()
@@ -1,14 +1,153 @@
-import pandas as pd
 import numpy as np
 import os
 import json
+from datetime import datetime
+
+from forecast_engine import batch_forecast, capex_vector
+# pandas (and precision, which needs it) is imported by the frame-building methods only, so
+# simulate_scenarios stays usable by the CLI's JSON output without paying for the pandas import
+
+def apply_scenario(drivers, params):
+    """Express one scenarios.json entry as perturbed drivers (same semantics as the Excel Engine sheet).
+
+    revenue_multiplier scales revenue, volume/price adjustments add to the monthly growth rates,
+    cogs_multiplier scales COGS %, opex_multiplier scales fixed and variable opex, and
+    capex_multiplier scales every capex schedule entry.
+    """
+    d = dict(drivers)
+    d['base_revenue_monthly'] = d.get('base_revenue_monthly', 0.0) * params.get('revenue_multiplier', 1.0)
+    d['volume_growth_monthly'] = d.get('volume_growth_monthly', 0.0) + params.get('volume_adjustment', 0.0)
+    d['price_growth_monthly'] = d.get('price_growth_monthly', 0.0) + params.get('price_adjustment', 0.0)
+    d['cogs_pct'] = d.get('cogs_pct', 0.0) * params.get('cogs_multiplier', 1.0)
+    opex_mult = params.get('opex_multiplier', 1.0)
+    d['fixed_opex_monthly'] = d.get('fixed_opex_monthly', 0.0) * opex_mult
+    d['opex_var_pct'] = d.get('opex_var_pct', 0.0) * opex_mult
+    capex_mult = params.get('capex_multiplier', 1.0)
+    d['capex_schedule'] = {ym: amount * capex_mult for ym, amount in d.get('capex_schedule', {}).items()}
+    return d
+
+def scenario_drivers(drivers, scenarios_config):
+    """Every scenario as one driver table (driver -> array, one entry per scenario) for batch_forecast.
+
+    Same perturbations as apply_scenario; the capex schedule is left out and the per-scenario capex
+    multipliers are returned alongside so the base schedule is only placed on the month axis once.
+    """
+    def knob(key, default):
+        return np.array([params.get(key, default) for params in scenarios_config.values()], dtype=float)
+
+    table = {k: v for k, v in drivers.items() if k != 'capex_schedule'}
+    table['base_revenue_monthly'] = drivers.get('base_revenue_monthly', 0.0) * knob('revenue_multiplier', 1.0)
+    table['volume_growth_monthly'] = drivers.get('volume_growth_monthly', 0.0) + knob('volume_adjustment', 0.0)
+    table['price_growth_monthly'] = drivers.get('price_growth_monthly', 0.0) + knob('price_adjustment', 0.0)
+    table['cogs_pct'] = drivers.get('cogs_pct', 0.0) * knob('cogs_multiplier', 1.0)
+    opex_mult = knob('opex_multiplier', 1.0)
+    table['fixed_opex_monthly'] = drivers.get('fixed_opex_monthly', 0.0) * opex_mult
+    table['opex_var_pct'] = drivers.get('opex_var_pct', 0.0) * opex_mult
+    return table, knob('capex_multiplier', 1.0)
+
+def simulate_scenarios(drivers, scenarios_config, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0,
+                       out=None):
+    """Re-run the driver forecast under every scenario in one batched pass (ForecastCube keyed by scenario).
+
+    Scenarios act on drivers, so working capital, tax, depreciation and the cash roll-forward all
+    respond to them instead of scaling an already-computed forecast.
+    """
+    table, capex_mult = scenario_drivers(drivers, scenarios_config)
+    base_capex = capex_vector(drivers.get('capex_schedule', {}), datetime.fromisoformat(start_date_str), months_horizon)
+    return batch_forecast(table, start_date_str, months_horizon, opening_cash,
+                          entities=list(scenarios_config), capex=capex_mult[:, None] * base_capex, out=out)
+
+# Forecast column -> scenarios.json multiplier that scales it
+SCENARIO_SCALING = {
+    'Revenue_Forecast': 'revenue_multiplier',
+    'COGS_Forecast': 'cost_multiplier',
+    'OpEx_Sales_Forecast': 'cost_multiplier',
+    'OpEx_Admin_Forecast': 'cost_multiplier',
+    'Capex_Forecast': 'cost_multiplier',  # Assuming Capex scales with cost scenarios
+}
+# Cash proxy columns, scaled only when the forecast carries them
+CASH_SCALING = {'Cash_In_Forecast': 'revenue_multiplier', 'Cash_Out_Forecast': 'cost_multiplier'}
+
+class ScenarioView:
+    """Every scenario of one base forecast, materialized on demand.
+
+    Multipliers are held as a (scenario x scaled column) matrix; adjusted columns for any set of
+    scenarios come from one broadcast multiply per output dtype into a preallocated
+    (column x scenario x month) block.
+    `view['Best']` builds a single scenario, `to_frame()` the full long-format table. With
+    precision='compact' the Scenario column is categorical and non-cash columns are float32.
+    """
+
+    def __init__(self, base_df, scenarios_config, precision='full'):
+        self.base = base_df
+        self.precision = precision
+        self.names = list(scenarios_config)
+        scaling = dict(SCENARIO_SCALING)
+        if 'Cash_In_Forecast' in base_df.columns:
+            scaling.update(CASH_SCALING)
+        self.scaled = list(scaling)
+        self.multipliers = np.array([[params.get(key, 1.0) for key in scaling.values()]
+                                     for params in scenarios_config.values()], dtype=float).reshape(len(self.names), -1)
+        self.base_values = base_df[self.scaled].to_numpy(dtype=float)
+        self.kept = [c for c in base_df.columns if c not in scaling and c not in ('Scenario', 'EBITDA_Forecast', 'CashFlow_Forecast')]
+        self.columns = list(base_df.columns) + [c for c in ('Scenario', 'EBITDA_Forecast', 'CashFlow_Forecast')
+                                                if c not in base_df.columns]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, name):
+        return self._frame(np.array([self.names.index(name)]))
+
+    def to_frame(self):
+        return self._frame(np.arange(len(self.names)))
+
+    def _frame(self, rows):
+        import pandas as pd
+        from precision import column_dtype
+
+        months = len(self.base)
+        # compact precision keeps the cash columns float64 and the rest float32
+        dtypes = [column_dtype(name, self.precision) for name in self.scaled]
+        blocks = {}
+        for dtype in dict.fromkeys(dtypes):
+            idx = [j for j, d in enumerate(dtypes) if d == dtype]
+            scaled = np.empty((len(idx), len(rows), months), dtype=dtype)
+            np.multiply(self.multipliers[rows][:, idx].T[:, :, None], self.base_values[:, idx].T[:, None, :], out=scaled)
+            blocks.update(zip([self.scaled[j] for j in idx], scaled))
+        cols = {name: blocks[name] for name in self.scaled}
+
+        # Unscaled columns are repeated once per scenario (dtypes kept), then the adjusted blocks are laid in
+        out = self.base[self.kept].iloc[np.tile(np.arange(months), len(rows))].reset_index(drop=True)
+        if self.precision == 'compact':
+            out['Scenario'] = pd.Categorical.from_codes(np.repeat(rows, months), categories=self.names)
+        else:
+            out['Scenario'] = np.repeat(np.array(self.names, dtype=object)[rows], months)
+        for name, block in cols.items():
+            out[name] = self._cast(name, block)
+        ebitda = (cols['Revenue_Forecast'].astype(np.float64) - cols['COGS_Forecast'] - cols['OpEx_Sales_Forecast']
+                  - cols['OpEx_Admin_Forecast'])
+        out['EBITDA_Forecast'] = self._cast('EBITDA_Forecast', ebitda)
+        if 'Cash_In_Forecast' in cols:
+            out['CashFlow_Forecast'] = self._cast('CashFlow_Forecast', cols['Cash_In_Forecast'] - cols['Cash_Out_Forecast'])
+        else:
+            out['CashFlow_Forecast'] = out['EBITDA_Forecast']  # Fallback
+        return out[self.columns]
+
+    def _cast(self, name, block):
+        from precision import column_dtype
+        return block.reshape(-1).astype(column_dtype(name, self.precision), copy=False)
 
 class ScenarioEngine:
-    def __init__(self, forecast_path):
+    def __init__(self, forecast_path, precision='full'):
+        import pandas as pd
+        from precision import compact_frame
+
         self.forecast_path = forecast_path
-        self.df = pd.read_csv(forecast_path)
+        self.precision = precision
+        self.df = compact_frame(pd.read_csv(forecast_path), precision)
         
-    def generate_scenarios(self):
+    def generate_scenarios(self, lazy=False):
         print("⚡ Generating Scenarios...")
         
         # Load Scenarios from JSON
@@ -16,85 +155,66 @@ class ScenarioEngine:
         with open(config_path, 'r') as f:
             scenarios_config = json.load(f)
             
-        all_scenarios = []
-        
-        for name, params in scenarios_config.items():
-            temp_df = self.df.copy()
-            temp_df['Scenario'] = name
-            
-            # Apply multipliers
-            rev_mult = params.get('revenue_multiplier', 1.0)
-            cost_mult = params.get('cost_multiplier', 1.0)
-            
-            temp_df['Revenue_Forecast'] *= rev_mult
-            
-            # Apply cost multiplier to COGS and OpEx
-            temp_df['COGS_Forecast'] *= cost_mult
-            temp_df['OpEx_Sales_Forecast'] *= cost_mult
-            temp_df['OpEx_Admin_Forecast'] *= cost_mult
-            temp_df['Capex_Forecast'] *= cost_mult # Assuming Capex scales with cost scenarios
-            
-            # Recalculate EBITDA
-            temp_df['EBITDA_Forecast'] = (
-                temp_df['Revenue_Forecast'] 
-                - temp_df['COGS_Forecast'] 
-                - temp_df['OpEx_Sales_Forecast'] 
-                - temp_df['OpEx_Admin_Forecast']
-            )
-            
-            # Recalculate Cash Flow (Proxy)
-            if 'Cash_In_Forecast' in temp_df.columns:
-                 # Adjust Cash In/Out roughly by multiplier logic
-                 temp_df['Cash_In_Forecast'] *= rev_mult
-                 temp_df['Cash_Out_Forecast'] *= cost_mult
-                 temp_df['CashFlow_Forecast'] = temp_df['Cash_In_Forecast'] - temp_df['Cash_Out_Forecast']
-            else:
-                 temp_df['CashFlow_Forecast'] = temp_df['EBITDA_Forecast'] # Fallback
-            
-            all_scenarios.append(temp_df)
-            
-        final_df = pd.concat(all_scenarios, ignore_index=True)
+        view = ScenarioView(self.df, scenarios_config, self.precision)
+        if lazy:
+            return view
+        final_df = view.to_frame()
         print(f"✅ Generated Scenarios: {len(final_df)} rows")
         return final_df
 
-    def run_sensitivity_analysis(self):
+    def generate_driver_scenarios(self, drivers=None, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0):
+        """Driver-level scenarios: every scenarios.json entry re-simulated through the forecast engine."""
+        from precision import compact_frame
+
+        print("⚡ Re-simulating Scenarios from drivers...")
+        config_dir = os.path.join(os.path.dirname(os.path.dirname(self.forecast_path)), 'config')
+        with open(os.path.join(config_dir, 'scenarios.json'), 'r') as f:
+            scenarios_config = json.load(f)
+        if drivers is None:
+            with open(os.path.join(config_dir, 'drivers.json'), 'r') as f:
+                drivers = json.load(f)
+                
+        cube = simulate_scenarios(drivers, scenarios_config, start_date_str, months_horizon, opening_cash)
+        final_df = compact_frame(cube.to_frame().rename(columns={'entity': 'Scenario'}), self.precision)
+        print(f"✅ Simulated Scenarios: {len(scenarios_config)} x {months_horizon} months")
+        return final_df
+
+    def run_sensitivity_analysis(self, drivers=None):
+        """One-way sweep of every sensitivity.json lever (see sensitivity.py), in the legacy
+        Dimension / Change / Annual_Revenue / Annual_EBITDA shape over this forecast's horizon."""
+        import pandas as pd
+        from precision import DATE_COLUMNS, compact_frame, to_dates
+        from sensitivity import SensitivityEngine
+
         print("〰️ Running Sensitivity Analysis...")
-        config_path = os.path.join(os.path.dirname(os.path.dirname(self.forecast_path)), 'config', 'sensitivity.json')
+        config_dir = os.path.join(os.path.dirname(os.path.dirname(self.forecast_path)), 'config')
+        config_path = os.path.join(config_dir, 'sensitivity.json')
         if not os.path.exists(config_path):
             print("No sensitivity config found.")
             return None
 
         with open(config_path, 'r') as f:
             sens_config = json.load(f)
-            
-        # Base case
-        base_df = self.df.copy()
-        base_annual_rev = base_df['Revenue_Forecast'].sum()
-        base_annual_ebitda = base_df['EBITDA_Forecast'].sum()
-        
-        results = []
-        
-        # Pricing Change (= Revenue Change)
-        for change in sens_config.get('pricing_change', []):
-            impact = 1 + change
-            rev = base_annual_rev * impact
-            # EBITDA changes by revenue delta (assuming costs fixed for pricing change logic, strictly margin expansion)
-            # Revenue_New - Costs_Base
-            costs = base_df['COGS_Forecast'].sum() + base_df['OpEx_Sales_Forecast'].sum() + base_df['OpEx_Admin_Forecast'].sum()
-            ebitda = rev - costs
-            results.append({'Dimension': 'Pricing', 'Change': change, 'Annual_Revenue': rev, 'Annual_EBITDA': ebitda})
-
-        # OpEx Change
-        for change in sens_config.get('opex_change', []):
-            impact = 1 + change
-            # Costs change
-            costs = (base_df['OpEx_Sales_Forecast'].sum() + base_df['OpEx_Admin_Forecast'].sum()) * impact + base_df['COGS_Forecast'].sum()
-            ebitda = base_annual_rev - costs
-            results.append({'Dimension': 'OpEx', 'Change': change, 'Annual_Revenue': base_annual_rev, 'Annual_EBITDA': ebitda})
-            
-        return pd.DataFrame(results)
+        if drivers is None:
+            with open(os.path.join(config_dir, 'drivers.json'), 'r') as f:
+                drivers = json.load(f)
+        date_col = next(c for c in DATE_COLUMNS if c in self.df.columns)
+        start = to_dates(self.df[date_col]).iloc[0].strftime('%Y-%m-%d')
+
+        engine = SensitivityEngine(drivers, sens_config, start, len(self.df))
+        one_way = engine.run(pairwise=False, factorial=False).one_way()
+        levers = sens_config.get('levers', sens_config)
+        results = pd.DataFrame({
+            'Dimension': [levers[lever].get('name', lever) for lever in one_way['lever']],
+            'Change': one_way['shift'],
+            'Annual_Revenue': one_way['revenue'],
+            'Annual_EBITDA': one_way['ebitda'],
+        })
+        return compact_frame(results, self.precision)
 
     def save_outputs(self, scenario_df, sensitivity_df, output_dir):
+        from precision import expand_dates
+
         # 1. Save Full Scenario Output
         # Clean columns to remove _Forecast suffix for cleaner final table
         clean_df = scenario_df.copy()
@@ -115,7 +235,7 @@ class ScenarioEngine:
         final_cols = [c for c in cols if c in clean_df.columns]
         
         scen_path = os.path.join(output_dir, 'scenario_output.csv')
-        clean_df[final_cols].to_csv(scen_path, index=False)
+        expand_dates(clean_df[final_cols]).to_csv(scen_path, index=False)
         print(f"💾 Scenario Output saved: {scen_path}")
         
         # 2. Save Sensitivity
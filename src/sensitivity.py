@@ -0,0 +1,219 @@
+"""
+Sensitivity engine over the levers declared in data/config/sensitivity.json.
+
+Lever shifts act on the drivers (not on a finished forecast), so every lever flows through the
+three-statement logic:
+
+    price        revenue level x (1 + s); unit costs unchanged, so COGS % is divided by (1 + s)
+    volume       revenue level x (1 + s); COGS follows revenue
+    cogs_pct     COGS % + s (percentage points)
+    hiring_rate  monthly hiring rate x (1 + s)
+    capex        every capex schedule entry x (1 + s)
+
+One-way sweeps, every pairwise 2-D grid and the full factorial grid are collected into one design
+matrix, deduplicated and evaluated in batched forecast calls.
+"""
+
+import itertools
+import os
+from datetime import datetime
+
+import numpy as np
+
+from forecast_engine import batch_forecast, capex_vector, load_json
+
+LEVERS = ('price', 'volume', 'cogs_pct', 'hiring_rate', 'capex')
+POINT_LEVERS = {'cogs_pct': 'cogs_pct'}  # shifts in driver units; elasticities use shift / base driver
+
+# Horizon summaries a lever can impact ('impact_on' in the config); revenue, ebitda and cash always reported
+SUMMARY_METRICS = {
+    'revenue': lambda c: c['revenue'].sum(axis=1),
+    'ebitda': lambda c: c['ebitda'].sum(axis=1),
+    'cash': lambda c: c['cash_balance'][:, -1],
+    'gross_margin': lambda c: 1 - c['cogs'].sum(axis=1) / c['revenue'].sum(axis=1),
+    'payroll': lambda c: c['payroll'].sum(axis=1),
+    'investing_cf': lambda c: c['investing_cf'].sum(axis=1),
+    'depreciation': lambda c: c['depreciation'].sum(axis=1),
+}
+DEFAULT_METRICS = ('revenue', 'ebitda', 'cash')
+
+# SensitivityEngine.evaluate is pure NumPy; pandas is only imported once results are tabulated
+
+class SensitivityResult:
+    def __init__(self, levers, ranges, metrics, shifts, values, point_bases):
+        import pandas as pd
+        self.levers = levers
+        self.ranges = ranges
+        self.metrics = metrics
+        self.point_bases = point_bases  # point lever -> base driver value (for elasticities)
+        table = pd.DataFrame(shifts, columns=levers)
+        for name in metrics:
+            table[name] = values[name]
+        self.points = table  # every evaluated design point (lever shifts + summaries)
+        self.base = self._lookup({})[metrics].iloc[0].to_dict()
+
+    def _lookup(self, fixed):
+        """Rows where the given levers take the given shifts and all other levers sit at 0."""
+        mask = np.ones(len(self.points), dtype=bool)
+        for lever in self.levers:
+            mask &= np.isclose(self.points[lever].to_numpy(), fixed.get(lever, 0.0))
+        return self.points[mask]
+
+    def one_way(self):
+        import pandas as pd
+        frames = []
+        for lever in self.levers:
+            for shift in self.ranges[lever]:
+                row = self._lookup({lever: shift})[self.metrics].iloc[:1]
+                frames.append(row.assign(lever=lever, shift=shift))
+        return pd.concat(frames, ignore_index=True)[['lever', 'shift'] + self.metrics]
+
+    def tornado(self, metric='ebitda'):
+        """Levers ranked by the swing between their lowest and highest shift."""
+        import pandas as pd
+        rows = []
+        for lever in self.levers:
+            low, high = min(self.ranges[lever]), max(self.ranges[lever])
+            low_value = self._lookup({lever: low})[metric].iloc[0]
+            high_value = self._lookup({lever: high})[metric].iloc[0]
+            rows.append({'lever': lever, 'low_shift': low, 'high_shift': high, 'low_value': low_value,
+                         'high_value': high_value, 'swing': abs(high_value - low_value)})
+        df = pd.DataFrame(rows).sort_values('swing', ascending=False, ignore_index=True)
+        df.insert(0, 'rank', np.arange(1, len(df) + 1))
+        df.insert(1, 'metric', metric)
+        return df
+
+    def elasticities(self):
+        """% change in each metric per 1% change in each lever, from the shifts either side of 0."""
+        import pandas as pd
+        rows = []
+        for lever in self.levers:
+            shifts = np.asarray(self.ranges[lever], dtype=float)
+            below, above = shifts[shifts < 0], shifts[shifts > 0]
+            lo = below.max() if len(below) else 0.0
+            hi = above.min() if len(above) else 0.0
+            if hi == lo:
+                continue
+            span = hi - lo
+            if lever in self.point_bases:
+                span = span / self.point_bases[lever]
+            row = {'lever': lever}
+            for metric in self.metrics:
+                delta = self._lookup({lever: hi})[metric].iloc[0] - self._lookup({lever: lo})[metric].iloc[0]
+                row[metric] = delta / self.base[metric] / span if self.base[metric] else np.nan
+            rows.append(row)
+        return pd.DataFrame(rows, columns=['lever'] + self.metrics)
+
+    def grid(self, lever_a, lever_b, metric='ebitda'):
+        """2-D table: `lever_a` shifts down the rows, `lever_b` shifts across the columns."""
+        import pandas as pd
+        rows = [self._lookup({lever_a: a, lever_b: b})[metric].iloc[0]
+                for a in self.ranges[lever_a] for b in self.ranges[lever_b]]
+        return pd.DataFrame(np.reshape(rows, (len(self.ranges[lever_a]), len(self.ranges[lever_b]))),
+                            index=pd.Index(self.ranges[lever_a], name=lever_a),
+                            columns=pd.Index(self.ranges[lever_b], name=lever_b))
+
+    def factorial(self):
+        full = self.points
+        for lever in self.levers:
+            full = full[full[lever].isin(self.ranges[lever])]
+        return full.reset_index(drop=True)
+
+class SensitivityEngine:
+    def __init__(self, drivers, config, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0,
+                 chunk_size=4096):
+        self.drivers = drivers
+        levers = config.get('levers', config)
+        unknown = sorted(set(levers) - set(LEVERS))
+        if unknown:
+            raise ValueError(f"Unknown sensitivity lever(s): {', '.join(unknown)} (expected {LEVERS})")
+        self.levers = [lever for lever in LEVERS if lever in levers]
+        self.ranges = {lever: [float(s) for s in levers[lever]['range']] for lever in self.levers}
+        declared = {m for lever in self.levers for m in levers[lever].get('impact_on', ()) if m in SUMMARY_METRICS}
+        self.metrics = list(DEFAULT_METRICS) + sorted(declared - set(DEFAULT_METRICS))
+        self.start_date_str = start_date_str
+        self.months = months_horizon
+        self.opening_cash = opening_cash
+        self.chunk_size = chunk_size
+        self.base_capex = capex_vector(drivers.get('capex_schedule', {}), datetime.fromisoformat(start_date_str),
+                                       months_horizon)
+
+    def driver_table(self, shifts):
+        """Driver arrays (one entry per design point) for an (points x levers) shift matrix."""
+        s = {lever: shifts[:, i] for i, lever in enumerate(self.levers)}
+        zero = np.zeros(len(shifts))
+        price, volume = s.get('price', zero), s.get('volume', zero)
+        d = self.drivers
+        table = {k: v for k, v in d.items() if k != 'capex_schedule'}
+        table['base_revenue_monthly'] = d.get('base_revenue_monthly', 0.0) * (1 + price) * (1 + volume)
+        table['cogs_pct'] = (d.get('cogs_pct', 0.0) + s.get('cogs_pct', zero)) / (1 + price)
+        table['hiring_rate_monthly'] = d.get('hiring_rate_monthly', 0) * (1 + s.get('hiring_rate', zero))
+        capex = (1 + s.get('capex', zero))[:, None] * self.base_capex
+        return table, capex
+
+    def evaluate(self, shifts):
+        """Summary metrics for every row of an (points x levers) shift matrix, in chunks."""
+        shifts = np.atleast_2d(np.asarray(shifts, dtype=float))
+        out = {name: np.empty(len(shifts)) for name in self.metrics}
+        for start in range(0, len(shifts), self.chunk_size):
+            block = shifts[start:start + self.chunk_size]
+            table, capex = self.driver_table(block)
+            cube = batch_forecast(table, self.start_date_str, self.months, self.opening_cash, capex=capex)
+            columns = {name: cube.metric(name) for name in cube.metrics}
+            for name in self.metrics:
+                out[name][start:start + len(block)] = SUMMARY_METRICS[name](columns)
+        return out
+
+    def design(self, pairwise=True, factorial=True):
+        """Baseline, one-way, pairwise and (optionally) full factorial points, deduplicated."""
+        k = len(self.levers)
+        points = [np.zeros((1, k))]
+        for i, lever in enumerate(self.levers):
+            block = np.zeros((len(self.ranges[lever]), k))
+            block[:, i] = self.ranges[lever]
+            points.append(block)
+        if pairwise:
+            for i, j in itertools.combinations(range(k), 2):
+                grid = np.array(list(itertools.product(self.ranges[self.levers[i]], self.ranges[self.levers[j]])))
+                block = np.zeros((len(grid), k))
+                block[:, [i, j]] = grid
+                points.append(block)
+        if factorial:
+            points.append(np.array(list(itertools.product(*(self.ranges[lever] for lever in self.levers)))))
+        return np.unique(np.vstack(points), axis=0)
+
+    def run(self, pairwise=True, factorial=True):
+        shifts = self.design(pairwise, factorial)
+        point_bases = {lever: self.drivers.get(driver, 0.0) for lever, driver in POINT_LEVERS.items()
+                       if lever in self.levers and self.drivers.get(driver)}
+        return SensitivityResult(self.levers, self.ranges, self.metrics, shifts, self.evaluate(shifts), point_bases)
+
+def save_tables(result, out_dir):
+    """Tornado (every metric), elasticity and factorial tables as CSVs in `out_dir`."""
+    import pandas as pd
+
+    os.makedirs(out_dir, exist_ok=True)
+    pd.concat([result.tornado(m) for m in result.metrics], ignore_index=True).to_csv(
+        os.path.join(out_dir, 'sensitivity_tornado.csv'), index=False)
+    result.elasticities().to_csv(os.path.join(out_dir, 'sensitivity_elasticities.csv'), index=False)
+    result.factorial().to_csv(os.path.join(out_dir, 'sensitivity_factorial.csv'), index=False)
+    return out_dir
+
+if __name__ == '__main__':
+    import time
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    drivers = load_json(os.path.join(base_dir, 'data', 'config', 'drivers.json'))
+    config = load_json(os.path.join(base_dir, 'data', 'config', 'sensitivity.json'))
+    engine = SensitivityEngine(drivers, config)
+    started = time.perf_counter()
+    result = engine.run()
+    print(f"〰️ Evaluated {len(result.points)} sensitivity points in {time.perf_counter() - started:.3f}s")
+    for metric in DEFAULT_METRICS:
+        print(f"\nTornado ({metric}):")
+        print(result.tornado(metric)[['rank', 'lever', 'low_value', 'high_value', 'swing']].to_string(index=False))
+    print("\nElasticities (% metric change per 1% lever change):")
+    print(result.elasticities().to_string(index=False))
+
+    out_dir = save_tables(result, os.path.join(base_dir, 'data', 'processed'))
+    print(f"💾 Sensitivity tables saved to {out_dir}")
@@ -0,0 +1,118 @@
+"""
+Load test for the forecast service on localhost.
+
+Opens `--concurrency` keep-alive connections and fires `--requests` POST /forecast calls. A share of
+the requests (`--unique-ratio`) carry fresh random driver overrides (cache misses that exercise
+request batching); the rest repeat a small pool of overrides (cache hits). Reports throughput and
+latency percentiles.
+
+    python src/service_load_test.py --spawn                 # start an in-process service on a free port
+    python src/service_load_test.py --port 8765             # hit an already running service
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def _client(host, port, payloads, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for payload in payloads:
+            started = time.perf_counter()
+            status, _ = await _request(reader, writer, 'POST', '/forecast', payload)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def make_payloads(n, unique_ratio, months, seed=0):
+    rng = random.Random(seed)
+    pool = [{'drivers': {'cogs_pct': 0.35 + 0.01 * i}, 'months_horizon': months} for i in range(8)]
+    payloads = []
+    for _ in range(n):
+        if rng.random() < unique_ratio:
+            payloads.append({'drivers': {'cogs_pct': rng.uniform(0.3, 0.5), 'dso': rng.uniform(30, 60)},
+                             'months_horizon': months})
+        else:
+            payloads.append(rng.choice(pool))
+    return payloads
+
+async def run_load_test(host, port, requests, concurrency, unique_ratio, months):
+    payloads = make_payloads(requests, unique_ratio, months)
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, payloads[i::concurrency], latencies, errors)
+                           for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await _request(reader, writer, 'GET', '/health')
+    writer.close()
+    await writer.wait_closed()
+
+    ms = np.array(latencies) * 1000
+    print(f"📈 {len(latencies):,} requests in {wall:.2f}s over {concurrency} connections "
+          f"({unique_ratio:.0%} unique driver sets, {months}-month horizon)")
+    print(f"   throughput : {len(latencies) / wall:,.0f} req/s")
+    print(f"   latency ms : p50 {np.percentile(ms, 50):.2f} | p95 {np.percentile(ms, 95):.2f} | "
+          f"p99 {np.percentile(ms, 99):.2f} | max {ms.max():.2f}")
+    print(f"   errors     : {len(errors)}")
+    print(f"   service    : {health.decode()}")
+    return {'requests': len(latencies), 'wall_s': wall, 'throughput_rps': len(latencies) / wall,
+            'p50_ms': float(np.percentile(ms, 50)), 'p99_ms': float(np.percentile(ms, 99)), 'errors': len(errors)}
+
+async def _spawn_and_run(args):
+    from forecast_service import ForecastService
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    service = ForecastService(os.path.join(base_dir, 'data', 'config', 'drivers.json'),
+                              os.path.join(base_dir, 'data', 'config', 'scenarios.json'))
+    ready = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(service.serve(args.host, 0, ready=ready))
+    server = await ready
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await run_load_test(args.host, port, args.requests, args.concurrency, args.unique_ratio, args.months)
+    finally:
+        server.close()
+        await asyncio.sleep(0)  # let handlers observe the closed client sockets
+        task.cancel()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-test the forecast service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--spawn', action='store_true', help="start the service in this process on a free port")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--unique-ratio', type=float, default=0.2)
+    parser.add_argument('--months', type=int, default=36)
+    args = parser.parse_args()
+
+    if args.spawn:
+        asyncio.run(_spawn_and_run(args))
+    else:
+        asyncio.run(run_load_test(args.host, args.port, args.requests, args.concurrency, args.unique_ratio, args.months))
@@ -0,0 +1,158 @@
+"""
+Content-addressed cache for pipeline stage artifacts.
+
+A stage's fingerprint hashes its code (the sources of every src/ module its function imports,
+followed transitively), its input files (config JSON etc.), the
+artifacts written by its direct upstream stages and any parameters. When a fingerprint is already in
+the store the cached artifacts are copied back into place (only if the on-disk copy differs) and the
+stage is skipped. The store is bounded by size; least-recently-used entries are evicted first.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import textwrap
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _local_imports(tree):
+    """src/ modules (as file names) imported anywhere in `tree`, function-level imports included."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split('.')[0])
+    return {name + '.py' for name in names if os.path.exists(os.path.join(SRC_DIR, name + '.py'))}
+
+def _function_imports(func, seen):
+    # Imports in the function's own source plus those of the same-module helpers it calls
+    if func in seen:
+        return set()
+    seen.add(func)
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return set()
+    modules = _local_imports(tree)
+    for node in ast.walk(tree):
+        helper = func.__globals__.get(node.id) if isinstance(node, ast.Name) else None
+        if inspect.isfunction(helper) and helper.__module__ == func.__module__:
+            modules |= _function_imports(helper, seen)
+    return modules
+
+def stage_modules(stage):
+    """Every src/ module a stage's code can reach: what its function and loader import, plus
+    `stage.code`, closed over the imports of those modules."""
+    seen = set()
+    pending = set(stage.code)
+    for func in (stage.func, stage.load):
+        if func is not None:
+            pending |= _function_imports(func, seen)
+    modules = set()
+    while pending:
+        module = pending.pop()
+        if module in modules:
+            continue
+        modules.add(module)
+        path = os.path.join(SRC_DIR, module)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                pending |= _local_imports(ast.parse(f.read()))
+    return tuple(sorted(modules))
+
+class StageCache:
+    def __init__(self, root, max_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self._digests = {}  # (path, mtime_ns, size) -> sha256, valid for this process
+        self.manifest = {'entries': {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+    def file_digest(self, path):
+        if not os.path.exists(path):
+            return 'missing'
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key not in self._digests:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    h.update(block)
+            self._digests[key] = h.hexdigest()
+        return self._digests[key]
+
+    def fingerprint(self, stage, ctx, upstream_files=(), params=None):
+        h = hashlib.sha256()
+        h.update(stage.name.encode())
+        for module in ('pipeline.py',) + tuple(m for m in stage_modules(stage) if m != 'pipeline.py'):
+            h.update(self.file_digest(os.path.join(SRC_DIR, module)).encode())
+        for key in stage.inputs:
+            h.update(f'{key}={self.file_digest(ctx[key])}'.encode())
+        for key in stage.artifacts:
+            # Where (and so in which format) the stage writes is part of its identity
+            h.update(f'{key}->{os.path.basename(ctx[key])}'.encode())
+        for path in upstream_files:
+            h.update(self.file_digest(path).encode())
+        h.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def restore(self, fingerprint, stage, ctx):
+        """Put a cached stage's artifacts back in place; False on a miss."""
+        entry = self.manifest['entries'].get(fingerprint)
+        if entry is None:
+            return False
+        folder = os.path.join(self.root, 'objects', fingerprint)
+        for key, item in entry['artifacts'].items():
+            cached = os.path.join(folder, item['file'])
+            if not os.path.exists(cached):
+                return False
+            target = ctx[key]
+            if self.file_digest(target) != item['sha256']:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(cached, target)
+        entry['last_used'] = time.time()
+        self._save()
+        return True
+
+    def store(self, fingerprint, stage, ctx):
+        folder = os.path.join(self.root, 'objects', fingerprint)
+        os.makedirs(folder, exist_ok=True)
+        artifacts, size = {}, 0
+        for key in stage.artifacts:
+            path = ctx[key]
+            if not os.path.exists(path):
+                continue
+            name = f'{key}__{os.path.basename(path)}'
+            shutil.copy2(path, os.path.join(folder, name))
+            artifacts[key] = {'file': name, 'sha256': self.file_digest(path)}
+            size += os.path.getsize(path)
+        self.manifest['entries'][fingerprint] = {
+            'stage': stage.name, 'artifacts': artifacts, 'size': size, 'last_used': time.time(),
+        }
+        self._evict()
+        self._save()
+
+    def _evict(self):
+        entries = self.manifest['entries']
+        total = sum(e['size'] for e in entries.values())
+        for fingerprint, entry in sorted(entries.items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.root, 'objects', fingerprint), ignore_errors=True)
+            total -= entry['size']
+            del entries[fingerprint]
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
@@ -0,0 +1,102 @@
+"""
+Startup cost of every CLI subcommand, measured with `python -X importtime`.
+
+Each case runs `src/cli.py <subcommand>` in a fresh interpreter (outputs go to a temp directory) and
+reports the total self-time of every import, the heaviest top-level imports, the wall time of the
+whole process and whether pandas was loaded.
+
+    python src/startup_benchmark.py
+    python src/startup_benchmark.py --repeat 5 --top 5
+
+`all` is left out: it rewrites the project's data/ and outputs/ artifacts.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(BASE_DIR, 'src', 'cli.py')
+
+# name -> argv after `cli.py` ({tmp} is the temp directory); None times a bare interpreter
+CASES = {
+    'python': None,
+    'forecast --json': ['forecast', '--json', '--output', '{tmp}/forecast.json'],
+    'forecast': ['forecast', '--output', '{tmp}/forecast.csv'],
+    'scenarios --json': ['scenarios', '--json', '--output', '{tmp}/scenarios.json'],
+    'scenarios': ['scenarios'],
+    'sensitivity --json': ['sensitivity', '--json', '--output', '{tmp}/sensitivity.json'],
+    'sensitivity': ['sensitivity', '--output', '{tmp}'],
+    'export': ['export', '--output', '{tmp}/model.xlsx'],
+    'insights': ['insights', '--output', '{tmp}/insights.txt'],
+}
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+def parse_importtime(stderr):
+    """(module, self_us, cumulative_us, depth) for every `-X importtime` line."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+def measure(argv, tmp):
+    """One run: wall seconds plus the parsed import table."""
+    command = [sys.executable, '-X', 'importtime']
+    command += ['-c', 'pass'] if argv is None else [CLI] + [a.format(tmp=tmp) for a in argv]
+    started = time.perf_counter()
+    proc = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed:\n{proc.stderr[-2000:]}")
+    return wall, parse_importtime(proc.stderr)
+
+def run_cases(names=None, repeat=3, top=3):
+    """Median import total / wall time per case (imports from the fastest run)."""
+    results = {}
+    for name, argv in CASES.items():
+        if names and name not in names:
+            continue
+        tmp = tempfile.mkdtemp(prefix='startup_')
+        try:
+            runs = [measure(argv, tmp) for _ in range(repeat)]
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        totals = [sum(r[1] for r in rows) / 1e3 for _, rows in runs]
+        rows = min(runs, key=lambda run: run[0])[1]
+        heaviest = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)[:top]
+        results[name] = {
+            'import_ms': statistics.median(totals),
+            'wall_ms': statistics.median(wall for wall, _ in runs) * 1e3,
+            'modules': len(rows),
+            'pandas': any(r[0] == 'pandas' for r in rows),
+            'heaviest': [(module, cumulative / 1e3) for module, _, cumulative, _ in heaviest],
+        }
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-subcommand CLI startup cost (-X importtime).")
+    parser.add_argument('cases', nargs='*', help=f"subset of: {', '.join(CASES)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=3, help="heaviest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    print("⏱  CLI startup (-X importtime, median of %d runs)" % args.repeat)
+    print(f"  {'subcommand':<20} {'imports ms':>10} {'wall ms':>9} {'modules':>8} {'pandas':>7}  heaviest imports")
+    for name, r in run_cases(args.cases, args.repeat, args.top).items():
+        heaviest = ', '.join(f'{module} {ms:.0f}' for module, ms in r['heaviest'])
+        print(f"  {name:<20} {r['import_ms']:>10.1f} {r['wall_ms']:>9.1f} {r['modules']:>8} "
+              f"{'yes' if r['pandas'] else 'no':>7}  {heaviest}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
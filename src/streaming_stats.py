@@ -0,0 +1,108 @@
+import numpy as np
+
+class StreamingAggregator:
+    """Bounded-memory running statistics over a stream of path chunks.
+
+    Every chunk has shape (paths, *cell_shape), e.g. (paths x months x metrics). For each cell the
+    aggregator keeps count, mean, M2 (for variance), min, max and a t-digest style sketch of at most
+    `compression` centroids, so memory is independent of the number of paths seen. Two aggregators
+    over the same cell shape can be merged, which is how worker partials are combined.
+    """
+
+    def __init__(self, cell_shape, compression=100):
+        self.cell_shape = tuple(cell_shape)
+        self.compression = compression
+        cells = int(np.prod(self.cell_shape))
+        self.count = 0
+        self.mean = np.zeros(cells)
+        self.m2 = np.zeros(cells)
+        self.min = np.full(cells, np.inf)
+        self.max = np.full(cells, -np.inf)
+        self.centroids = np.zeros((cells, 0))  # laid out cells x centroids so sorts run on contiguous rows
+        self.weights = np.zeros((cells, 0))
+
+    def _combine_moments(self, count, mean, m2):
+        # Chan et al. pairwise update
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def _compress(self, values, weights):
+        """Collapse weighted points (cells x points) into at most `compression` centroids per cell.
+
+        Points are sorted per cell and bucketed on the arcsine scale of their cumulative weight,
+        which keeps buckets small in the tails where the interesting percentiles live.
+        """
+        order = np.argsort(values, axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+        weights = np.take_along_axis(weights, order, axis=1)
+        cum = np.cumsum(weights, axis=1)
+        q = (cum - weights / 2) / cum[:, -1:]
+        bucket = np.minimum((np.arcsin(2 * q - 1) / np.pi + 0.5) * self.compression, self.compression - 1).astype(np.int64)
+        cells = values.shape[0]
+        flat = (bucket + self.compression * np.arange(cells)[:, None]).ravel()
+        size = self.compression * cells
+        new_weights = np.bincount(flat, weights=weights.ravel(), minlength=size).reshape(cells, self.compression)
+        sums = np.bincount(flat, weights=(weights * values).ravel(), minlength=size).reshape(cells, self.compression)
+        self.centroids = np.divide(sums, new_weights, out=np.zeros_like(sums), where=new_weights > 0)
+        self.weights = new_weights
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float).reshape(len(chunk), -1)
+        if len(chunk) == 0:
+            return self
+        mean = chunk.mean(axis=0)
+        self._combine_moments(len(chunk), mean, ((chunk - mean) ** 2).sum(axis=0))
+        self.min = np.minimum(self.min, chunk.min(axis=0))
+        self.max = np.maximum(self.max, chunk.max(axis=0))
+        self._compress(np.concatenate((self.centroids, chunk.T), axis=1),
+                       np.concatenate((self.weights, np.ones((chunk.shape[1], len(chunk)))), axis=1))
+        return self
+
+    def merge(self, other):
+        if other.cell_shape != self.cell_shape:
+            raise ValueError(f"Cannot merge aggregators over {other.cell_shape} and {self.cell_shape}")
+        if other.count == 0:
+            return self
+        self._combine_moments(other.count, other.mean, other.m2)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self._compress(np.concatenate((self.centroids, other.centroids), axis=1),
+                       np.concatenate((self.weights, other.weights), axis=1))
+        return self
+
+    def variance(self, ddof=1):
+        return (self.m2 / max(self.count - ddof, 1)).reshape(self.cell_shape)
+
+    def quantile(self, q):
+        """Approximate quantiles (q in [0, 1], scalar or list) by interpolating between centroid midpoints."""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        # Empty centroids (weight 0) are moved behind the populated ones; bucket order keeps means sorted
+        order = np.argsort(self.weights == 0, axis=1, kind='stable')
+        weights = np.take_along_axis(self.weights, order, axis=1)
+        means = np.take_along_axis(self.centroids, order, axis=1)
+        cum = np.cumsum(weights, axis=1)
+        total = cum[:, -1:]
+        x = np.hstack((np.zeros_like(total), np.where(weights > 0, cum - weights / 2, total), total))
+        y = np.hstack((self.min[:, None], np.where(weights > 0, means, self.max[:, None]), self.max[:, None]))
+
+        out = np.empty((len(q), x.shape[0]))
+        for i, target in enumerate(q[:, None, None] * total[None]):
+            upper = np.clip((x <= target).sum(axis=1, keepdims=True), 1, x.shape[1] - 1)
+            x0, x1 = np.take_along_axis(x, upper - 1, axis=1), np.take_along_axis(x, upper, axis=1)
+            y0, y1 = np.take_along_axis(y, upper - 1, axis=1), np.take_along_axis(y, upper, axis=1)
+            span = x1 - x0
+            frac = np.divide(target - x0, span, out=np.zeros_like(span), where=span > 0)
+            out[i] = (y0 + np.clip(frac, 0, 1) * (y1 - y0))[:, 0]
+        return out.reshape((len(q),) + self.cell_shape)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.mean.reshape(self.cell_shape),
+            'std': np.sqrt(self.variance()),
+            'min': self.min.reshape(self.cell_shape),
+            'max': self.max.reshape(self.cell_shape),
+        }
@@ -0,0 +1,58 @@
+"""
+Incremental what-if evaluation.
+
+A WhatIfSession holds one driver set and its evaluated forecast columns. Overriding drivers only
+recomputes the columns downstream of them in the forecast column graph (e.g. `dpo` touches ap, wc,
+delta_wc, operating_cf and cash_balance); every other column is reused from the previous state.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from forecast_engine import (FORECAST_COLUMNS, affected_columns, capex_vector, evaluate_columns,
+                             month_axis, month_labels, stack_drivers)
+
+class WhatIfSession:
+    def __init__(self, drivers, start_date_str='2025-01-01', months_horizon=36, opening_cash=500000.0):
+        self.start_date = datetime.fromisoformat(start_date_str)
+        self.months = months_horizon
+        self.opening_cash = opening_cash
+        self.m, years, self.month_of_year = month_axis(self.start_date, months_horizon)
+        self.dates = month_labels(years, self.month_of_year)
+        self.drivers = dict(drivers)
+        self.params = self._stack()
+        self.columns = evaluate_columns(self.params, self.month_of_year, self.m)
+        self.recomputed = list(self.columns)
+
+    def _stack(self, keys=None):
+        """Driver columns for the current driver set; the capex schedule is only re-placed when asked for."""
+        params, seasonality, schedules = stack_drivers([self.drivers], self.opening_cash)
+        params['seasonality'] = seasonality
+        if keys is None or 'capex_schedule' in keys:
+            params['capex_schedule'] = capex_vector(schedules[0], self.start_date, self.months).reshape(1, -1)
+        else:
+            params['capex_schedule'] = self.params['capex_schedule']
+        return params
+
+    def update(self, overrides):
+        """Apply driver overrides and recompute the affected columns; returns their names."""
+        changed = {k for k, v in overrides.items() if k not in self.drivers or self.drivers[k] != v}
+        self.drivers.update(overrides)
+        self.recomputed = affected_columns(changed)
+        if self.recomputed:
+            self.params = self._stack(changed)
+            self.columns = evaluate_columns(self.params, self.month_of_year, self.m,
+                                            columns=self.columns, only=set(self.recomputed))
+        return self.recomputed
+
+    def set(self, **overrides):
+        return self.update(overrides)
+
+    def column(self, name):
+        return self.columns[name][0]
+
+    def frame(self):
+        columns = {k: v[0] for k, v in self.columns.items()}
+        columns['date'] = self.dates
+        return pd.DataFrame(columns, columns=FORECAST_COLUMNS)
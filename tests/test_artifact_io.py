@@ -0,0 +1,80 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from artifact_io import MANIFEST, ChunkedWriter, read_artifact, write_artifact
+
+pytest.importorskip('pyarrow')
+
+
+def _frame():
+    rows = []
+    for scenario in ['Base', 'Best', 'Worst']:
+        for month in range(1, 13):
+            rows.append({'Scenario': scenario, 'Date': f'2025-{month:02d}-01', 'Revenue': 1000.0 * month + 0.125,
+                         'Headcount': month})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'feather'])
+def test_round_trip(tmp_path, fmt):
+    df = _frame()
+    path = write_artifact(df, str(tmp_path / 'forecast.csv'), fmt=fmt)
+    assert path.endswith('.' + fmt)
+    out = read_artifact(path)
+    pd.testing.assert_frame_equal(out.astype({'Scenario': object}), df, check_dtype=False)
+    if fmt != 'csv':
+        assert isinstance(out['Scenario'].dtype, pd.CategoricalDtype)
+        assert out['Revenue'].dtype == np.float64
+
+
+def test_float32_downcast(tmp_path):
+    path = write_artifact(_frame(), str(tmp_path / 'forecast.parquet'), float_dtype='float32')
+    out = read_artifact(path, columns=['Revenue', 'Headcount'])
+    assert list(out.columns) == ['Revenue', 'Headcount']
+    assert out['Revenue'].dtype == np.float32
+    assert out['Headcount'].dtype == np.int64
+
+
+def test_partitioned_read_subset_keeps_order(tmp_path):
+    df = _frame()
+    path = write_artifact(df, str(tmp_path / 'scenarios.parquet'), partition_by='Scenario', csv_export=True)
+    assert sorted(os.listdir(path)) == sorted([MANIFEST, 'Scenario=Base.parquet', 'Scenario=Best.parquet',
+                                               'Scenario=Worst.parquet'])
+    assert os.path.exists(str(tmp_path / 'scenarios.csv'))
+
+    full = read_artifact(path)
+    assert list(full['Scenario'].cat.categories) == ['Base', 'Best', 'Worst']
+    pd.testing.assert_frame_equal(full.astype({'Scenario': object}), df, check_dtype=False)
+
+    subset = read_artifact(path, partitions=['Worst', 'Base'])
+    assert list(subset['Scenario'].unique()) == ['Base', 'Worst']
+    assert len(subset) == 24
+
+
+def test_unknown_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_artifact(_frame(), str(tmp_path / 'forecast.csv'), fmt='xlsx')
+    with pytest.raises(ValueError):
+        read_artifact(str(tmp_path / 'forecast.txt'))
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'feather'])
+def test_chunked_writer_matches_single_write(tmp_path, fmt):
+    df = _frame()
+    with ChunkedWriter(str(tmp_path / 'chunked.csv'), fmt) as writer:
+        for start in range(0, len(df), 10):
+            writer.write(df.iloc[start:start + 10])
+    assert (writer.rows, writer.chunks) == (36, 4)
+    whole = write_artifact(df, str(tmp_path / 'whole.csv'), fmt=fmt)
+    if fmt == 'csv':
+        with open(writer.path, 'rb') as a, open(whole, 'rb') as b:
+            assert a.read() == b.read()
+    pd.testing.assert_frame_equal(read_artifact(writer.path).astype({'Scenario': object}),
+                                  read_artifact(whole).astype({'Scenario': object}))
@@ -0,0 +1,52 @@
+import copy
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from benchmark_suite import BENCHMARKS, compare, main, run_suite, save_results
+
+
+def test_run_stores_stats_and_machine_info(tmp_path):
+    document = run_suite(pattern=r'^(forecast\.driver_forecast\[36\]|history\.generate_financials\[5\])$',
+                         rounds=2, min_time=0.0)
+    assert set(document['results']) == {'forecast.driver_forecast[36]', 'history.generate_financials[5]'}
+    stats = document['results']['forecast.driver_forecast[36]']
+    assert 0 < stats['min'] <= stats['median'] and stats['rounds'] == 2 and stats['size'] == 36
+    assert document['machine']['python'] and document['machine']['cpu_count']
+
+    path = save_results(document, str(tmp_path / 'run.json'))
+    with open(path) as f:
+        assert json.load(f)['results'].keys() == document['results'].keys()
+
+
+def test_every_stage_is_covered():
+    stages = {name.split('.')[0] for name in BENCHMARKS}
+    assert stages == {'forecast', 'scenarios', 'export', 'insights', 'history'}
+    assert all(len(sizes) >= 2 for sizes, _ in BENCHMARKS.values())
+
+
+def _document(timings):
+    return {'version': 1, 'machine': {'hostname': 'h'},
+            'results': {k: {'min': v, 'median': v, 'mean': v} for k, v in timings.items()}}
+
+
+def test_compare_flags_regressions_above_threshold(tmp_path):
+    baseline = _document({'a[1]': 1.0, 'b[1]': 1.0, 'c[1]': 1.0, 'gone[1]': 1.0})
+    candidate = copy.deepcopy(baseline)
+    candidate['results'].pop('gone[1]')
+    candidate['results']['a[1]'] = {'min': 1.25, 'median': 1.25, 'mean': 1.25}
+    candidate['results']['b[1]'] = {'min': 1.05, 'median': 1.05, 'mean': 1.05}
+    candidate['results']['c[1]'] = {'min': 0.5, 'median': 0.5, 'mean': 0.5}
+    status = compare(baseline, candidate, threshold=0.10).set_index('benchmark')['status'].to_dict()
+    assert status == {'a[1]': 'regression', 'b[1]': 'ok', 'c[1]': 'improved', 'gone[1]': 'removed'}
+
+    paths = []
+    for name, doc in (('old', baseline), ('new', candidate)):
+        paths.append(str(tmp_path / f'{name}.json'))
+        with open(paths[-1], 'w') as f:
+            json.dump(doc, f)
+    assert main(['compare', *paths, '--threshold', '0.10']) == 1
+    assert main(['compare', *paths, '--threshold', '0.30']) == 0
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import ForecastState, batch_forecast, driver_forecast, load_json, resume_forecast
+
+DRIVERS_PATH = os.path.join(BASE_DIR, 'data', 'config', 'drivers.json')
+
+
+def _variants():
+    base = load_json(DRIVERS_PATH)
+    variants = []
+    for i in range(3):
+        d = dict(base)
+        d['hiring_rate_monthly'] = 0.3 * i
+        d['useful_life_months'] = 18 + 6 * i
+        if i == 2:
+            d['depreciation_method'] = 'declining_balance'
+        variants.append(d)
+    return variants
+
+
+@pytest.mark.parametrize('step', [1, 5, 13])
+def test_rolling_resume_is_bit_identical(tmp_path, step):
+    variants = _variants()
+    full = batch_forecast(variants, '2025-01-01', 48)
+    cube = batch_forecast(variants, '2025-01-01', step)
+    blocks, done = [cube.values], step
+    while done < 48:
+        path = cube.state.save(str(tmp_path / 'state.npz'))
+        months = min(step, 48 - done)
+        cube = resume_forecast(variants, ForecastState.load(path), months)
+        blocks.append(cube.values)
+        done += months
+    assert np.array_equal(np.concatenate(blocks, axis=1), full.values)
+    assert cube.dates == full.dates[-len(cube.dates):]
+    assert cube.state.month == 48
+
+
+def test_driver_forecast_checkpoint_and_resume(tmp_path):
+    drivers = load_json(DRIVERS_PATH)
+    state = str(tmp_path / 'state.npz')
+    paths = [str(tmp_path / name) for name in ('a.csv', 'b.csv', 'full.csv')]
+    driver_forecast('2025-01-01', 24, drivers=drivers, output_path=paths[0], checkpoint_path=state)
+    driver_forecast('2025-01-01', 12, drivers=drivers, output_path=paths[1], resume_from=state)
+    driver_forecast('2025-01-01', 36, drivers=drivers, output_path=paths[2])
+    first, second, full = (open(p).read() for p in paths)
+    assert first + second.split('\n', 1)[1] == full
+
+
+def test_resume_rejects_entity_count_mismatch():
+    variants = _variants()
+    state = batch_forecast(variants, '2025-01-01', 6).state
+    with pytest.raises(ValueError):
+        resume_forecast(variants[:2], state, 6)
+
+
+def test_checkpoint_path_without_npz_suffix(tmp_path):
+    import cli
+
+    state = tmp_path / 'state.ckpt'
+    assert cli.main(['forecast', '--months', '12', '--output', str(tmp_path / 'a.csv'), '--checkpoint', str(state)]) == 0
+    assert sorted(os.listdir(tmp_path)) == ['a.csv', 'state.ckpt']
+    assert cli.main(['forecast', '--months', '6', '--output', str(tmp_path / 'b.csv'), '--resume', str(state)]) == 0
+    assert ForecastState.load(str(state)).month == 12
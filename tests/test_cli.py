@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+import cli
+from forecast_engine import FORECAST_COLUMNS, forecast_frame, load_json
+from startup_benchmark import parse_importtime
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+
+def test_forecast_json_matches_frame(tmp_path, capsys):
+    assert cli.main(['forecast', '--json', '--months', '18']) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert list(document) == FORECAST_COLUMNS
+    expected = forecast_frame(DRIVERS, months_horizon=18)
+    assert document['date'] == expected['date'].tolist()
+    np.testing.assert_allclose(document['cash_balance'], expected['cash_balance'])
+
+
+def test_forecast_json_does_not_import_pandas(tmp_path):
+    out = tmp_path / 'forecast.json'
+    proc = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(BASE_DIR, 'src', 'cli.py'),
+                           'forecast', '--json', '--output', str(out)], capture_output=True, text=True, check=True)
+    modules = {row[0] for row in parse_importtime(proc.stderr)}
+    assert 'forecast_engine' in modules
+    assert 'pandas' not in modules and 'xlsxwriter' not in modules
+    assert len(json.loads(out.read_text())['revenue']) == 36
+
+
+def test_scenarios_json_one_entry_per_scenario(tmp_path):
+    out = tmp_path / 'scenarios.json'
+    assert cli.main(['scenarios', '--json', '--months', '12', '--output', str(out)]) == 0
+    document = json.loads(out.read_text())
+    scenarios = load_json(os.path.join(BASE_DIR, 'data', 'config', 'scenarios.json'))
+    assert list(document['scenarios']) == list(scenarios)
+    assert len(document['scenarios']['Base']['ebitda']) == 12
+
+
+def test_sensitivity_json_one_way_sweeps(tmp_path):
+    out = tmp_path / 'sensitivity.json'
+    assert cli.main(['sensitivity', '--json', '--output', str(out)]) == 0
+    document = json.loads(out.read_text())
+    zero = [p for p in document['one_way'] if p['shift'] == 0.0]
+    assert zero and all(np.isclose(p['ebitda'], document['base']['ebitda']) for p in zero)
+
+
+def test_variance_tables_from_repo_artifacts(tmp_path):
+    assert cli.main(['variance', '--output', str(tmp_path)]) == 0
+    assert sorted(os.listdir(tmp_path)) == ['variance_budget.csv', 'variance_mom.csv', 'variance_scenario.csv',
+                                            'variance_yoy.csv']
+    header = (tmp_path / 'variance_scenario.csv').read_text().splitlines()[0]
+    assert header == 'scenario,entity,date,metric,value,reference,variance,variance_pct'
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |     _io\n"
+              "import time:      2500 |       2620 | forecast_engine\n")
+    assert parse_importtime(stderr) == [('_io', 120, 120, 2), ('forecast_engine', 2500, 2620, 0)]
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from artifact_io import read_artifact
+from data_generator import HISTORY_COLUMNS, STREAM_BLOCK, FinancialDataGenerator
+
+CONFIG = os.path.join(BASE_DIR, 'data', 'config', 'drivers.json')
+
+
+@pytest.fixture
+def gen():
+    return FinancialDataGenerator(CONFIG, years=3)
+
+
+def test_panel_shape_and_columns(gen):
+    df = gen.generate_entities(0, 5, seed=1)
+    assert list(df.columns) == ['Entity'] + HISTORY_COLUMNS
+    assert len(df) == 5 * 36
+    assert df.groupby('Entity').size().tolist() == [36] * 5
+    assert (df['Revenue'] > 0).all()
+    # two capex events per entity-year
+    events = (df['Capex'] > 0).groupby([df['Entity'], df['Month'].dt.year]).sum()
+    assert (events == 2).all()
+    np.testing.assert_allclose(df['Cash_Out'], df[['COGS', 'OpEx_Sales', 'OpEx_Admin', 'Capex']].sum(axis=1), atol=0.05)
+
+
+def test_entity_history_independent_of_range(gen):
+    # Entity rows depend only on (seed, entity index), also across stream blocks
+    wide = gen.generate_entities(0, STREAM_BLOCK + 10, seed=3)
+    narrow = gen.generate_entities(STREAM_BLOCK - 2, STREAM_BLOCK + 3, seed=3)
+    expected = wide[wide['Entity'].between(STREAM_BLOCK - 2, STREAM_BLOCK + 2)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(narrow, expected)
+    other_seed = gen.generate_entities(0, 3, seed=4)
+    assert not np.array_equal(other_seed['Revenue'].to_numpy(), wide['Revenue'].to_numpy()[:len(other_seed)])
+
+
+def test_panel_bit_identical_across_chunk_sizes(gen, tmp_path):
+    first = gen.generate_panel(str(tmp_path / 'a.csv'), 300, seed=7, chunk_size=7)
+    second = gen.generate_panel(str(tmp_path / 'b.csv'), 300, seed=7, chunk_size=1024)
+    with open(first, 'rb') as a, open(second, 'rb') as b:
+        assert a.read() == b.read()
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_panel_binary_formats(gen, tmp_path, fmt):
+    pytest.importorskip('pyarrow')
+    path = gen.generate_panel(str(tmp_path / 'history.csv'), 40, seed=2, chunk_size=16, fmt=fmt)
+    assert path.endswith('.' + fmt)
+    pd.testing.assert_frame_equal(read_artifact(path), gen.generate_entities(0, 40, seed=2), check_dtype=False)
+
+
+def test_compact_panel(gen):
+    df = gen.generate_entities(0, 4, seed=0, precision='compact')
+    assert df['Month'].dtype == np.int32 and df['Entity'].dtype == np.int32
+    assert df['Revenue'].dtype == np.float32 and df['Cash_In'].dtype == np.float64
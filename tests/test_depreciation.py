@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from depreciation import AssetRegister
+
+
+def naive_schedule(capex, life, horizon, rate=None):
+    dep = np.zeros(horizon + life)
+    for s, amount in enumerate(capex):
+        book = amount
+        for a in range(life):
+            if rate is None:
+                charge = amount / life
+            else:
+                charge = book if a == life - 1 else book * rate
+            dep[s + a] += charge
+            book -= charge
+    return dep[:horizon]
+
+
+def test_straight_line_matches_naive_fan_out():
+    capex = np.zeros(30)
+    capex[[0, 4, 25]] = [1200.0, 600.0, 900.0]
+    register = AssetRegister.from_capex(capex, 12)
+    assert len(register) == 3
+    np.testing.assert_allclose(register.straight_line(1, 30)[0], naive_schedule(capex, 12, 30), atol=1e-9)
+
+
+def test_declining_balance_matches_naive_and_writes_off_book_value():
+    capex = np.zeros((2, 40))
+    capex[0, [0, 3]] = [1000.0, 500.0]
+    capex[1, 10] = 800.0
+    register = AssetRegister.from_capex(capex, [12, 24])
+    dep = register.declining_balance(2, 40, factor=2.0)
+
+    np.testing.assert_allclose(dep[0], naive_schedule(capex[0], 12, 40, rate=2.0 / 12), atol=1e-9)
+    np.testing.assert_allclose(dep[1], naive_schedule(capex[1], 24, 40, rate=2.0 / 24), atol=1e-9)
+    assert abs(dep[0].sum() - 1500.0) < 1e-9
+
+
+def test_active_count_drops_to_zero_after_life():
+    register = AssetRegister([0], [2], [100.0], [3])
+    assert register.active_count(1, 8)[0].tolist() == [0, 0, 1, 1, 1, 0, 0, 0]
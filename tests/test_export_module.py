@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+from openpyxl import load_workbook
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from export_module import ExportModule
+from forecast_engine import forecast_frame, load_json
+
+HISTORY_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'historical_financials.csv')
+
+
+def make_exporter(months=36):
+    drivers = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+    return ExportModule(HISTORY_PATH, None, forecast_df=forecast_frame(drivers, months_horizon=months))
+
+
+def cells(path):
+    wb = load_workbook(path)
+    return {ws.title: {c.coordinate: c.value for row in ws.iter_rows() for c in row if c.value is not None}
+            for ws in wb}
+
+
+def test_constant_memory_writes_the_same_cells(tmp_path):
+    exporter = make_exporter()
+    exporter.create_excel_model(str(tmp_path / 'memory.xlsx'))
+    exporter.create_excel_model(str(tmp_path / 'stream.xlsx'), constant_memory=True)
+    assert cells(tmp_path / 'memory.xlsx') == cells(tmp_path / 'stream.xlsx')
+
+
+def test_compact_depreciation_is_linear_in_horizon(tmp_path):
+    months = 120
+    make_exporter(months).create_excel_model(str(tmp_path / 'compact.xlsx'), constant_memory=True,
+                                             depreciation_layout='compact')
+    wb = load_workbook(tmp_path / 'compact.xlsx')
+    ws = wb['Depreciation_Sched']
+    assert ws.max_row == 5
+    formulas = [c.value for row in ws.iter_rows(min_col=2) for c in row if str(c.value).startswith('=')]
+    assert len(formulas) == 4 * months
+    assert ws['D5'].value == '=(D3 - D4) / UsefulLife'
+    assert wb.defined_names['DeprStream'].attr_text == 'Depreciation_Sched!$B$5:$DQ$5'
+
+
+def test_unknown_depreciation_layout(tmp_path):
+    with pytest.raises(ValueError):
+        make_exporter().create_excel_model(str(tmp_path / 'x.xlsx'), depreciation_layout='pyramid')
@@ -0,0 +1,108 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from dateutil.relativedelta import relativedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import load_json, forecast_frame, batch_forecast, FORECAST_COLUMNS
+
+DRIVERS_PATH = os.path.join(BASE_DIR, 'data', 'config', 'drivers.json')
+
+
+def reference_forecast(drivers, start_date_str, months):
+    """Month-by-month loop the vectorized engine must reproduce."""
+    capex_sched = drivers.get('capex_schedule', {})
+    life = drivers.get('useful_life_months', 60)
+    dep_table = {}
+    start = datetime.fromisoformat(start_date_str)
+    cash = drivers.get('initial_cash_balance', 500000.0)
+    prev_wc = 0.0
+    rows = []
+    for m in range(months):
+        date = start + relativedelta(months=m)
+        ym = date.strftime('%Y-%m')
+        revenue = (drivers.get('base_revenue_monthly', 0.0) * ((1 + drivers.get('volume_growth_monthly', 0.0)) ** m)
+                   * ((1 + drivers.get('price_growth_monthly', 0.0)) ** m) * drivers.get('seasonality', [1]*12)[date.month - 1])
+        cogs = revenue * drivers.get('cogs_pct', 0.0)
+        opex = drivers.get('fixed_opex_monthly', 0.0) + revenue * drivers.get('opex_var_pct', 0.0)
+        headcount = drivers.get('headcount_start', 0) + int(drivers.get('hiring_rate_monthly', 0) * m)
+        payroll = headcount * drivers.get('avg_salary_monthly', 0.0)
+        capex = capex_sched.get(ym, 0.0)
+        if capex != 0:
+            for j in range(life):
+                key = (date + relativedelta(months=j)).strftime('%Y-%m')
+                dep_table[key] = dep_table.get(key, 0.0) + capex / float(life)
+        depreciation = dep_table.get(ym, drivers.get('depreciation_monthly', 0.0))
+        ebitda = revenue - cogs - opex - payroll
+        ebt = ebitda - depreciation
+        tax = max(0.0, ebt * drivers.get('tax_rate', 0.0))
+        net_income = ebt - tax
+        ar = revenue / 30.0 * drivers.get('dso', 30.0)
+        inventory = cogs / 30.0 * drivers.get('dsi', 30.0)
+        ap = cogs / 30.0 * drivers.get('dpo', 30.0)
+        wc = ar + inventory - ap
+        delta_wc = wc - prev_wc
+        operating_cf = net_income + depreciation - delta_wc
+        cash = cash + operating_cf - capex
+        rows.append([date.strftime('%Y-%m-01'), revenue, cogs, opex, payroll, headcount, capex, depreciation,
+                     ebitda, ebt, tax, net_income, ar, inventory, ap, wc, delta_wc, operating_cf, -capex, 0.0, cash])
+        prev_wc = wc
+    return rows
+
+
+@pytest.mark.parametrize('start,months', [('2025-01-01', 36), ('2024-11-01', 120)])
+def test_vectorized_matches_reference(start, months):
+    drivers = load_json(DRIVERS_PATH)
+    df = forecast_frame(drivers, start, months)
+    expected = reference_forecast(drivers, start, months)
+
+    assert list(df.columns) == FORECAST_COLUMNS
+    assert df['date'].tolist() == [r[0] for r in expected]
+    np.testing.assert_allclose(df[FORECAST_COLUMNS[1:]].to_numpy(dtype=float),
+                               np.array([r[1:] for r in expected], dtype=float), rtol=1e-10, atol=1e-6)
+
+
+def test_depreciation_fallback_outside_capex_coverage():
+    drivers = load_json(DRIVERS_PATH)
+    drivers['depreciation_monthly'] = 1234.0
+    drivers['useful_life_months'] = 3
+    df = forecast_frame(drivers, '2025-01-01', 12)
+    expected = reference_forecast(drivers, '2025-01-01', 12)
+    np.testing.assert_allclose(df['depreciation'], [r[7] for r in expected])
+
+
+def test_batch_matches_single_forecasts():
+    base = load_json(DRIVERS_PATH)
+    variants = []
+    for i in range(5):
+        d = dict(base)
+        d['cogs_pct'] = 0.35 + 0.02 * i
+        d['hiring_rate_monthly'] = 0.1 * i
+        d['useful_life_months'] = 24 if i % 2 else 60
+        variants.append(d)
+    cube = batch_forecast(variants, '2025-01-01', 48)
+
+    assert cube.values.shape == (5, 48, len(FORECAST_COLUMNS) - 1)
+    for i, d in enumerate(variants):
+        single = forecast_frame(d, '2025-01-01', 48)
+        np.testing.assert_allclose(cube.values[i], single[FORECAST_COLUMNS[1:]].to_numpy(dtype=float),
+                                   rtol=1e-12, atol=1e-6)
+
+
+def test_batch_accepts_table_and_capex_matrix():
+    table = pd.DataFrame({'base_revenue_monthly': [100.0, 200.0], 'cogs_pct': [0.5, 0.4],
+                          'useful_life_months': [12, 12]}, index=['north', 'south'])
+    capex = np.zeros((2, 24))
+    capex[1, 3] = 1200.0
+    cube = batch_forecast(table, '2025-01-01', 24, capex=capex)
+
+    assert cube.entities == ['north', 'south']
+    assert cube.metric('depreciation')[1, 3:15].tolist() == [100.0] * 12
+    assert cube.metric('depreciation')[0].sum() == 0.0
+    assert len(cube.to_frame()) == 48
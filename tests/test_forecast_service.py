@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import forecast_frame, load_json
+from forecast_service import ForecastService, ServiceError
+from service_load_test import _request
+
+DRIVERS_PATH = os.path.join(BASE_DIR, 'data', 'config', 'drivers.json')
+SCENARIOS_PATH = os.path.join(BASE_DIR, 'data', 'config', 'scenarios.json')
+
+
+async def exercise_service():
+    service = ForecastService(DRIVERS_PATH, SCENARIOS_PATH)
+    ready = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(service.serve('127.0.0.1', 0, ready=ready))
+    server = await ready
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+    body = {'drivers': {'cogs_pct': 0.45}, 'months_horizon': 24}
+    responses = [
+        await _request(reader, writer, 'POST', '/forecast', body),
+        await _request(reader, writer, 'POST', '/forecast', body),
+        await _request(reader, writer, 'POST', '/scenarios', {'months_horizon': 12}),
+        await _request(reader, writer, 'POST', '/forecast', {'drivers': {'not_a_driver': 1}}),
+    ]
+    writer.close()
+    await writer.wait_closed()
+    server.close()
+    task.cancel()
+    return service, responses
+
+
+def test_forecast_scenarios_cache_and_validation():
+    service, responses = asyncio.run(exercise_service())
+    (s1, first), (s2, second), (s3, scenarios), (s4, error) = responses
+
+    assert s1 == s2 == s3 == 200
+    assert first == second
+    assert service.cache.hits == 1
+
+    drivers = load_json(DRIVERS_PATH)
+    drivers['cogs_pct'] = 0.45
+    expected = forecast_frame(drivers, '2025-01-01', 24)
+    payload = json.loads(first)
+    assert payload['date'] == expected['date'].tolist()
+    np.testing.assert_allclose(payload['cash_balance'], expected['cash_balance'])
+
+    assert set(json.loads(scenarios)['scenarios']) == {'Base', 'Best', 'Worst'}
+    assert s4 == 400 and 'not_a_driver' in json.loads(error)['error']
+
+
+def test_bad_override_rejected_per_request():
+    service = ForecastService(DRIVERS_PATH, SCENARIOS_PATH)
+    for body in ({'drivers': {'cogs_pct': 'abc'}}, {'months_horizon': 0}, {'months_horizon': -3},
+                 {'drivers': {'seasonality': [1.0] * 11}}):
+        with pytest.raises(ServiceError) as exc:
+            service._parse(json.dumps(body).encode())
+        assert exc.value.status == 400
+    drivers, _, months = service._parse(b'{"drivers": {"cogs_pct": "0.5"}, "months_horizon": 6}')
+    assert drivers['cogs_pct'] == 0.5 and months == 6
+
+
+def test_failed_batch_reruns_jobs_one_at_a_time():
+    async def run():
+        loop = asyncio.get_running_loop()
+        service = ForecastService(DRIVERS_PATH, SCENARIOS_PATH)
+        good, bad = dict(service.drivers), dict(service.drivers, cogs_pct='abc')
+        futures = [loop.create_future() for _ in range(3)]
+        service._run_batch([(('2025-01-01', 6), [good], futures[0]), (('2025-01-01', 6), [bad], futures[1]),
+                            (('2025-01-01', 6), [good], futures[2])])
+        return futures
+
+    first, failed, last = asyncio.run(run())
+    assert len(first.result()[0]['cash_balance']) == 6 and last.result() == first.result()
+    assert isinstance(failed.exception(), ServiceError) and failed.exception().status == 400
+
+
+def test_cancelled_future_does_not_break_batch():
+    async def run():
+        loop = asyncio.get_running_loop()
+        service = ForecastService(DRIVERS_PATH, SCENARIOS_PATH)
+        good, bad = dict(service.drivers), dict(service.drivers, cogs_pct='abc')
+        futures = [loop.create_future() for _ in range(3)]
+        futures[0].cancel()
+        service._run_batch([(('2025-01-01', 6), [good], futures[0]), (('2025-01-01', 6), [good], futures[1])])
+        service._run_batch([(('2025-01-01', 6), [good], futures[0]), (('2025-01-01', 6), [bad], futures[2])])
+        return futures
+
+    cancelled, served, failed = asyncio.run(run())
+    assert cancelled.cancelled() and len(served.result()[0]['cash_balance']) == 6
+    assert failed.exception().status == 400
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import load_json
+from goal_seek import ForecastEvaluator, goal_seek, solve
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+
+@pytest.mark.parametrize('method', ['brent', 'bisect'])
+def test_goal_seek_hits_target(method):
+    evaluator = ForecastEvaluator(DRIVERS)
+    result = goal_seek(evaluator, 'price_growth_monthly', 'ebitda_margin', 0.15, bounds=(0.0, 0.05), method=method)
+    assert result.converged
+    assert result.outputs['ebitda_margin'] == pytest.approx(0.15, abs=1e-8)
+    assert result.evaluations == evaluator.evaluations < 60
+
+
+def test_brent_needs_fewer_evaluations_than_bisection():
+    counts = {}
+    for method in ('brent', 'bisect'):
+        counts[method] = goal_seek(ForecastEvaluator(DRIVERS), 'cogs_pct', 'ending_cash', 0.0,
+                                   bounds=(0.2, 0.6), method=method).evaluations
+    assert counts['brent'] < counts['bisect']
+
+
+def test_unbracketed_target_raises():
+    with pytest.raises(ValueError, match='not bracketed'):
+        goal_seek(ForecastEvaluator(DRIVERS), 'hiring_rate_monthly', 'ebitda_margin', 0.15, bounds=(0.0, 1.0))
+
+
+def test_evaluator_caches_repeated_driver_sets():
+    evaluator = ForecastEvaluator(DRIVERS)
+    evaluator({'dso': 40})
+    evaluator({'dso': 40})
+    assert (evaluator.calls, evaluator.evaluations) == (2, 1)
+
+
+def test_multi_driver_solve_respects_bounds():
+    evaluator = ForecastEvaluator(DRIVERS)
+    bounds = {'price_growth_monthly': (0.0, 0.05), 'cogs_pct': (0.30, 0.50)}
+    result = solve(evaluator, {'ebitda_margin': 0.15, 'ending_cash': 0.0}, bounds)
+    assert result.converged
+    assert result.outputs['ebitda_margin'] == pytest.approx(0.15, abs=1e-6)
+    assert result.outputs['ending_cash'] == pytest.approx(0.0, abs=1.0)
+    for name, (lo, hi) in bounds.items():
+        assert lo <= result.drivers[name] <= hi
+    assert result.evaluations < 40
+
+    # An unreachable target stops at the bound instead of leaving it
+    capped = solve(evaluator, {'ebitda_margin': 0.9}, {'cogs_pct': (0.30, 0.50)})
+    assert not capped.converged and capped.drivers['cogs_pct'] == 0.30
+
+
+def test_solve_rejects_driver_without_gradient():
+    evaluator = ForecastEvaluator(DRIVERS)
+    with pytest.raises(ValueError, match='useful_life_months'):
+        solve(evaluator, {'ebitda_margin': 0.15}, {'useful_life_months': (24, 120)})
+    with pytest.raises(ValueError, match='not_an_output'):
+        solve(evaluator, {'not_an_output': 1.0}, {'cogs_pct': (0.30, 0.50)})
@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import forecast_frame, load_json
+from gradients import driver_gradients
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+
+def outputs(drivers):
+    df = forecast_frame(drivers)
+    return {'total_ebitda': df['ebitda'].sum(), 'ending_cash': df['cash_balance'].iloc[-1],
+            'min_cash': df['cash_balance'].min()}
+
+
+def central_difference(key, rel=1e-6):
+    h = abs(DRIVERS[key]) * rel
+    up, down = outputs(dict(DRIVERS, **{key: DRIVERS[key] + h})), outputs(dict(DRIVERS, **{key: DRIVERS[key] - h}))
+    return {name: (up[name] - down[name]) / (2 * h) for name in up}
+
+
+def test_base_values_match_forecast():
+    grads = driver_gradients(DRIVERS)
+    for name, value in outputs(DRIVERS).items():
+        assert grads.values[name] == pytest.approx(value)
+
+
+@pytest.mark.parametrize('key', ['base_revenue_monthly', 'volume_growth_monthly', 'cogs_pct', 'tax_rate', 'dso', 'dpo'])
+def test_gradients_match_finite_differences(key):
+    grads = driver_gradients(DRIVERS).gradient
+    for name, fd in central_difference(key).items():
+        assert grads.loc[key, name] == pytest.approx(fd, rel=1e-5, abs=1e-6)
+
+
+def test_seasonality_and_capex_entries():
+    grads = driver_gradients(DRIVERS).gradient
+    assert grads.loc['initial_cash_balance', 'ending_cash'] == pytest.approx(1.0)
+    # 50k spent in Mar-2025 leaves cash lower by the capex less its depreciation tax shield
+    assert -1 < grads.loc['capex_schedule[2025-03]', 'ending_cash'] < -0.9
+    seasonal = grads.loc['seasonality[1]', 'total_ebitda']
+    assert seasonal > 0
@@ -0,0 +1,74 @@
+import os
+import pstats
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+import instrumentation
+from forecast_engine import driver_forecast, load_json
+from instrumentation import span, steps
+from pipeline import Pipeline, Stage
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    rec = instrumentation.enable('cprofile', str(tmp_path / 'profiles'))
+    yield rec
+    instrumentation.disable()
+
+
+def test_off_by_default_records_nothing():
+    assert instrumentation.active() is None
+    first, second = span('a'), steps('b')
+    assert first is second  # shared no-op object
+    with first as s:
+        s.set(rows_out=3)
+
+
+def test_forecast_substeps_nest_under_parent(recorder, tmp_path):
+    with span('run'):
+        driver_forecast(drivers=DRIVERS, months_horizon=24, output_path=str(tmp_path / 'f.csv'))
+    records = {r['name']: r for r in recorder.records}
+    assert records['forecast.compute']['parent'] == 'run'
+    assert records['forecast.depreciation']['parent'] == 'forecast.compute'
+    assert records['forecast.depreciation']['depth'] == 2
+    assert records['forecast.frame']['rows_out'] == 24 and records['forecast.write']['rows_in'] == 24
+    assert records['forecast.write']['attrs'] == {'format': 'csv'}
+    for r in records.values():
+        assert r['wall_s'] >= 0 and r['cpu_s'] >= 0 and r['peak_rss_mb'] > 0
+
+
+def test_pipeline_stage_spans_rows_and_profiles(recorder):
+    import pandas as pd
+
+    pipeline = Pipeline([
+        Stage('make', lambda ctx: {'table': pd.DataFrame({'x': range(5)})}),
+        Stage('use', lambda ctx: {'out': ctx['table'].head(2)}, deps=('make',)),
+        Stage('fail', lambda ctx: 1 / 0, critical=False),
+    ])
+    pipeline.run({})
+    stages = {r['name']: r for r in recorder.records if r['name'].startswith('stage.')}
+    assert stages['stage.make']['rows_out'] == 5
+    assert stages['stage.use']['rows_in'] == 5 and stages['stage.use']['rows_out'] == 2
+    assert 'failed' in stages['stage.fail']['attrs']
+    stats = pstats.Stats(stages['stage.use']['profile'])
+    assert stats.total_calls > 0
+    assert recorder.stack == []
+
+
+def test_open_steps_closed_by_enclosing_span_on_error(recorder, tmp_path):
+    with pytest.raises(RuntimeError):
+        with span('outer'):
+            trace = steps('inner')
+            trace.next('one')
+            raise RuntimeError('boom')
+    assert recorder.stack == []
+    outer = [r for r in recorder.records if r['name'] == 'outer'][0]
+    assert outer['error'] == 'RuntimeError: boom'
+    path = recorder.write(str(tmp_path / 'trace.json'))
+    assert os.path.getsize(path) > 0
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from monte_carlo import MonteCarloEngine
+
+DRIVERS_PATH = os.path.join(BASE_DIR, 'data', 'config', 'drivers.json')
+SIMULATION_PATH = os.path.join(BASE_DIR, 'data', 'config', 'simulation.json')
+
+
+def make_engine(chunk_size=700):
+    engine = MonteCarloEngine(DRIVERS_PATH, SIMULATION_PATH)
+    engine.config['chunk_size'] = chunk_size
+    engine.config['months_horizon'] = 24
+    return engine
+
+
+def test_results_independent_of_worker_count():
+    engine = make_engine()
+    serial = engine.run(paths=3000, workers=1, seed=7)
+    parallel = engine.run(paths=3000, workers=2, seed=7)
+    for metric in serial.fan:
+        assert np.array_equal(serial.fan[metric], parallel.fan[metric])
+    assert serial.prob_cash_negative == parallel.prob_cash_negative
+
+
+def test_fan_chart_bands_are_ordered():
+    result = make_engine().run(paths=2000, seed=1)
+    fan = result.fan_chart()
+    assert len(fan) == 3 * 24
+    assert (fan['p5'] <= fan['p50']).all() and (fan['p50'] <= fan['p95']).all()
+    assert 0.0 <= result.prob_cash_negative <= 1.0
+    assert result.prob_cash_negative_by_month.shape == (24,)
+
+
+def test_explicit_zero_paths_is_not_the_default():
+    with pytest.raises(ValueError):
+        make_engine().run(paths=0)
+
+
+def test_no_distributions_keeps_every_path():
+    engine = make_engine()
+    engine.config['distributions'] = {}
+    result = engine.run(paths=1000, seed=1)
+    assert result.paths == 1000
+    np.testing.assert_allclose(result.fan['revenue'][0], result.fan['revenue'][-1])
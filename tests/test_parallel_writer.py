@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from artifact_io import MANIFEST, read_artifact, write_artifact
+from data_generator import FinancialDataGenerator
+from parallel_writer import Progress, write_csv, write_partitions
+
+GEN = FinancialDataGenerator(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'), years=3)
+
+
+def _history(n=12):
+    return GEN.generate_entities(0, n, seed=5)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_csv_byte_ranges_match_single_write(tmp_path, executor):
+    df = _history()
+    stats = write_csv(df, str(tmp_path / 'parallel.csv'), workers=2, chunk_rows=50, executor=executor, verbose=False)
+    single = write_artifact(df, str(tmp_path / 'single.csv'))
+    with open(stats['path'], 'rb') as a, open(single, 'rb') as b:
+        assert a.read() == b.read()
+    assert stats['rows'] == len(df) and stats['parts'] == -(-len(df) // 50)
+    assert stats['mb'] == pytest.approx(os.path.getsize(single) / 1e6)
+
+
+def test_csv_ranges_in_flight_are_bounded(tmp_path, monkeypatch):
+    import parallel_writer
+
+    rendered, backlog = [], []
+    render, append = parallel_writer._render_csv, parallel_writer._append_range
+
+    def counting_render(df, header):
+        rendered.append(len(df))
+        return render(df, header)
+
+    def counting_append(f, pending, *args):
+        backlog.append(len(rendered) - len(backlog))
+        return append(f, pending, *args)
+
+    monkeypatch.setattr(parallel_writer, '_render_csv', counting_render)
+    monkeypatch.setattr(parallel_writer, '_append_range', counting_append)
+    write_csv(_history(), str(tmp_path / 'bounded.csv'), workers=2, chunk_rows=10, executor='thread', verbose=False)
+    assert len(rendered) > 4 and max(backlog) <= 4
+
+
+def test_dim_date_through_parallel_csv(tmp_path):
+    GEN.generate_dim_date(str(tmp_path / 'single.csv'))
+    GEN.generate_dim_date(str(tmp_path / 'parallel.csv'), workers=2)
+    with open(tmp_path / 'parallel.csv', 'rb') as a, open(tmp_path / 'single.csv', 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_year_partitions(tmp_path):
+    pytest.importorskip('pyarrow')
+    df = _history()
+    stats = write_partitions(df, str(tmp_path / 'history.parquet'), 'Year', workers=2, verbose=False)
+    with open(os.path.join(stats['path'], MANIFEST)) as f:
+        manifest = json.load(f)
+    assert [p['value'] for p in manifest['partitions']] == [2020, 2021, 2022]
+    assert sum(p['rows'] for p in manifest['partitions']) == len(df)
+    restored = read_artifact(stats['path']).sort_values(['Entity', 'Month'], ignore_index=True)
+    pd.testing.assert_frame_equal(restored, df)
+    assert (read_artifact(stats['path'], partitions=[2021])['Month'].dt.year == 2021).all()
+
+
+def test_entity_partitions_csv(tmp_path):
+    df = _history(4)
+    stats = write_partitions(df, str(tmp_path / 'history.csv'), 'Entity', executor='thread', verbose=False)
+    assert sorted(os.listdir(stats['path'])) == sorted([MANIFEST] + [f'Entity={i}.csv' for i in range(4)])
+    subset = read_artifact(stats['path'], partitions=[2])
+    np.testing.assert_allclose(subset['Revenue'], df.loc[df['Entity'] == 2, 'Revenue'])
+
+
+def test_parallel_panel_matches_sequential(tmp_path):
+    pytest.importorskip('pyarrow')
+    parts = GEN.generate_panel(str(tmp_path / 'parts.parquet'), 30, seed=9, chunk_size=7, workers=2)
+    single = GEN.generate_panel(str(tmp_path / 'single.parquet'), 30, seed=9)
+    assert os.path.isdir(parts)
+    pd.testing.assert_frame_equal(read_artifact(parts), read_artifact(single))
+
+
+def test_progress_rates():
+    progress = Progress('write', total=2, verbose=False)
+    progress.update(100, 2_000_000)
+    progress.update(50, 1_000_000)
+    stats = progress.stats()
+    assert (stats['rows'], stats['mb'], stats['parts']) == (150, 3.0, 2)
+    assert stats['rows_per_s'] == pytest.approx(150 / stats['seconds'])
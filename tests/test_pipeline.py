@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from pipeline import Pipeline, PipelineError, Stage
+
+
+def test_stages_run_in_dependency_order_and_share_outputs():
+    calls = []
+
+    def first(ctx):
+        calls.append('first')
+        return {'value': 2}
+
+    def second(ctx):
+        calls.append('second')
+        return {'doubled': ctx['value'] * 2}
+
+    pipeline = Pipeline([Stage('second', second, deps=('first',)), Stage('first', first)])
+    ctx = pipeline.run({})
+    assert calls == ['first', 'second']
+    assert ctx['doubled'] == 4
+    assert set(pipeline.timings) == {'first', 'second'}
+
+
+def test_critical_failure_raises_with_cause_and_optional_failure_continues():
+    def boom(ctx):
+        raise ValueError('bad input')
+
+    pipeline = Pipeline([Stage('optional', boom, critical=False), Stage('after', lambda ctx: {'ok': True})])
+    assert pipeline.run({})['ok']
+
+    with pytest.raises(PipelineError) as err:
+        Pipeline([Stage('critical', boom)]).run({})
+    assert err.value.stage == 'critical'
+    assert isinstance(err.value.__cause__, ValueError)
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import driver_forecast, load_json
+from insight_generator import InsightGenerator
+from precision import compact_frame, frame_bytes, month_key, month_start
+from scenario_engine import ScenarioView
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+
+def test_month_keys_round_trip():
+    keys = month_key(['2025-01-01', '2025-12-01', '2026-02-01'])
+    assert keys.dtype == np.int32
+    assert keys.tolist() == [2025 * 12, 2025 * 12 + 11, 2026 * 12 + 1]
+    assert month_start(keys).dt.strftime('%Y-%m-%d').tolist() == ['2025-01-01', '2025-12-01', '2026-02-01']
+
+
+def test_compact_forecast_dtypes_and_cash_rollforward(tmp_path):
+    path = str(tmp_path / 'forecast_output.csv')
+    full = driver_forecast(drivers=DRIVERS, output_path=str(tmp_path / 'full.csv'))
+    df = driver_forecast(drivers=DRIVERS, output_path=path, precision='compact')
+    assert df['date'].dtype == np.int32
+    assert df['revenue'].dtype == np.float32 and df['headcount'].dtype == np.int32
+    assert df['cash_balance'].dtype == np.float64 and df['operating_cf'].dtype == np.float64
+    assert frame_bytes(df) < 0.75 * frame_bytes(full)
+    np.testing.assert_allclose(df['revenue'], full['revenue'], rtol=1e-6)
+
+    # Same reconciliation as tests/test_sanity.py::test_cash_rollforward, on the compact artifact
+    written = pd.read_csv(path)
+    assert written['date'].tolist() == full['date'].tolist()
+    flows = written['operating_cf'] + written['investing_cf'] + written['financing_cf']
+    opening = written.loc[0, 'cash_balance'] - flows.iloc[0]
+    assert (abs(written['cash_balance'] - (opening + flows.cumsum())) < 1e-2).all()
+
+
+def test_compact_scenarios_match_full():
+    base = pd.DataFrame({
+        'Month': pd.date_range('2025-01-01', periods=12, freq='MS').strftime('%Y-%m-%d'),
+        'Revenue_Forecast': np.linspace(1e6, 1.2e6, 12), 'COGS_Forecast': np.linspace(4e5, 5e5, 12),
+        'OpEx_Sales_Forecast': np.full(12, 1e5), 'OpEx_Admin_Forecast': np.full(12, 8e4),
+        'Capex_Forecast': np.zeros(12), 'Cash_In_Forecast': np.linspace(9e5, 1.1e6, 12),
+        'Cash_Out_Forecast': np.linspace(7e5, 8e5, 12),
+    })
+    config = {f'S{i}': {'revenue_multiplier': 1 + i / 100, 'cost_multiplier': 1 - i / 200} for i in range(50)}
+    full = ScenarioView(base, config).to_frame()
+    compact = ScenarioView(compact_frame(base), config, precision='compact').to_frame()
+    assert list(compact.columns) == list(full.columns)
+    assert isinstance(compact['Scenario'].dtype, pd.CategoricalDtype)
+    assert compact['Scenario'].astype(object).tolist() == full['Scenario'].tolist()
+    assert compact['Revenue_Forecast'].dtype == np.float32 and compact['EBITDA_Forecast'].dtype == np.float32
+    assert np.array_equal(compact['CashFlow_Forecast'], full['CashFlow_Forecast'])
+    np.testing.assert_allclose(compact['EBITDA_Forecast'], full['EBITDA_Forecast'], rtol=1e-6)
+    assert frame_bytes(compact) < 0.6 * frame_bytes(full)
+
+
+def test_insights_identical_in_both_modes(tmp_path):
+    df = pd.read_csv(os.path.join(BASE_DIR, 'data', 'processed', 'scenario_output.csv'))
+    df = df[df['Scenario'] == 'Base']
+    reports = {}
+    for precision in ('full', 'compact'):
+        generator = InsightGenerator('unused', str(tmp_path / f'{precision}.txt'), df=df, precision=precision)
+        reports[precision] = (generator.generate_variance_commentary(), generator.generate_trend_detection(),
+                              generator.check_risks())
+    assert reports['full'] == reports['compact']
+
+
+def test_unknown_precision_rejected():
+    with pytest.raises(ValueError):
+        compact_frame(pd.DataFrame({'a': [1.0]}), 'half')
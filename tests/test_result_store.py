@@ -0,0 +1,89 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import load_json
+from insight_generator import InsightGenerator
+from monte_carlo import MonteCarloEngine
+from result_store import ResultStore
+from scenario_engine import simulate_scenarios
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+SCENARIOS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'scenarios.json'))
+
+
+def _scenario_store(path):
+    expected = simulate_scenarios(DRIVERS, SCENARIOS, months_horizon=24)
+    store = ResultStore.create(path, expected.dates, expected.metrics, entities=expected.entities,
+                               entity_axis='scenario')
+    simulate_scenarios(DRIVERS, SCENARIOS, months_horizon=24, out=store.block(0, len(store)))
+    store.flush()
+    return expected
+
+
+def test_engine_writes_into_store_and_slices_are_views(tmp_path):
+    path = str(tmp_path / 'scenarios.cube')
+    expected = _scenario_store(path)
+    store = ResultStore.open(path)
+    assert store.shape == expected.values.shape
+    assert np.array_equal(store.values, expected.values)
+
+    cash = store.metric('cash_balance')
+    assert isinstance(cash.base, np.memmap) or isinstance(cash, np.memmap)
+    assert cash.flags['C_CONTIGUOUS'] and not cash.flags['WRITEABLE']
+    assert np.array_equal(cash, expected.metric('cash_balance'))
+    assert np.shares_memory(store.entity('Best'), store.values)
+    assert np.array_equal(store.entity('Best'), expected.values[expected.entities.index('Best')])
+    assert np.shares_memory(store.metric_frame('revenue').to_numpy(), store.values)
+
+
+def test_header_describes_axes_and_units(tmp_path):
+    path = str(tmp_path / 'scenarios.cube')
+    _scenario_store(path)
+    header = ResultStore.open(path).header
+    assert header['layout'] == 'metric-major'
+    assert header['axes']['entity']['name'] == 'scenario'
+    assert header['axes']['month']['size'] == 24
+    assert header['units']['headcount'] == 'people'
+    assert header['units']['revenue'] == header['currency'] == 'INR'
+
+
+def test_frame_subset_and_insights(tmp_path):
+    path = str(tmp_path / 'scenarios.cube')
+    expected = _scenario_store(path)
+    store = ResultStore.open(path)
+    frame = store.frame(entities=['Worst'], metrics=['revenue', 'ebitda'])
+    assert list(frame.columns) == ['scenario', 'date', 'revenue', 'ebitda']
+    assert len(frame) == 24 and (frame['scenario'] == 'Worst').all()
+    assert np.array_equal(frame['ebitda'], expected.entity('Worst')['ebitda'])
+
+    report = str(tmp_path / 'insights.txt')
+    generator = InsightGenerator.from_store(store, 'Base', report)
+    assert generator.df['Revenue'].tolist() == expected.entity('Base')['revenue'].tolist()
+    generator.generate_report()
+    assert os.path.exists(report)
+
+
+def test_monte_carlo_paths_written_by_chunk(tmp_path):
+    engine = MonteCarloEngine(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'),
+                              os.path.join(BASE_DIR, 'data', 'config', 'simulation.json'))
+    engine.config.update({'chunk_size': 300, 'months_horizon': 12})
+    path = str(tmp_path / 'paths.cube')
+    result = engine.run(paths=1000, seed=3, store_path=path)
+    store = result.store
+    assert store.shape == (1000, 12, len(result.metrics))
+    assert store.entities is None and store.header['attrs']['seed'] == 3
+    cash = store.metric('cash_balance')
+    assert np.isclose(cash.mean(axis=0), result.aggregate.summary()['mean'][:, result.metrics.index('cash_balance')]).all()
+    assert result.prob_cash_negative == (cash < 0).any(axis=1).mean()
+
+
+def test_out_shape_checked(tmp_path):
+    store = ResultStore.create(str(tmp_path / 'bad.cube'), ['2025-01-01'], ['revenue'], n_entities=2)
+    with pytest.raises(ValueError):
+        simulate_scenarios(DRIVERS, SCENARIOS, months_horizon=1, out=store.values)
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from scenario_engine import ScenarioEngine
+
+
+def reference_scenarios(df, scenarios_config):
+    """The original copy-per-scenario implementation."""
+    all_scenarios = []
+    for name, params in scenarios_config.items():
+        temp_df = df.copy()
+        temp_df['Scenario'] = name
+        rev_mult = params.get('revenue_multiplier', 1.0)
+        cost_mult = params.get('cost_multiplier', 1.0)
+        temp_df['Revenue_Forecast'] *= rev_mult
+        temp_df['COGS_Forecast'] *= cost_mult
+        temp_df['OpEx_Sales_Forecast'] *= cost_mult
+        temp_df['OpEx_Admin_Forecast'] *= cost_mult
+        temp_df['Capex_Forecast'] *= cost_mult
+        temp_df['EBITDA_Forecast'] = (temp_df['Revenue_Forecast'] - temp_df['COGS_Forecast']
+                                      - temp_df['OpEx_Sales_Forecast'] - temp_df['OpEx_Admin_Forecast'])
+        if 'Cash_In_Forecast' in temp_df.columns:
+            temp_df['Cash_In_Forecast'] *= rev_mult
+            temp_df['Cash_Out_Forecast'] *= cost_mult
+            temp_df['CashFlow_Forecast'] = temp_df['Cash_In_Forecast'] - temp_df['Cash_Out_Forecast']
+        else:
+            temp_df['CashFlow_Forecast'] = temp_df['EBITDA_Forecast']
+        all_scenarios.append(temp_df)
+    return pd.concat(all_scenarios, ignore_index=True)
+
+
+def make_engine(tmp_path, with_cash, n_scenarios=3):
+    rng = np.random.default_rng(3)
+    months = 24
+    df = pd.DataFrame({'Month': pd.date_range('2025-01-01', periods=months, freq='MS').strftime('%Y-%m-%d')})
+    for col in ('Revenue', 'COGS', 'OpEx_Sales', 'OpEx_Admin', 'EBITDA'):
+        df[f'{col}_Forecast'] = rng.uniform(1e4, 1e6, months)
+    df['Capex_Forecast'] = rng.integers(0, 50000, months)
+    if with_cash:
+        df['Cash_In_Forecast'] = rng.uniform(1e5, 1e6, months)
+        df['Cash_Out_Forecast'] = rng.uniform(1e5, 1e6, months)
+    scenarios = {f'S{i}': {'revenue_multiplier': 0.8 + 0.01 * i, 'cost_multiplier': 1.2 - 0.01 * i}
+                 for i in range(n_scenarios)}
+    scenarios['Base'] = {}
+    (tmp_path / 'processed').mkdir()
+    (tmp_path / 'config').mkdir()
+    df.to_csv(tmp_path / 'processed' / 'forecast.csv', index=False)
+    (tmp_path / 'config' / 'scenarios.json').write_text(json.dumps(scenarios))
+    return ScenarioEngine(str(tmp_path / 'processed' / 'forecast.csv')), scenarios
+
+
+@pytest.mark.parametrize('with_cash', [True, False])
+def test_generate_scenarios_matches_copy_per_scenario(tmp_path, with_cash):
+    engine, scenarios = make_engine(tmp_path, with_cash, n_scenarios=40)
+    pd.testing.assert_frame_equal(engine.generate_scenarios(), reference_scenarios(engine.df, scenarios))
+
+
+def test_lazy_view_materializes_one_scenario(tmp_path):
+    engine, scenarios = make_engine(tmp_path, with_cash=True)
+    view = engine.generate_scenarios(lazy=True)
+    assert len(view) == len(scenarios)
+    expected = reference_scenarios(engine.df, {'S2': scenarios['S2']})
+    pd.testing.assert_frame_equal(view['S2'], expected)
+
+
+def test_driver_scenarios_match_per_scenario_forecasts():
+    from forecast_engine import forecast_frame, load_json
+    from scenario_engine import apply_scenario, simulate_scenarios
+
+    drivers = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+    scenarios = load_json(os.path.join(BASE_DIR, 'data', 'config', 'scenarios.json'))
+    cube = simulate_scenarios(drivers, scenarios, months_horizon=48)
+    assert cube.entities == list(scenarios)
+    for name, params in scenarios.items():
+        expected = forecast_frame(apply_scenario(drivers, params), months_horizon=48)
+        pd.testing.assert_frame_equal(cube.entity(name), expected, check_dtype=False)
+
+    # Scenario levers reach working capital and cash, not just the P&L
+    best, worst = cube.entity('Best'), cube.entity('Worst')
+    assert (best['ar'] > worst['ar']).all()
+    assert best['cash_balance'].iloc[-1] > worst['cash_balance'].iloc[-1]
+
+
+def test_sensitivity_analysis_sweeps_configured_levers(tmp_path):
+    from forecast_engine import forecast_frame, load_json
+
+    engine, _ = make_engine(tmp_path, with_cash=True)
+    config = load_json(os.path.join(BASE_DIR, 'data', 'config', 'sensitivity.json'))
+    drivers = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+    (tmp_path / 'config' / 'sensitivity.json').write_text(json.dumps(config))
+    table = engine.run_sensitivity_analysis(drivers)
+    assert list(table.columns) == ['Dimension', 'Change', 'Annual_Revenue', 'Annual_EBITDA']
+    assert len(table) == sum(len(lever['range']) for lever in config['levers'].values())
+    base = forecast_frame(drivers, months_horizon=24)
+    flat = table[table['Change'] == 0]
+    np.testing.assert_allclose(flat['Annual_Revenue'], base['revenue'].sum())
+    np.testing.assert_allclose(flat['Annual_EBITDA'], base['ebitda'].sum())
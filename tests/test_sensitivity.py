@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import forecast_frame, load_json
+from sensitivity import SensitivityEngine
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+CONFIG = load_json(os.path.join(BASE_DIR, 'data', 'config', 'sensitivity.json'))
+
+
+@pytest.fixture(scope='module')
+def result():
+    return SensitivityEngine(DRIVERS, CONFIG).run()
+
+
+def test_full_factorial_covers_every_combination(result):
+    assert len(result.factorial()) == 5 ** 5
+    assert result.grid('price', 'volume', 'revenue').shape == (5, 5)
+
+
+def test_lever_points_match_perturbed_forecast(result):
+    point = result.points
+    row = point[np.isclose(point['price'], 0.05) & np.isclose(point['capex'], -0.1)
+                & (point[['volume', 'cogs_pct', 'hiring_rate']] == 0).all(axis=1)].iloc[0]
+    drivers = dict(DRIVERS, base_revenue_monthly=DRIVERS['base_revenue_monthly'] * 1.05,
+                   cogs_pct=DRIVERS['cogs_pct'] / 1.05,
+                   capex_schedule={k: v * 0.9 for k, v in DRIVERS['capex_schedule'].items()})
+    df = forecast_frame(drivers)
+    assert row['revenue'] == pytest.approx(df['revenue'].sum())
+    assert row['ebitda'] == pytest.approx(df['ebitda'].sum())
+    assert row['cash'] == pytest.approx(df['cash_balance'].iloc[-1])
+
+
+def test_tornado_and_elasticities(result):
+    tornado = result.tornado('ebitda')
+    assert list(tornado['rank']) == [1, 2, 3, 4, 5]
+    assert tornado['swing'].is_monotonic_decreasing
+    assert tornado.iloc[0]['lever'] == 'price'
+
+    elasticities = result.elasticities().set_index('lever')
+    assert elasticities.loc['volume', 'revenue'] == pytest.approx(1.0)
+    assert elasticities.loc['capex', 'revenue'] == pytest.approx(0.0)
+
+
+def test_unknown_lever_rejected():
+    with pytest.raises(ValueError):
+        SensitivityEngine(DRIVERS, {'levers': {'fx': {'range': [0.1]}}})
@@ -0,0 +1,95 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from pipeline import Pipeline, Stage, Lazy, build_default_pipeline
+import stage_cache
+from stage_cache import StageCache, stage_modules
+
+
+def make_pipeline(calls):
+    def build(ctx):
+        calls.append('build')
+        with open(ctx['config_path']) as f:
+            value = f.read()
+        with open(ctx['out_path'], 'w') as f:
+            f.write(value * 2)
+        return {'result': value * 2}
+
+    def report(ctx):
+        calls.append('report')
+        with open(ctx['report_path'], 'w') as f:
+            f.write(ctx['result'].upper())
+
+    def load(ctx):
+        return {'result': Lazy(lambda: open(ctx['out_path']).read())}
+
+    return Pipeline([
+        Stage('build', build, inputs=('config_path',), artifacts=('out_path',), load=load),
+        Stage('report', report, deps=('build',), artifacts=('report_path',)),
+    ])
+
+
+def make_context(tmp_path):
+    return {'config_path': str(tmp_path / 'config.txt'), 'out_path': str(tmp_path / 'out.txt'),
+            'report_path': str(tmp_path / 'report.txt')}
+
+
+def test_unchanged_stages_are_skipped_and_restored(tmp_path):
+    (tmp_path / 'config.txt').write_text('ab')
+    cache = StageCache(str(tmp_path / 'cache'))
+    calls = []
+    make_pipeline(calls).run(make_context(tmp_path), cache=cache)
+    assert calls == ['build', 'report']
+
+    (tmp_path / 'report.txt').unlink()
+    calls.clear()
+    pipeline = make_pipeline(calls)
+    pipeline.run(make_context(tmp_path), cache=StageCache(str(tmp_path / 'cache')))
+    assert calls == []
+    assert pipeline.skipped == ['build', 'report']
+    assert (tmp_path / 'report.txt').read_text() == 'ABAB'
+
+    (tmp_path / 'config.txt').write_text('xy')
+    calls.clear()
+    make_pipeline(calls).run(make_context(tmp_path), cache=cache)
+    assert calls == ['build', 'report']
+
+    calls.clear()
+    make_pipeline(calls).run(make_context(tmp_path), cache=cache, force=True)
+    assert calls == ['build', 'report']
+
+
+def test_store_is_size_bounded(tmp_path):
+    cache = StageCache(str(tmp_path / 'cache'), max_bytes=10)
+    for i in range(5):
+        (tmp_path / 'config.txt').write_text(str(i) * 4)
+        make_pipeline([]).run(make_context(tmp_path), cache=cache)
+    sizes = [e['size'] for e in cache.manifest['entries'].values()]
+    assert sum(sizes) <= 10
+    assert len(os.listdir(tmp_path / 'cache' / 'objects')) == len(sizes)
+
+
+def test_stage_code_follows_imports():
+    stages = build_default_pipeline().stages
+    assert {'data_generator.py', 'parallel_writer.py', 'artifact_io.py', 'precision.py'} <= set(stage_modules(stages['history']))
+    assert {'export_module.py', 'precision.py'} <= set(stage_modules(stages['export']))
+
+
+def test_editing_an_imported_module_changes_fingerprint(tmp_path, monkeypatch):
+    (tmp_path / 'stage_entry.py').write_text('from stage_helper import VALUE\n')
+    (tmp_path / 'stage_helper.py').write_text('VALUE = 1\n')
+    monkeypatch.setattr(stage_cache, 'SRC_DIR', str(tmp_path))
+
+    def build(ctx):
+        import stage_entry
+        return {}
+
+    stage = Stage('build', build)
+    cache = StageCache(str(tmp_path / 'cache'))
+    assert stage_modules(stage) == ('stage_entry.py', 'stage_helper.py')
+    before = cache.fingerprint(stage, {})
+    (tmp_path / 'stage_helper.py').write_text('VALUE = 20\n')
+    assert cache.fingerprint(stage, {}) != before
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from streaming_stats import StreamingAggregator
+
+
+def test_merged_partials_match_exact_statistics():
+    rng = np.random.default_rng(42)
+    data = rng.lognormal(0, 0.75, (40000, 6, 2))
+    left, right = StreamingAggregator((6, 2), compression=80), StreamingAggregator((6, 2), compression=80)
+    for chunk in np.array_split(data[:15000], 4):
+        left.update(chunk)
+    for chunk in np.array_split(data[15000:], 9):
+        right.update(chunk)
+    merged = left.merge(right)
+    stats = merged.summary()
+
+    assert stats['count'] == 40000
+    np.testing.assert_allclose(stats['mean'], data.mean(axis=0))
+    np.testing.assert_allclose(stats['std'], data.std(axis=0, ddof=1))
+    np.testing.assert_array_equal(stats['min'], data.min(axis=0))
+    np.testing.assert_array_equal(stats['max'], data.max(axis=0))
+
+    qs = [0.05, 0.5, 0.95]
+    exact = np.quantile(data, qs, axis=0)
+    np.testing.assert_allclose(merged.quantile(qs), exact, rtol=0.02)
+
+
+def test_sketch_size_is_bounded():
+    agg = StreamingAggregator((3,), compression=50)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        agg.update(rng.normal(size=(5000, 3)))
+    assert agg.centroids.shape == (3, 50)
+    assert agg.weights.sum(axis=1).tolist() == [100000.0] * 3
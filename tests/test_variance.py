@@ -0,0 +1,100 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from data_generator import FinancialDataGenerator
+from insight_generator import InsightGenerator
+from precision import compact_frame
+from variance import VarianceEngine, metric_name, save_tables
+
+GEN = FinancialDataGenerator(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'), years=3)
+
+
+def test_metric_names_across_schemas():
+    assert [metric_name(c) for c in ('Revenue', 'revenue', 'Revenue_Forecast', 'OpEx_Sales')] == \
+        ['revenue', 'revenue', 'revenue', 'opex_sales']
+
+
+def test_mom_yoy_match_groupby_shift():
+    actuals = GEN.generate_entities(0, 6, seed=1)
+    result = VarianceEngine(actuals).compute()
+    revenue = actuals.pivot(index='Entity', columns='Month', values='Revenue').to_numpy()
+    for kind, lag in (('mom', 1), ('yoy', 12)):
+        expected = revenue[:, lag:] - revenue[:, :-lag]
+        np.testing.assert_array_equal(result.metric(kind, 'revenue')[:, lag:], expected)
+        assert np.isnan(result.metric(kind, 'revenue')[:, :lag]).all()
+    ebitda = actuals['Revenue'] - actuals['COGS'] - actuals['OpEx_Sales'] - actuals['OpEx_Admin']
+    np.testing.assert_allclose(result.value['mom'][..., result.metrics.index('ebitda')].reshape(-1), ebitda)
+
+
+def test_gap_gives_nan_not_previous_row():
+    actuals = GEN.generate_entities(0, 2, seed=1)
+    gap = actuals[actuals['Month'] != '2020-06-01']
+    result = VarianceEngine(gap).compute()
+    june, july = 5, 6
+    assert np.isnan(result.metric('mom', 'revenue')[:, [june, july]]).all()
+    assert np.isfinite(result.metric('mom', 'revenue')[:, july + 1]).all()
+
+
+def test_budget_vs_actual_across_schemas():
+    actuals = GEN.generate_entities(0, 3, seed=1)
+    budget = GEN.generate_entities(1, 4, seed=2).rename(columns={'Entity': 'entity', 'Month': 'date'})
+    budget.columns = [c.lower() for c in budget.columns]
+    budget['date'] = budget['date'].dt.strftime('%Y-%m-%d')
+    result = VarianceEngine(actuals, budget).compute()
+    assert list(result.index.entities) == [0, 1, 2, 3]
+    merged = actuals.merge(budget, left_on=['Entity', 'Month'], right_on=['entity', pd.to_datetime(budget['date'])])
+    table = result.to_frame('budget')
+    revenue = table[table['metric'] == 'revenue'].reset_index(drop=True)
+    np.testing.assert_array_equal(revenue['variance'], merged['Revenue'] - merged['revenue'])
+    assert set(revenue['entity']) == {1, 2}
+    assert np.isnan(result.metric('budget', 'revenue')[[0, 3]]).all()
+
+
+def test_scenario_vs_base_long_and_dict():
+    base = GEN.generate_entities(0, 4, seed=1)
+    best = base.assign(Revenue=base['Revenue'] * 1.1)
+    long = pd.concat([base.assign(Scenario='Base'), best.assign(Scenario='Best')], ignore_index=True)
+    from_long = VarianceEngine(scenarios=long).compute()
+    from_dict = VarianceEngine(scenarios={'Base': base, 'Best': best}).compute()
+    assert from_long.scenarios == from_dict.scenarios == ['Base', 'Best']
+    np.testing.assert_array_equal(from_long.variance['scenario'], from_dict.variance['scenario'])
+    np.testing.assert_allclose(from_long.metric('scenario', 'revenue', pct=True)[1], 0.1)
+    assert (from_long.metric('scenario', 'cogs') == 0).all()
+
+
+def test_pct_uses_absolute_reference():
+    df = pd.DataFrame({'Month': ['2025-01-01', '2025-02-01', '2025-03-01'], 'EBITDA': [-100.0, -50.0, 0.0]})
+    result = VarianceEngine(df).compute()
+    assert result.metric('mom', 'ebitda', pct=True)[0, 1:].tolist() == [0.5, 1.0]
+
+
+def test_invalid_layers_rejected():
+    actuals = GEN.generate_entities(0, 2, seed=1)
+    with pytest.raises(ValueError):
+        VarianceEngine(pd.concat([actuals, actuals.tail(1)]))
+    with pytest.raises(ValueError):
+        VarianceEngine(scenarios={'Best': actuals})
+
+
+def test_save_tables(tmp_path):
+    actuals = GEN.generate_entities(0, 2, seed=1)
+    paths = save_tables(VarianceEngine(actuals, actuals).compute(), str(tmp_path))
+    assert [os.path.basename(p) for p in paths] == ['variance_mom.csv', 'variance_yoy.csv', 'variance_budget.csv']
+    yoy = pd.read_csv(paths[1])
+    assert len(yoy) == 2 * 24 * 8 and yoy['date'].iloc[0] == '2021-01-01'
+
+
+def test_insights_commentary_adds_yoy():
+    df = GEN.generate_entities(0, 1, seed=1).drop(columns='Entity')
+    df['EBITDA'] = df['Revenue'] - df['COGS'] - df['OpEx_Sales'] - df['OpEx_Admin']
+    for precision in ('full', 'compact'):
+        comments = InsightGenerator('unused', 'unused', df=compact_frame(df, precision)).generate_variance_commentary()
+        assert [c.split()[1] for c in comments[:4]] == ['Revenue', 'Revenue', 'EBITDA', 'EBITDA']
+        assert [c[-4:] for c in comments] == ['MoM.', 'YoY.', 'MoM.', 'YoY.', 'bps.']
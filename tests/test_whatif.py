@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from forecast_engine import affected_columns, forecast_frame, load_json
+from whatif import WhatIfSession
+
+DRIVERS = load_json(os.path.join(BASE_DIR, 'data', 'config', 'drivers.json'))
+
+
+def test_dpo_only_touches_payables_chain():
+    assert affected_columns(['dpo']) == ['ap', 'wc', 'delta_wc', 'operating_cf', 'cash_balance']
+
+
+def test_capex_does_not_touch_financing():
+    assert 'financing_cf' not in affected_columns(['capex_schedule'])
+
+
+def test_override_matches_full_recompute():
+    session = WhatIfSession(DRIVERS, months_horizon=120)
+    revenue = session.columns['revenue']
+    recomputed = session.set(cogs_pct=0.5)
+    assert 'revenue' not in recomputed and 'cogs' in recomputed
+    assert session.columns['revenue'] is revenue
+
+    expected = forecast_frame(dict(DRIVERS, cogs_pct=0.5), months_horizon=120)
+    pd.testing.assert_frame_equal(session.frame(), expected)
+
+
+def test_capex_schedule_and_noop_overrides():
+    session = WhatIfSession(DRIVERS)
+    schedule = {'2025-06': 250000}
+    assert 'depreciation' in session.set(capex_schedule=schedule, dpo=DRIVERS['dpo'])
+    assert 'ap' not in session.recomputed
+    assert session.set(capex_schedule=schedule) == []
+    pd.testing.assert_frame_equal(session.frame(), forecast_frame(dict(DRIVERS, capex_schedule=schedule)))